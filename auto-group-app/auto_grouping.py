@@ -0,0 +1,451 @@
+"""
+Auto-grouping extension: members joining a 🎧 voice channel get their own "│ Gruppe NN" channel.
+
+Load with bot.load_extension("auto_grouping"); needs the guilds and voice_states intents.
+"""
+import os
+import math
+import time
+import heapq
+import asyncio
+from collections import deque
+import discord
+import logging
+from discord.ext import commands, tasks
+
+trigger_sign = '🎧'
+group_prefix = '│ Gruppe'
+# Max. number of hidden spare group channels per category, 0 disables the warm pool
+warm_pool_size = int(os.getenv("WARM_POOL_SIZE", 0))
+# Empty group channels are deleted after this many seconds, at most cleanup_batch_size per sweep
+cleanup_grace_seconds = int(os.getenv("CLEANUP_GRACE_SECONDS", 60))
+cleanup_batch_size = 5
+
+
+class AutoGroup(commands.Cog):
+    """Wires the gateway events to the group channel allocator, index and cleaner."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def cog_load(self):
+        if not sweep_empty_channels.is_running():
+            sweep_empty_channels.start()
+
+    async def cog_unload(self):
+        sweep_empty_channels.cancel()
+
+    @commands.Cog.listener()
+    async def on_voice_state_update(self, member, before, after):
+        # The channel left is marked first, so a member switching from their group to the trigger gets it back
+        if before.channel:
+            if before.channel.name.startswith(group_prefix) and not before.channel.members:
+                cleaner.mark(before.channel, member)
+
+        if after.channel:
+            if after.channel.name.startswith(trigger_sign):
+                await allocate_group_channel(self.bot, after.channel, member)
+            elif after.channel.id in cleaner.marked:
+                cleaner.unmark(after.channel)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel):
+        index_channel(channel)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        unindex_channel(channel)
+        cleaner.marked.pop(channel.id, None)
+        if channel.category_id in warm_pools:
+            warm_pools[channel.category_id].discard(channel)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after):
+        if before.name != after.name or before.category_id != after.category_id:
+            unindex_channel(before)
+            index_channel(after)
+
+
+async def setup(bot):
+    await bot.add_cog(AutoGroup(bot))
+
+
+class EmptyChannelCleaner:
+    """Marks empty group channels and deletes them only once they stayed empty for the grace period."""
+
+    def __init__(self):
+        self.marked = {}
+        self.left_by = {}
+        self.avoided = 0
+        self.deleted = 0
+
+    def mark(self, channel, member):
+        self.marked.setdefault(channel.id, (channel, time.monotonic()))
+        self.left_by[member.id] = channel.id
+
+    def unmark(self, channel):
+        if self.marked.pop(channel.id, None):
+            # The channel was reused instead of being deleted and cloned again
+            self.avoided += 1
+
+    def reusable(self, member, category_id):
+        channel_id = self.left_by.pop(member.id, None)
+        if channel_id in self.marked and self.marked[channel_id][0].category_id == category_id:
+            return self.marked[channel_id][0]
+        candidates = [channel for channel, _ in self.marked.values() if channel.category_id == category_id]
+        return min(candidates, key=lambda channel: channel.position) if candidates else None
+
+    def forget_stale(self):
+        self.left_by = {member_id: channel_id for member_id, channel_id in self.left_by.items()
+                        if channel_id in self.marked}
+
+    def expired(self):
+        now = time.monotonic()
+        channels = [channel for channel, marked_at in self.marked.values() if now - marked_at >= cleanup_grace_seconds]
+        return channels[:cleanup_batch_size]
+
+
+cleaner = EmptyChannelCleaner()
+
+
+@tasks.loop(seconds=10)
+async def sweep_empty_channels():
+    for channel in cleaner.expired():
+        del cleaner.marked[channel.id]
+        if channel.members:
+            continue
+        try:
+            await channel.delete(reason="Empty group channel")
+            cleaner.deleted += 1
+            logging.info('[%s] Deleted voice channel "%s" (%s), %d deleted / %d delete+create pairs avoided so far',
+                         discord.utils.utcnow(), channel.name, channel.id, cleaner.deleted, cleaner.avoided)
+        except discord.NotFound:
+            pass
+        except discord.HTTPException as e:
+            logging.error('[%s] Could not delete voice channel "%s" (%s): %s', discord.utils.utcnow(), channel.name, channel.id, e)
+    cleaner.forget_stale()
+
+
+class GroupChannelIndex:
+    """Index of the "│ Gruppe NN" channels of one category: number -> channel id plus a heap of free numbers."""
+
+    def __init__(self):
+        self.by_number = {}
+        self.numbers = {}
+        self.max_number = 0
+        self._free = []
+
+    def add(self, channel_id, num):
+        self.remove(channel_id)
+        if self.by_number.get(num) is not None:
+            return
+        self.by_number[num] = channel_id
+        self.numbers[channel_id] = num
+        for free_num in range(self.max_number + 1, num):
+            heapq.heappush(self._free, free_num)
+        self.max_number = max(self.max_number, num)
+
+    def remove(self, channel_id):
+        num = self.numbers.pop(channel_id, None)
+        if num is None:
+            return
+        del self.by_number[num]
+        heapq.heappush(self._free, num)
+        while self.max_number and self.max_number not in self.by_number:
+            self.max_number -= 1
+
+    def reserve(self):
+        # Reserved numbers map to None until the cloned channel is known
+        num = self.next_number()
+        self.by_number[num] = None
+        self.max_number = max(self.max_number, num)
+        return num
+
+    def release(self, num):
+        if num in self.by_number and self.by_number[num] is None:
+            del self.by_number[num]
+            heapq.heappush(self._free, num)
+            while self.max_number and self.max_number not in self.by_number:
+                self.max_number -= 1
+
+    def next_number(self):
+        # Stale heap entries (taken again or above max_number) are dropped lazily
+        while self._free and (self._free[0] in self.by_number or self._free[0] > self.max_number):
+            heapq.heappop(self._free)
+        return self._free[0] if self._free else self.max_number + 1
+
+
+group_indexes = {}
+
+
+def parse_group_number(channel):
+    if not channel.name.startswith(group_prefix):
+        return None
+    try:
+        return int(channel.name.split("Gruppe")[1])
+    except ValueError:
+        return None
+
+
+def get_group_index(category):
+    index = group_indexes.get(category.id)
+    if index is None:
+        index = group_indexes[category.id] = GroupChannelIndex()
+        for channel in category.channels:
+            num = parse_group_number(channel)
+            if num is not None:
+                index.add(channel.id, num)
+    return index
+
+
+def index_channel(channel):
+    if channel.category_id in group_indexes:
+        num = parse_group_number(channel)
+        if num is not None:
+            group_indexes[channel.category_id].add(channel.id, num)
+
+
+def unindex_channel(channel):
+    if channel.category_id in group_indexes:
+        group_indexes[channel.category_id].remove(channel.id)
+
+
+class CategoryAllocator:
+    """Serialises group channel allocation per category; joins arriving while it is busy are handled as one batch."""
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.waiting = []
+
+
+allocators = {}
+
+
+async def allocate_group_channel(bot, trigger_channel, member):
+    empty_channel = cleaner.reusable(member, trigger_channel.category_id)
+    if empty_channel:
+        cleaner.unmark(empty_channel)
+        try:
+            await member.move_to(empty_channel, reason="Auto-grouping")
+            logging.info('[%s] Moved user "%s" (%s) to empty voice channel "%s" (%s)',
+                         discord.utils.utcnow(), member.name, member.id, empty_channel.name, empty_channel.id)
+            return
+        except discord.HTTPException as e:
+            cleaner.mark(empty_channel, member)
+            cleaner.avoided -= 1
+            logging.warning('[%s] Could not reuse "%s" (%s): %s', discord.utils.utcnow(), empty_channel.name, empty_channel.id, e)
+    if warm_pool_size and await claim_spare_channel(trigger_channel, member):
+        return
+    allocator = allocators.setdefault(trigger_channel.category_id, CategoryAllocator())
+    allocator.waiting.append(member)
+    async with allocator.lock:
+        batch, allocator.waiting = allocator.waiting, []
+        if batch:
+            # Empty when an earlier waiter already took this member into its batch
+            await create_group_channels(bot, trigger_channel, batch)
+
+
+async def create_group_channels(bot, trigger_channel, members):
+    index = get_group_index(trigger_channel.category)
+    # Numbers are reserved before the first await, so concurrent batches can never pick the same one
+    nums = [index.reserve() for _ in members]
+    results = await asyncio.gather(
+        *(trigger_channel.clone(name=group_channel_name(num), reason="Auto-grouping") for num in nums),
+        return_exceptions=True
+    )
+
+    created = []
+    for member, num, result in zip(members, nums, results):
+        if isinstance(result, Exception):
+            index.release(num)
+            logging.error('[%s] Could not create "%s" for "%s" (%s): %s',
+                          discord.utils.utcnow(), group_channel_name(num), member.name, member.id, result)
+        else:
+            index.add(result.id, num)
+            created.append((num, member, result))
+
+    positions = await reorder_group_channels(bot, trigger_channel, index, {num: channel for num, _, channel in created})
+
+    # Every move and cleanup is guarded on its own, so one failure doesn't strand the rest of the batch
+    for num, member, created_channel in created:
+        try:
+            await member.move_to(created_channel, reason="Auto-grouping")
+            logging.info('[%s] Moved user "%s" (%s) to voice channel "%s" (%s) at position %s', discord.utils.utcnow(),
+                         member.name, member.id, created_channel.name, created_channel.id, positions[num])
+        except Exception as e:
+            # Member left voice in the meantime, don't leave an empty group behind
+            logging.warning('[%s] Could not move "%s" (%s): %s', discord.utils.utcnow(), member.name, member.id, e)
+            try:
+                await created_channel.delete(reason="Empty group channel")
+            except Exception as e:
+                # Leave it to the sweeper instead
+                cleaner.mark(created_channel, member)
+                logging.error('[%s] Could not delete empty voice channel "%s" (%s): %s',
+                              discord.utils.utcnow(), created_channel.name, created_channel.id, e)
+
+
+async def reorder_group_channels(bot, trigger_channel, index, new_channels):
+    """
+    Puts all new group channels right below their predecessor (group 1 below the trigger channel)
+    with a single bulk position update, skipped entirely if the clones already landed in place.
+    Returns the position of each new channel; if the update fails, the one it currently has.
+    """
+    guild = trigger_channel.guild
+    new_ids = {channel.id for channel in new_channels.values()}
+    # Voice and stage channels share one position space, the same bucket discord.py's edit(position=...) reorders
+    bucket = sorted(guild.voice_channels + guild.stage_channels, key=lambda c: (c.position, c.id))
+    desired = [channel for channel in bucket if channel.id not in new_ids]
+
+    for num in sorted(new_channels):
+        previous = new_channels.get(num - 1) or (guild.get_channel(index.by_number.get(num - 1)) if num > 1 else None)
+        anchor = previous if previous in desired else trigger_channel
+        desired.insert(desired.index(anchor) + 1 if anchor in desired else len(desired), new_channels[num])
+
+    positions = {num: desired.index(channel) for num, channel in new_channels.items()}
+    if [channel.id for channel in desired] == [channel.id for channel in bucket]:
+        return positions
+
+    payload = [{'id': channel.id, 'position': i} for i, channel in enumerate(desired) if channel.position != i]
+    try:
+        await bot.http.bulk_channel_update(guild.id, payload, reason="Auto-grouping")
+    except discord.HTTPException as e:
+        # The members are moved anyway, the channels just stay where the clones landed
+        logging.error('[%s] Could not reorder group channels of "%s" (%s): %s',
+                      discord.utils.utcnow(), trigger_channel.name, trigger_channel.id, e)
+        return {num: channel.position for num, channel in new_channels.items()}
+    return positions
+
+
+class WarmPool:
+    """Hidden, pre-positioned spare group channels of one category; the target size follows the recent join rate."""
+
+    def __init__(self):
+        self.spares = {}
+        self.joins = deque()
+        # Strong reference to the running refill, the event loop only keeps a weak one
+        self.refill_task = None
+
+    @property
+    def refilling(self):
+        return self.refill_task is not None and not self.refill_task.done()
+
+    def record_join(self):
+        now = time.monotonic()
+        self.joins.append(now)
+        while now - self.joins[0] > 300:
+            self.joins.popleft()
+
+    def target_size(self):
+        # Spares for about one minute of joins at the rate of the last five minutes
+        return max(1, min(warm_pool_size, math.ceil(len(self.joins) / 5)))
+
+    def take(self):
+        if not self.spares:
+            return None
+        num = min(self.spares)
+        return num, self.spares.pop(num)
+
+    def discard(self, channel):
+        for num, spare in list(self.spares.items()):
+            if spare.id == channel.id:
+                del self.spares[num]
+
+
+warm_pools = {}
+
+
+def is_hidden(channel):
+    return channel.overwrites_for(channel.guild.default_role).view_channel is False
+
+
+def get_warm_pool(trigger_channel):
+    pool = warm_pools.get(trigger_channel.category_id)
+    if pool is None:
+        pool = warm_pools[trigger_channel.category_id] = WarmPool()
+        # Adopt spares left over from a previous run
+        for num, channel_id in get_group_index(trigger_channel.category).by_number.items():
+            channel = trigger_channel.guild.get_channel(channel_id)
+            if channel and is_hidden(channel) and not channel.members:
+                pool.spares[num] = channel
+    return pool
+
+
+async def claim_spare_channel(trigger_channel, member):
+    pool = get_warm_pool(trigger_channel)
+    pool.record_join()
+    spare = pool.take()
+    schedule_warm_pool_refill(trigger_channel, pool)
+    if spare is None:
+        return False
+
+    num, channel = spare
+    # Reveal and move concurrently: one round trip instead of clone, edit and move in sequence
+    revealed, moved = await asyncio.gather(
+        channel.edit(overwrites=trigger_channel.overwrites, reason="Auto-grouping"),
+        member.move_to(channel, reason="Auto-grouping"),
+        return_exceptions=True
+    )
+    if isinstance(revealed, Exception):
+        logging.error('[%s] Could not reveal spare channel "%s" (%s): %s', discord.utils.utcnow(), channel.name, channel.id, revealed)
+    if isinstance(moved, Exception):
+        logging.warning('[%s] Could not move "%s" (%s): %s', discord.utils.utcnow(), member.name, member.id, moved)
+        try:
+            await channel.delete(reason="Empty group channel")
+        except Exception as e:
+            # Leave it to the sweeper instead
+            cleaner.mark(channel, member)
+            logging.error('[%s] Could not delete empty voice channel "%s" (%s): %s',
+                          discord.utils.utcnow(), channel.name, channel.id, e)
+    else:
+        logging.info('[%s] Moved user "%s" (%s) to spare voice channel "%s" (%s)',
+                     discord.utils.utcnow(), member.name, member.id, channel.name, channel.id)
+    return True
+
+
+def schedule_warm_pool_refill(trigger_channel, pool):
+    if not pool.refilling and len(pool.spares) != pool.target_size():
+        pool.refill_task = asyncio.create_task(refill_warm_pool(trigger_channel, pool))
+
+
+async def refill_warm_pool(trigger_channel, pool):
+    allocator = allocators.setdefault(trigger_channel.category_id, CategoryAllocator())
+    try:
+        async with allocator.lock:
+            index = get_group_index(trigger_channel.category)
+            while len(pool.spares) > pool.target_size():
+                num = max(pool.spares)
+                await pool.spares.pop(num).delete(reason="Auto-grouping warm pool shrunk")
+
+            hidden = trigger_channel.overwrites_for(trigger_channel.guild.default_role)
+            hidden.update(view_channel=False)
+            overwrites = {**trigger_channel.overwrites, trigger_channel.guild.default_role: hidden}
+            while len(pool.spares) < pool.target_size():
+                num = index.reserve()
+                try:
+                    channel = await trigger_channel.category.create_voice_channel(
+                        name=group_channel_name(num),
+                        overwrites=overwrites,
+                        position=group_position(trigger_channel, index, num),
+                        bitrate=trigger_channel.bitrate,
+                        user_limit=trigger_channel.user_limit,
+                        reason="Auto-grouping warm pool"
+                    )
+                except discord.HTTPException as e:
+                    index.release(num)
+                    logging.error(f'[{discord.utils.utcnow()}] Could not create spare "{group_channel_name(num)}": {e}')
+                    break
+                index.add(channel.id, num)
+                pool.spares[num] = channel
+    except Exception as e:
+        logging.error(f'[{discord.utils.utcnow()}] Warm pool refill failed: {e}')
+
+
+def group_channel_name(num):
+    num_str = f"0{num}" if num <= 9 else f"{num}"
+    return f'{group_prefix} {num_str}'
+
+
+def group_position(trigger_channel, index, num):
+    # Group 1 goes right below the trigger channel, every other group right below its predecessor
+    previous = trigger_channel.guild.get_channel(index.by_number.get(num - 1)) if num > 1 else None
+    return (previous or trigger_channel).position + 1
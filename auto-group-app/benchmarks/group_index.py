@@ -0,0 +1,149 @@
+"""
+Next group number: GroupChannelIndex against the original category scan (user-011)
+
+Builds categories with 200+ "│ Gruppe NN" channels in a guild with other channels around them and
+replays a burst of joins. The original bot scanned category.channels (which discord.py builds from
+all guild channels and sorts on every access), sorted the group channels by position and walked
+them on every join; the index answers from a heap and is kept up to date by the channel events.
+
+    python benchmarks/group_index.py [--sizes 200 500 1000] [--burst 100]
+"""
+import argparse
+import itertools
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from auto_grouping import GroupChannelIndex, get_group_index, group_channel_name, group_indexes  # noqa: E402
+
+_ids = itertools.count(1)
+
+
+class Channel:
+    __slots__ = ("id", "name", "position", "category_id")
+
+    def __init__(self, name, position, category_id):
+        self.id = next(_ids)
+        self.name = name
+        self.position = position
+        self.category_id = category_id
+
+
+class Category:
+    """Category of a guild; like discord.py, channels is rebuilt from all guild channels on every access."""
+
+    def __init__(self, guild_channels):
+        self.id = next(_ids)
+        self.guild_channels = guild_channels
+
+    @property
+    def channels(self):
+        channels = [channel for channel in self.guild_channels if channel.category_id == self.id]
+        channels.sort(key=lambda channel: (channel.position, channel.id))
+        return channels
+
+
+def build_guild(groups, other_channels):
+    guild_channels = []
+    category = Category(guild_channels)
+    guild_channels.append(Channel("🎧 Join to create", 0, category.id))
+    for num in range(1, groups + 1):
+        guild_channels.append(Channel(group_channel_name(num), num, category.id))
+    for position in range(other_channels):
+        guild_channels.append(Channel(f"other {position}", position, None))
+    return guild_channels, category
+
+
+def legacy_next(category, trigger):
+    """The original get_new_channel_properties: (position, number) of the next group channel."""
+    grp_channels = [channel for channel in category.channels if channel.name.startswith("│ Gruppe")]
+    if grp_channels:
+        channels_ordered = sorted(grp_channels, key=lambda obj: obj.position)
+        for i in range(len(channels_ordered) - 1):
+            if channels_ordered[i].position + 1 != channels_ordered[i + 1].position:
+                return channels_ordered[i].position + 1, int(channels_ordered[i].name.split("Gruppe")[1]) + 1
+        return channels_ordered[-1].position + 1, int(channels_ordered[-1].name.split("Gruppe")[1]) + 1
+    return trigger.position + 1, 1
+
+
+def legacy_burst(groups, other_channels, burst):
+    guild_channels, category = build_guild(groups, other_channels)
+    trigger = guild_channels[0]
+    durations = []
+    for _ in range(burst):
+        start = time.perf_counter()
+        position, num = legacy_next(category, trigger)
+        durations.append(time.perf_counter() - start)
+        guild_channels.append(Channel(group_channel_name(num), position, category.id))
+    return durations
+
+
+def index_burst(groups, other_channels, burst):
+    guild_channels, category = build_guild(groups, other_channels)
+    group_indexes.clear()
+    start = time.perf_counter()
+    index = get_group_index(category)
+    build = time.perf_counter() - start
+    durations = []
+    for _ in range(burst):
+        start = time.perf_counter()
+        num = index.reserve()
+        channel = Channel(group_channel_name(num), num, category.id)
+        index.add(channel.id, num)
+        durations.append(time.perf_counter() - start)
+        guild_channels.append(channel)
+    return build, durations
+
+
+def churn(groups, burst):
+    """Members leave random groups and new ones join: the index refills the lowest free numbers."""
+    index = GroupChannelIndex()
+    for channel_id in range(1, groups + 1):
+        index.add(channel_id, channel_id)
+    freed = list(range(1, groups + 1, max(1, groups // burst)))[:burst]
+    start = time.perf_counter()
+    for channel_id in freed:
+        index.remove(channel_id)
+    taken = [index.reserve() for _ in freed]
+    elapsed = time.perf_counter() - start
+    assert sorted(taken) == sorted(freed)
+    return elapsed / (2 * len(freed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200, 500, 1000], help="group channels per category")
+    parser.add_argument("--burst", type=int, default=100, help="joins per burst")
+    parser.add_argument("--other-channels", type=int, default=300, help="other channels in the guild")
+    args = parser.parse_args()
+
+    rows = []
+    for groups in args.sizes:
+        legacy = legacy_burst(groups, args.other_channels, args.burst)
+        build, indexed = index_burst(groups, args.other_channels, args.burst)
+        rows.append([
+            groups,
+            f"{statistics.median(legacy) * 1e6:.0f}",
+            f"{sum(legacy) * 1e3:.2f}",
+            f"{statistics.median(indexed) * 1e6:.1f}",
+            f"{sum(indexed) * 1e3:.3f}",
+            f"{build * 1e3:.2f}",
+            f"{churn(groups, args.burst) * 1e6:.1f}",
+        ])
+
+    headers = ["groups", "scan/join µs", "scan burst ms", "index/join µs", "index burst ms", "index build ms",
+               "churn/op µs"]
+    cells = [headers] + [[str(cell) for cell in row] for row in rows]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(headers))]
+    print(f"burst of {args.burst} joins, {args.other_channels} other channels in the guild\n")
+    for i, row in enumerate(cells):
+        print("  ".join(cell.rjust(width) for cell, width in zip(row, widths)))
+        if i == 0:
+            print("  ".join("-" * width for width in widths))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import auto_grouping  # noqa: E402
+from auto_grouping import EmptyChannelCleaner, trigger_sign  # noqa: E402
+from fakes import FakeBot, FakeCategory, FakeGuild, FakeVoiceChannel  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(auto_grouping, "warm_pool_size", 0)
+    monkeypatch.setattr(auto_grouping, "group_indexes", {})
+    monkeypatch.setattr(auto_grouping, "allocators", {})
+    monkeypatch.setattr(auto_grouping, "warm_pools", {})
+    monkeypatch.setattr(auto_grouping, "cleaner", EmptyChannelCleaner())
+
+
+@pytest.fixture
+def latency():
+    """Seconds every fake Discord HTTP call takes; override with @pytest.mark.parametrize("latency", ...)."""
+    return 0.0
+
+
+@pytest.fixture
+def setup(latency):
+    guild = FakeGuild(latency)
+    category = FakeCategory(guild)
+    trigger = FakeVoiceChannel(category, f"{trigger_sign} Join to create")
+    # Clones land below this one, so the new groups have to be moved up
+    FakeVoiceChannel(category, "AFK")
+    return guild, trigger, FakeBot(guild)
@@ -0,0 +1,126 @@
+"""
+Fake guild model for the auto-grouping tests: every Discord HTTP call goes through FakeGuild.request,
+which counts it and waits `latency` seconds like a round trip
+"""
+import asyncio
+import itertools
+from collections import Counter
+
+import discord
+
+_ids = itertools.count(1000)
+
+
+class FakeGuild:
+    def __init__(self, latency=0.0):
+        self.id = 1
+        self.default_role = object()
+        self.channels = {}
+        self.latency = latency
+        self.requests = Counter()
+
+    @property
+    def voice_channels(self):
+        return list(self.channels.values())
+
+    @property
+    def stage_channels(self):
+        return []
+
+    def get_channel(self, channel_id):
+        return self.channels.get(channel_id)
+
+    async def request(self, route):
+        self.requests[route] += 1
+        # Yield like a real HTTP call, so concurrent joins interleave
+        await asyncio.sleep(self.latency)
+
+
+class FakeCategory:
+    def __init__(self, guild):
+        self.id = next(_ids)
+        self.guild = guild
+
+    @property
+    def channels(self):
+        return [channel for channel in self.guild.channels.values() if channel.category_id == self.id]
+
+    async def create_voice_channel(self, name, overwrites=None, position=None, bitrate=None, user_limit=None,
+                                   reason=None):
+        await self.guild.request("create")
+        channel = FakeVoiceChannel(self, name)
+        channel.overwrites = dict(overwrites or {})
+        return channel
+
+
+class FakeResponse:
+    def __init__(self, status):
+        self.status = status
+        self.reason = "fake"
+
+
+class FakeVoiceChannel:
+    def __init__(self, category, name, fail_delete=False):
+        self.id = next(_ids)
+        self.name = name
+        self.guild = category.guild
+        self.category = category
+        self.category_id = category.id
+        self.members = []
+        self.overwrites = {}
+        self.bitrate = 64000
+        self.user_limit = 0
+        self.fail_delete = fail_delete
+        # Discord puts a clone at the end of the category
+        self.position = len(self.guild.channels)
+        self.guild.channels[self.id] = self
+
+    def overwrites_for(self, target):
+        return self.overwrites.get(target, discord.PermissionOverwrite())
+
+    async def clone(self, name, reason=None):
+        await self.guild.request("clone")
+        return FakeVoiceChannel(self.category, name)
+
+    async def edit(self, overwrites=None, reason=None):
+        await self.guild.request("edit")
+        if overwrites is not None:
+            self.overwrites = dict(overwrites)
+
+    async def delete(self, reason=None):
+        await self.guild.request("delete")
+        if self.fail_delete:
+            raise discord.HTTPException(FakeResponse(503), "service unavailable")
+        del self.guild.channels[self.id]
+
+
+class FakeMember:
+    def __init__(self, num, fail_move=False):
+        self.id = num
+        self.name = f"member-{num}"
+        self.fail_move = fail_move
+        self.moved_to = []
+
+    async def move_to(self, channel, reason=None):
+        await channel.guild.request("move")
+        if self.fail_move:
+            raise RuntimeError("member left voice")
+        self.moved_to.append(channel)
+        channel.members.append(self)
+
+
+class FakeHTTP:
+    def __init__(self, guild):
+        self.guild = guild
+        self.bulk_updates = []
+
+    async def bulk_channel_update(self, guild_id, payload, reason=None):
+        await self.guild.request("bulk_update")
+        self.bulk_updates.append(payload)
+        for entry in payload:
+            self.guild.channels[entry['id']].position = entry['position']
+
+
+class FakeBot:
+    def __init__(self, guild):
+        self.http = FakeHTTP(guild)
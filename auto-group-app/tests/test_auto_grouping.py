@@ -0,0 +1,75 @@
+"""
+Group channel allocation under concurrent joins, against a fake guild model (user-012)
+and REST requests per join as the category grows (user-015)
+"""
+import asyncio
+
+import pytest
+
+import auto_grouping
+from auto_grouping import allocate_group_channel, group_channel_name, trigger_sign
+from fakes import FakeBot, FakeCategory, FakeGuild, FakeMember, FakeVoiceChannel
+
+
+def _group_channels(guild):
+    return [channel for channel in guild.channels.values() if channel.name.startswith(auto_grouping.group_prefix)]
+
+
+def test_50_concurrent_joins_get_50_distinct_channels(setup):
+    guild, trigger, bot = setup
+    members = [FakeMember(num) for num in range(50)]
+
+    async def join_all():
+        await asyncio.gather(*(allocate_group_channel(bot, trigger, member) for member in members))
+
+    asyncio.run(join_all())
+
+    groups = _group_channels(guild)
+    assert sorted(channel.name for channel in groups) == [f"│ Gruppe {num:02d}" for num in range(1, 51)]
+    assert all(len(member.moved_to) == 1 for member in members)
+    assert len({member.moved_to[0].id for member in members}) == 50
+    assert all(len(channel.members) == 1 for channel in groups)
+
+    # Bursts are coalesced: the first join and everyone who queued behind it, one reshuffle each
+    assert 1 <= len(bot.http.bulk_updates) <= 2
+    ordered = sorted(guild.channels.values(), key=lambda channel: channel.position)
+    assert [channel.name for channel in ordered] == \
+        [trigger.name] + [f"│ Gruppe {num:02d}" for num in range(1, 51)] + ["AFK"]
+
+
+def test_failed_move_does_not_abort_the_batch(setup):
+    guild, trigger, bot = setup
+    members = [FakeMember(num, fail_move=num == 3) for num in range(10)]
+
+    async def join_all():
+        await asyncio.gather(*(allocate_group_channel(bot, trigger, member) for member in members))
+
+    asyncio.run(join_all())
+
+    assert all(len(member.moved_to) == 1 for member in members if not member.fail_move)
+    # The channel created for the member who left is cleaned up again
+    assert len(_group_channels(guild)) == 9
+    assert all(channel.members for channel in _group_channels(guild))
+
+
+@pytest.mark.parametrize("groups", [0, 10, 50, 200])
+@pytest.mark.parametrize("afk_below", [False, True])
+def test_requests_per_join_do_not_grow_with_the_category(groups, afk_below):
+    guild = FakeGuild()
+    category = FakeCategory(guild)
+    trigger = FakeVoiceChannel(category, f"{trigger_sign} Join to create")
+    for num in range(1, groups + 1):
+        FakeVoiceChannel(category, group_channel_name(num))
+    if afk_below:
+        FakeVoiceChannel(category, "AFK")
+    bot = FakeBot(guild)
+
+    asyncio.run(allocate_group_channel(bot, trigger, FakeMember(1)))
+
+    # Clone and move; one bulk update only if the clone landed below AFK, never one per channel
+    expected = {"clone": 1, "move": 1}
+    if afk_below:
+        expected["bulk_update"] = 1
+    assert guild.requests == expected
+    ordered = sorted(guild.channels.values(), key=lambda channel: channel.position)
+    assert ordered[groups + 1].name == group_channel_name(groups + 1)
@@ -0,0 +1,101 @@
+"""
+Empty group channel cleanup: a churn trace replayed through the voice state listener with a fake
+clock, checking which channels are reused, which are deleted and how many are cloned (user-014)
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import auto_grouping
+from auto_grouping import AutoGroup, cleanup_grace_seconds, sweep_empty_channels
+from fakes import FakeMember
+
+SWEEP_SECONDS = 10
+
+
+class VoiceStates:
+    """Applies voice moves to the fake guild and dispatches them to the listener like the gateway does."""
+
+    def __init__(self, cog):
+        self.cog = cog
+        self.channel_of = {}
+
+    async def move(self, member, channel):
+        before = self.channel_of.get(member.id)
+        if before is not None:
+            before.members.remove(member)
+        if channel is not None:
+            channel.members.append(member)
+        self.channel_of[member.id] = channel
+        await self.cog.on_voice_state_update(member, SimpleNamespace(channel=before), SimpleNamespace(channel=channel))
+
+
+class SimMember(FakeMember):
+    def __init__(self, num, voice):
+        super().__init__(num)
+        self.voice = voice
+
+    async def move_to(self, channel, reason=None):
+        await channel.guild.request("move")
+        self.moved_to.append(channel)
+        await self.voice.move(self, channel)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(auto_grouping, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def test_churn_trace_reuses_switching_and_reconnecting_members(setup, clock):
+    guild, trigger, bot = setup
+    cog = AutoGroup(bot)
+    voice = VoiceStates(cog)
+    members = [SimMember(num, voice) for num in range(12)]
+    switchers, reconnecting, leaving, staying = members[:3], members[3:6], members[6:9], members[9:]
+
+    async def advance(seconds):
+        # The sweeper runs every SWEEP_SECONDS; deleted channels reach the listener like a gateway event
+        for _ in range(seconds // SWEEP_SECONDS):
+            clock[0] += SWEEP_SECONDS
+            existing = dict(guild.channels)
+            await sweep_empty_channels.coro()
+            for channel_id, channel in existing.items():
+                if channel_id not in guild.channels:
+                    await cog.on_guild_channel_delete(channel)
+
+    async def run():
+        for member in members:
+            await voice.move(member, trigger)
+        groups = {member.id: voice.channel_of[member.id] for member in members}
+
+        # Back to the trigger straight from their own (now empty) group channel
+        for member in switchers:
+            await voice.move(member, trigger)
+        # Short disconnect, rejoin within the grace period
+        for member in reconnecting:
+            await voice.move(member, None)
+        await advance(20)
+        for member in reconnecting:
+            await voice.move(member, trigger)
+        # Gone for good
+        for member in leaving:
+            await voice.move(member, None)
+        await advance(cleanup_grace_seconds + 2 * SWEEP_SECONDS)
+        return groups
+
+    groups = asyncio.run(run())
+
+    for member in switchers + reconnecting + staying:
+        assert voice.channel_of[member.id] is groups[member.id]
+    for member in leaving:
+        assert groups[member.id].id not in guild.channels
+    assert auto_grouping.cleaner.avoided == len(switchers) + len(reconnecting)
+    assert auto_grouping.cleaner.deleted == len(leaving)
+    assert not auto_grouping.cleaner.marked
+    # One clone per member, none for the switchers or the reconnects
+    assert guild.requests["clone"] == len(members)
+    assert len([channel for channel in guild.channels.values()
+                if channel.name.startswith(auto_grouping.group_prefix)]) == len(members) - len(leaving)
@@ -0,0 +1,131 @@
+"""
+Secret lookups against a counting fake provider and a fake clock (user-025)
+"""
+import sys
+import threading
+import types
+
+import pytest
+
+import utils.secrets as secrets_module
+from utils.secrets import CachedSecretProvider, GcpSecretProvider, SecretProvider
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+class FakeSecretProvider(SecretProvider):
+    """In-memory secret store that counts remote round-trips."""
+
+    def __init__(self, secrets):
+        self.secrets = dict(secrets)
+        self.fetches = {}
+
+    def access(self, secret_id, version_id="latest"):
+        self.fetches[secret_id] = self.fetches.get(secret_id, 0) + 1
+        return self.secrets[secret_id]
+
+    def save(self, secret_id, payload):
+        self.secrets[secret_id] = payload
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(secrets_module, "time", clock)
+    return clock
+
+
+def test_secret_provider_is_abstract():
+    with pytest.raises(TypeError):
+        SecretProvider()
+
+
+def test_one_fetch_per_secret_per_ttl_window(clock):
+    fake = FakeSecretProvider({"token": "a", "api-key": "b"})
+    cached = CachedSecretProvider(fake, ttl=300)
+
+    for _ in range(100):
+        assert cached.access("token") == "a"
+        assert cached.access("api-key") == "b"
+        clock.now += 2
+    assert fake.fetches == {"token": 1, "api-key": 1}
+    assert cached.misses == 2 and cached.hits == 198
+
+    clock.now += 300
+    assert cached.access("token") == "a"
+    assert fake.fetches["token"] == 2
+
+
+def test_save_invalidates_the_cached_value(clock):
+    fake = FakeSecretProvider({"token": "old"})
+    cached = CachedSecretProvider(fake, ttl=300)
+
+    assert cached.access("token") == "old"
+    cached.save("token", "new")
+    assert cached.access("token") == "new"
+    assert fake.fetches["token"] == 2
+
+
+def test_concurrent_lookups_share_one_fetch(clock):
+    fake = FakeSecretProvider({"token": "a"})
+    cached = CachedSecretProvider(fake, ttl=300)
+
+    threads = [threading.Thread(target=cached.access, args=("token",)) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert fake.fetches == {"token": 1}
+
+
+def test_gcp_client_is_constructed_once(monkeypatch):
+    constructed = []
+
+    class FakeClient:
+        def __init__(self):
+            constructed.append(self)
+
+        def access_secret_version(self, request):
+            payload = types.SimpleNamespace(data=request["name"].encode("UTF-8"))
+            return types.SimpleNamespace(payload=payload)
+
+    secretmanager = types.ModuleType("google.cloud.secretmanager")
+    secretmanager.SecretManagerServiceClient = FakeClient
+    cloud = types.ModuleType("google.cloud")
+    cloud.secretmanager = secretmanager
+    google = types.ModuleType("google")
+    google.cloud = cloud
+    monkeypatch.setitem(sys.modules, "google", google)
+    monkeypatch.setitem(sys.modules, "google.cloud", cloud)
+    monkeypatch.setitem(sys.modules, "google.cloud.secretmanager", secretmanager)
+
+    provider = GcpSecretProvider("project")
+    threads = [threading.Thread(target=provider.access, args=(f"secret-{i}",)) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(constructed) == 1
+    assert provider.client_constructions == 1
+    assert provider.fetches == 20
+
+
+def test_encrypted_disk_cache_survives_a_restart(clock, tmp_path):
+    fernet = pytest.importorskip("cryptography.fernet")
+    key = fernet.Fernet.generate_key()
+    path = str(tmp_path / "secrets.cache")
+
+    fake = FakeSecretProvider({"token": "a"})
+    assert CachedSecretProvider(fake, ttl=300, cache_path=path, cache_key=key).access("token") == "a"
+
+    restarted = CachedSecretProvider(fake, ttl=300, cache_path=path, cache_key=key)
+    assert restarted.access("token") == "a"
+    assert fake.fetches == {"token": 1}
+    with open(path, "rb") as f:
+        assert b"token" not in f.read()
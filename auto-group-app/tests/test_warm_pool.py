@@ -0,0 +1,79 @@
+"""
+Warm pool of hidden spare group channels: join-to-moved latency against a slow fake HTTP layer
+and a failed move after claiming a spare (user-013)
+"""
+import asyncio
+import statistics
+import time
+
+import pytest
+
+import auto_grouping
+from auto_grouping import allocate_group_channel, claim_spare_channel, get_warm_pool, refill_warm_pool
+from fakes import FakeMember
+
+JOINS = 5
+
+
+async def _prefill(trigger):
+    pool = get_warm_pool(trigger)
+    await refill_warm_pool(trigger, pool)
+    return pool
+
+
+def _join_latencies(bot, trigger, warm):
+    """Seconds from the join until the member is in their group channel, one join after the other."""
+    latencies = []
+
+    async def run():
+        for num in range(JOINS):
+            pool = await _prefill(trigger) if warm else None
+            member = FakeMember(num)
+            start = time.perf_counter()
+            await allocate_group_channel(bot, trigger, member)
+            latencies.append(time.perf_counter() - start)
+            assert len(member.moved_to) == 1
+            if pool and pool.refill_task:
+                await pool.refill_task
+
+    asyncio.run(run())
+    return latencies
+
+
+@pytest.mark.parametrize("latency", [0.02])
+def test_warm_pool_halves_join_to_moved_latency(setup, latency, monkeypatch):
+    guild, trigger, bot = setup
+    cold = _join_latencies(bot, trigger, warm=False)
+    cold_requests = dict(guild.requests)
+
+    monkeypatch.setattr(auto_grouping, "warm_pool_size", 1)
+    guild.requests.clear()
+    warm = _join_latencies(bot, trigger, warm=True)
+
+    print(f"\njoin-to-moved at {latency * 1000:.0f} ms per request: "
+          f"cold median {statistics.median(cold) * 1000:.0f} ms, warm median {statistics.median(warm) * 1000:.0f} ms")
+    # Cold: clone, bulk reorder and move one after the other; warm: reveal and move in one round trip
+    assert statistics.median(cold) >= 3 * latency
+    assert statistics.median(warm) < statistics.median(cold) / 2
+    assert cold_requests == {"clone": JOINS, "bulk_update": JOINS, "move": JOINS}
+    assert guild.requests["edit"] == JOINS and guild.requests["move"] == JOINS
+
+
+def test_failed_move_and_delete_leave_the_spare_to_the_sweeper(setup, monkeypatch):
+    guild, trigger, bot = setup
+    monkeypatch.setattr(auto_grouping, "warm_pool_size", 1)
+    member = FakeMember(1, fail_move=True)
+
+    async def run():
+        pool = await _prefill(trigger)
+        (spare,) = pool.spares.values()
+        spare.fail_delete = True
+        assert await claim_spare_channel(trigger, member)
+        if pool.refill_task:
+            await pool.refill_task
+        return spare
+
+    spare = asyncio.run(run())
+
+    assert guild.requests["delete"] == 1 and spare.id in guild.channels
+    assert spare.id in auto_grouping.cleaner.marked
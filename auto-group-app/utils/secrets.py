@@ -1,23 +1,175 @@
-from google.cloud import secretmanager
+import os
+import time
 import logging
 import json
+import threading
+from abc import ABC, abstractmethod
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# How long resolved secret versions are served from memory (seconds)
+SECRETS_CACHE_TTL = float(os.getenv("SECRETS_CACHE_TTL", 300))
+# Optional encrypted on-disk cache so a restart needs no remote round-trip; needs a Fernet key
+# (cryptography.fernet.Fernet.generate_key()) in SECRETS_CACHE_KEY and the `cryptography` package
+SECRETS_CACHE_PATH = os.getenv("SECRETS_CACHE_PATH")
+SECRETS_CACHE_KEY = os.getenv("SECRETS_CACHE_KEY")
+SECRETS_DISK_CACHE_TTL = float(os.getenv("SECRETS_DISK_CACHE_TTL", 24 * 3600))
+
+
+class SecretProvider(ABC):
+    """Interface of a secret backend. Implement access/save for other backends or local fakes."""
+
+    @abstractmethod
+    def access(self, secret_id, version_id="latest"):
+        """Returns the decoded payload of a secret version."""
+
+    @abstractmethod
+    def save(self, secret_id, payload):
+        """Adds a new version with the given payload to a secret."""
+
+
+class GcpSecretProvider(SecretProvider):
+    """Google Secret Manager with one shared client (one gRPC channel and auth) per process."""
+
+    def __init__(self, project_id):
+        self.project_id = project_id
+        self.client_constructions = 0
+        self.fetches = 0
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        with self._lock:
+            if self._client is None:
+                # Imported on first use only: loading the GCP client library is slow and not needed for local JSON secrets
+                from google.cloud import secretmanager
+                self._client = secretmanager.SecretManagerServiceClient()
+                self.client_constructions += 1
+            return self._client
+
+    def access(self, secret_id, version_id="latest"):
+        name = f"projects/{self.project_id}/secrets/{secret_id}/versions/{version_id}"
+        response = self.client.access_secret_version(request={"name": name})
+        self.fetches += 1
+        return response.payload.data.decode("UTF-8")
+
+    def save(self, secret_id, payload):
+        parent = f"projects/{self.project_id}/secrets/{secret_id}"
+        return self.client.add_secret_version(
+            request={"parent": parent, "payload": {"data": payload.encode("UTF-8")}}
+        )
+
+
+class CachedSecretProvider(SecretProvider):
+    """
+    Wraps a provider with an in-memory TTL cache of resolved versions and, if configured,
+    an encrypted on-disk cache that is read at startup and rewritten after each fetch.
+    """
+
+    def __init__(self, provider, ttl=SECRETS_CACHE_TTL, cache_path=None, cache_key=None,
+                 disk_ttl=SECRETS_DISK_CACHE_TTL):
+        self.provider = provider
+        self.ttl = ttl
+        self.disk_ttl = disk_ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}  # (secret_id, version_id) -> (value, fetched_at, fresh_until) as time.time()
+        self._lock = threading.Lock()
+        self._fernet = _load_fernet(cache_key) if cache_path and cache_key else None
+        self._cache_path = cache_path if self._fernet else None
+        if self._cache_path:
+            self._load_disk_cache()
+
+    def access(self, secret_id, version_id="latest"):
+        key = (secret_id, version_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.time() < entry[2]:
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            # Fetched under the lock, so concurrent callers share one remote call per secret
+            value = self.provider.access(secret_id, version_id)
+            now = time.time()
+            self._entries[key] = (value, now, now + self.ttl)
+            self._save_disk_cache()
+            return value
+
+    def save(self, secret_id, payload):
+        response = self.provider.save(secret_id, payload)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == secret_id]:
+                del self._entries[key]
+            self._save_disk_cache()
+        return response
+
+    def _load_disk_cache(self):
+        try:
+            with open(self._cache_path, 'rb') as f:
+                entries = json.loads(self._fernet.decrypt(f.read()))
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logging.warning(f'Ignoring unreadable secrets cache {self._cache_path}: {e}')
+            return
+        now = time.time()
+        for secret_id, version_id, value, fetched_at in entries:
+            if now - fetched_at < self.disk_ttl:
+                # Served for one regular TTL window, so startup needs no remote call
+                self._entries[(secret_id, version_id)] = (value, fetched_at, now + self.ttl)
+        logging.info(f'Loaded {len(self._entries)} secrets from encrypted cache')
+
+    def _save_disk_cache(self):
+        if not self._cache_path:
+            return
+        entries = [[secret_id, version_id, value, fetched_at]
+                   for (secret_id, version_id), (value, fetched_at, _) in self._entries.items()]
+        try:
+            temp_path = f"{self._cache_path}.tmp"
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self._fernet.encrypt(json.dumps(entries).encode("UTF-8")))
+            os.replace(temp_path, self._cache_path)
+        except OSError as e:
+            logging.warning(f'Could not write secrets cache {self._cache_path}: {e}')
+
+
+def _load_fernet(cache_key):
+    try:
+        from cryptography.fernet import Fernet
+    except ImportError:
+        logging.warning('SECRETS_CACHE_PATH is set but the cryptography package is missing, disk cache disabled')
+        return None
+    try:
+        return Fernet(cache_key)
+    except ValueError as e:
+        logging.warning(f'Invalid SECRETS_CACHE_KEY, disk cache disabled: {e}')
+        return None
+
+
+_providers = {}
+_providers_lock = threading.Lock()
+
+def get_secret_provider(project_id):
+    """Shared cached provider per GCP project."""
+    with _providers_lock:
+        if project_id not in _providers:
+            _providers[project_id] = CachedSecretProvider(
+                GcpSecretProvider(project_id), cache_path=SECRETS_CACHE_PATH, cache_key=SECRETS_CACHE_KEY
+            )
+        return _providers[project_id]
+
+def set_secret_provider(project_id, provider):
+    """Replaces the provider for a project, e.g. with a local fake."""
+    with _providers_lock:
+        _providers[project_id] = provider
+
 def access_secret_version(project_id, secret_id, version_id="latest"):
-    client = secretmanager.SecretManagerServiceClient()
-    name = f"projects/{project_id}/secrets/{secret_id}/versions/{version_id}"
-    response = client.access_secret_version(request={"name": name})
-    return response.payload.data.decode("UTF-8")
+    return get_secret_provider(project_id).access(secret_id, version_id)
 
 def save_secret_version(project_id, secret_id, payload):
-    client = secretmanager.SecretManagerServiceClient()
-    parent = f"projects/{project_id}/secrets/{secret_id}"
-    payload = payload.encode("UTF-8")
-    response = client.add_secret_version(
-        request={"parent": parent, "payload": {"data": payload}}
-    )
-    return response
+    return get_secret_provider(project_id).save(secret_id, payload)
 
 def get_raid_helper_api_key(project_id, secret_id, json_path):
     if project_id:
@@ -0,0 +1,104 @@
+"""
+Startet einen Bot bis zur Gateway-Verbindung, ohne Discord zu kontaktieren
+
+Wird von den Startup-Benchmarks als eigener Prozess gestartet (launch()). Login (static_login und
+application_info, zwei Requests) wird durch eine Wartezeit ersetzt; connect() schreibt Zeiten seit
+Prozessstart und RSS als JSON-Zeile auf stdout und beendet den Bot. Läuft in einem Temp-Verzeichnis
+mit einer Dummy-secrets.json.
+
+    python benchmarks/bot_startup.py group-helper [--features group_events,auto_grouping] [--login-ms 150]
+    python benchmarks/bot_startup.py auto-group [--login-ms 150]
+"""
+import time
+
+driver_started = time.perf_counter()
+
+import argparse  # noqa: E402
+import json  # noqa: E402
+import os  # noqa: E402
+import runpy  # noqa: E402
+import sys  # noqa: E402
+import tempfile  # noqa: E402
+from pathlib import Path  # noqa: E402
+
+GROUP_HELPER_APP = Path(__file__).resolve().parent.parent
+BOTS = {
+    "group-helper": GROUP_HELPER_APP / "group-helper.py",
+    "auto-group": GROUP_HELPER_APP.parent / "auto-group-app" / "auto-group.py",
+}
+SECRETS = {"DISCORD": [{"AppName": "discord-group-helper-app-token", "DiscordToken": "token"},
+                       {"AppName": "discord-auto-group-app-token", "DiscordToken": "token"}]}
+
+
+def launch(bot: str, features: str = "group_events", login_ms: float = 150, importtime: bool = False):
+    """Führt den Treiber in einem neuen Prozess aus; liefert (Ergebnis, Wandzeit bis Prozessende, stderr)."""
+    import subprocess
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + \
+              [__file__, bot, "--features", features, "--login-ms", str(login_ms)]
+    start = time.perf_counter()
+    completed = subprocess.run(command, capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - start
+    return json.loads(completed.stdout.strip().splitlines()[-1]), wall, completed.stderr
+
+
+def rss_kb() -> int:
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def patch_discord(login_seconds: float, timings: dict):
+    import asyncio
+    from types import SimpleNamespace
+
+    import discord
+    from discord.http import HTTPClient
+
+    async def static_login(self, token):
+        timings["login"] = time.perf_counter() - driver_started
+        await asyncio.sleep(login_seconds / 2)
+        return {"id": "1", "username": "bench", "discriminator": "0", "avatar": None, "bot": True}
+
+    async def application_info(self):
+        await asyncio.sleep(login_seconds / 2)
+        return SimpleNamespace(id=1, flags=discord.ApplicationFlags())
+
+    async def connect(self, *args, **kwargs):
+        timings["connect"] = time.perf_counter() - driver_started
+        timings["rss_kb"] = rss_kb()
+        await self.close()
+
+    HTTPClient.static_login = static_login
+    discord.Client.application_info = application_info
+    discord.Client.connect = connect
+    discord.AutoShardedClient.connect = connect
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("bot", choices=sorted(BOTS))
+    parser.add_argument("--features", default="group_events", help="BOT_FEATURES für group-helper")
+    parser.add_argument("--login-ms", type=float, default=150, help="simulierte Dauer des Logins")
+    args = parser.parse_args()
+
+    workdir = tempfile.TemporaryDirectory(prefix="bot-startup-")
+    os.chdir(workdir.name)
+    Path("secrets.json").write_text(json.dumps(SECRETS), encoding="utf-8")
+    os.environ.update(BOT_FEATURES=args.features, SECRETS_PATH="secrets.json")
+    script = BOTS[args.bot]
+    sys.path.insert(0, str(script.parent))
+    if args.bot == "group-helper":
+        # Kein Metrics-Endpunkt auf einem festen Port
+        import config
+        config.METRICS_PORT = 0
+
+    timings = {}
+    patch_discord(args.login_ms / 1000, timings)
+    runpy.run_path(str(script), run_name="__main__")
+    print(json.dumps(timings), file=sys.__stdout__)
+
+
+if __name__ == "__main__":
+    main()
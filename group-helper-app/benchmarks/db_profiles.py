@@ -0,0 +1,87 @@
+"""
+SQLite-Profile der Lösch-Datenbank im Vergleich: "legacy" gegen "tuned" (user-005)
+
+Führt für jedes Profil aus DB_PROFILES in einer eigenen Datei dieselben Zugriffe aus wie der Bot, über
+die echten DB-Funktionen des Schedulers: einzelne Inserts mit Commit (schedule_deletion), Abfragen der
+fälligen Seite, einzelne und gesammelte Deletes. Zusätzlich liest ein zweiter Thread fällige Seiten,
+während der DB-Thread schreibt.
+
+    python benchmarks/db_profiles.py [--rows 2000]
+"""
+import argparse
+import threading
+import time
+from datetime import datetime, timedelta
+
+import harness
+
+harness.setup_workdir()
+
+from services.database import DB_PROFILES, Base, SessionLocal, create_db_engine  # noqa: E402
+from services.scheduler import DUE_PAGE_SIZE, _delete_many, _delete_one, _insert_deletion, _select_due_page  # noqa: E402
+
+
+def rate(count: int, func) -> float:
+    """Operationen pro Sekunde für `count` Operationen in `func`."""
+    start = time.perf_counter()
+    func()
+    return count / (time.perf_counter() - start)
+
+
+def reads_during_writes(now: datetime, first_id: int, writes: int) -> float:
+    """Fällige Seiten pro Sekunde in einem Lese-Thread, solange ein Schreib-Thread einzeln einfügt."""
+    writing = threading.Event()
+    reads = 0
+
+    def writer():
+        writing.set()
+        for channel_id in range(first_id, first_id + writes):
+            _insert_deletion(channel_id, 1, now, now + timedelta(days=1), None, 1)
+        writing.clear()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    writing.wait()
+    start = time.perf_counter()
+    while writing.is_set():
+        _select_due_page(now, DUE_PAGE_SIZE, None, None)
+        reads += 1
+    elapsed = time.perf_counter() - start
+    thread.join()
+    return reads / elapsed
+
+
+def run_profile(name: str, rows: int) -> list[str]:
+    engine = create_db_engine(f"sqlite:///./bench-{name}.db", DB_PROFILES[name])
+    Base.metadata.create_all(engine)
+    # Die Scheduler-Funktionen öffnen ihre Sessions über SessionLocal
+    SessionLocal.configure(bind=engine)
+    now = datetime.now()
+    try:
+        inserts = rate(rows, lambda: [
+            _insert_deletion(channel_id, 1, now, now - timedelta(seconds=channel_id), f"event-{channel_id}", 1)
+            for channel_id in range(1, rows + 1)
+        ])
+        selects = rate(200, lambda: [_select_due_page(now, DUE_PAGE_SIZE, None, None) for _ in range(200)])
+        half = rows // 2
+        deletes_one = rate(half, lambda: [_delete_one(channel_id) for channel_id in range(1, half + 1)])
+        deletes_many = rate(rows - half, lambda: _delete_many(list(range(half + 1, rows + 1))))
+        mixed = reads_during_writes(now, rows + 1, rows)
+    finally:
+        engine.dispose()
+    return [name, f"{inserts:.0f}", f"{selects:.0f}", f"{deletes_one:.0f}", f"{deletes_many:.0f}", f"{mixed:.0f}"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=2000, help="Zeilen pro Durchlauf")
+    args = parser.parse_args()
+
+    results = [run_profile(name, args.rows) for name in DB_PROFILES]
+    print(f"{args.rows} Zeilen, Operationen pro Sekunde\n")
+    harness.print_table(["Profil", "Insert+Commit", "fällige Seite", "Delete einzeln", "Delete gesammelt",
+                         "Lesen während Schreiben"], results)
+
+
+if __name__ == "__main__":
+    main()
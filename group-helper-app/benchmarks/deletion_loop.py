@@ -0,0 +1,125 @@
+"""
+Lösch-Loop: stündlicher Poll über die ganze Tabelle (vor user-001) gegen den Deadline-Heap
+
+Misst bei N ausstehenden Löschungen die Kosten eines Ticks und die Verspätung, mit der fällige
+Channels gelöscht werden. Die Verspätung des stündlichen Polls folgt aus den Tick-Zeitpunkten
+(zufällige Phase), die des Heaps wird live mit echten Deadlines gemessen.
+
+    python benchmarks/deletion_loop.py [--rows 100000] [--due 50] [--live 200]
+"""
+import argparse
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+
+import harness
+
+harness.setup_workdir()
+
+from services.database import SessionLocal  # noqa: E402
+from services.models import ScheduledDeletion  # noqa: E402
+from services.scheduler import DeletionScheduler  # noqa: E402
+
+POLL_INTERVAL_SECONDS = 3600
+
+
+def legacy_tick(get_channel, now: datetime) -> list[int]:
+    """Der alte Tick ohne die Discord-Aufrufe: alle Zeilen als ORM-Objekte laden und einzeln prüfen."""
+    session = SessionLocal()
+    try:
+        deletions = session.query(ScheduledDeletion).all()
+    finally:
+        session.close()
+    due = []
+    for deletion in deletions:
+        channel = get_channel(deletion.new_channel_id)
+        if not channel:
+            continue
+        if deletion.delete_time <= now:
+            due.append(deletion.new_channel_id)
+        else:
+            logging.info(f"Channel {deletion.event_title} noch nicht löschen.")
+    return due
+
+
+def heap_tick(scheduler: DeletionScheduler, due: list[tuple[int, datetime]], now: datetime) -> float:
+    """Ein Tick des Heaps (fällige entnehmen, nächste Deadline bestimmen); Laufzeit in Sekunden."""
+    for channel_id, delete_time in due:
+        scheduler.push(channel_id, delete_time)
+    start = time.perf_counter()
+    scheduler.pop_due(now)
+    scheduler.next_deadline()
+    return time.perf_counter() - start
+
+
+def polled_lateness(deadlines: list[datetime], now: datetime) -> list[float]:
+    """Verspätung (Sekunden) bei stündlichen Ticks mit zufälliger Phase."""
+    rng = random.Random(0)
+    lateness = []
+    for deadline in deadlines:
+        phase = rng.uniform(0, POLL_INTERVAL_SECONDS)
+        since_first_tick = (deadline - now).total_seconds() - phase
+        lateness.append(-since_first_tick % POLL_INTERVAL_SECONDS)
+    return lateness
+
+
+async def live_lateness(scheduler: DeletionScheduler, count: int) -> list[float]:
+    """Plant `count` Deadlines in den nächsten 2 Sekunden ein und misst, wie spät wait_for_due sie liefert."""
+    start = datetime.now() + timedelta(milliseconds=100)
+    deadlines = {-(i + 1): start + timedelta(seconds=random.uniform(0, 2)) for i in range(count)}
+    for channel_id, deadline in deadlines.items():
+        scheduler.push(channel_id, deadline)
+    lateness = []
+    while len(lateness) < count:
+        due = await scheduler.wait_for_due()
+        now = datetime.now()
+        lateness.extend((now - deadlines[channel_id]).total_seconds() for channel_id in due if channel_id < 0)
+    return lateness
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000, help="ausstehende Löschungen")
+    parser.add_argument("--due", type=int, default=50, help="davon pro Tick fällig")
+    parser.add_argument("--live", type=int, default=200, help="Deadlines für die Live-Messung des Heaps")
+    args = parser.parse_args()
+
+    now = datetime.now()
+    harness.seed_deletions(args.rows, now, due=args.due)
+    channels = dict.fromkeys(range(1, args.rows + 1), True)
+    session = SessionLocal()
+    try:
+        rows = session.query(ScheduledDeletion.new_channel_id, ScheduledDeletion.delete_time).all()
+    finally:
+        session.close()
+    due_rows = [(channel_id, delete_time) for channel_id, delete_time in rows if delete_time <= now]
+    future_deadlines = [delete_time for _, delete_time in rows if delete_time > now]
+
+    legacy = harness.measure(lambda: legacy_tick(channels.get, now), repeat=3)
+
+    scheduler = DeletionScheduler()
+    start = time.perf_counter()
+    asyncio.run(scheduler.rebuild())
+    rebuild = time.perf_counter() - start
+    heap = sorted(heap_tick(scheduler, due_rows, now) for _ in range(20))[10]
+
+    polled = polled_lateness(future_deadlines, now)
+    live = asyncio.run(live_lateness(scheduler, args.live))
+
+    print(f"{args.rows} ausstehende Löschungen, {len(due_rows)} fällig pro Tick\n")
+    harness.print_table(
+        ["Variante", "Tick (ms)", "Verspätung Mittel (s)", "p99 (s)", "Max (s)"],
+        [
+            ["stündlicher Poll", f"{legacy * 1000:.1f}", f"{sum(polled) / len(polled):.1f}",
+             f"{harness.percentile(polled, 0.99):.1f}", f"{max(polled):.1f}"],
+            ["Deadline-Heap", f"{heap * 1000:.3f}", f"{sum(live) / len(live):.4f}",
+             f"{harness.percentile(live, 0.99):.4f}", f"{max(live):.4f}"],
+        ]
+    )
+    print(f"\nEinmaliger Aufbau des Heaps beim Start: {rebuild * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Abfrage fälliger Löschungen bei wachsender Tabelle (user-002)
+
+Lässt die Tabelle schrittweise bis auf 1.000.000 Zeilen wachsen; fällig ist dabei immer dieselbe
+Anzahl Zeilen. Gemessen werden die erste Seite fälliger Löschungen, eine Seite mitten in der Tabelle
+(Keyset-Pagination, wie beim Aufbau des Heaps) und zum Vergleich das frühere Laden aller Zeilen als
+ORM-Objekte (nur bis --legacy-max Zeilen, darüber dauert es zu lange).
+
+    python benchmarks/due_query.py [--sizes 10000,100000,1000000] [--due 500]
+"""
+import argparse
+from datetime import datetime
+
+import harness
+
+harness.setup_workdir()
+
+from sqlalchemy import text  # noqa: E402
+
+from services.database import SessionLocal, engine  # noqa: E402
+from services.models import ScheduledDeletion  # noqa: E402
+from services.scheduler import DUE_PAGE_SIZE, _select_due_page  # noqa: E402
+
+
+def legacy_load_all() -> int:
+    """Das frühere get_pending_deletions(): alle Zeilen als vollständige ORM-Objekte."""
+    session = SessionLocal()
+    try:
+        return len(session.query(ScheduledDeletion).all())
+    finally:
+        session.close()
+
+
+def middle_row(count: int) -> tuple[datetime, int]:
+    """(delete_time, new_channel_id) der Zeile in der Mitte der Deadline-Reihenfolge."""
+    with engine.connect() as connection:
+        channel_id, delete_time = connection.execute(text(
+            "SELECT new_channel_id, delete_time FROM scheduled_deletions "
+            "ORDER BY delete_time, new_channel_id LIMIT 1 OFFSET :offset"), {"offset": count // 2}).one()
+    return datetime.fromisoformat(delete_time), channel_id
+
+
+def query_plan(now: datetime) -> list[str]:
+    with engine.connect() as connection:
+        rows = connection.execute(text(
+            "EXPLAIN QUERY PLAN SELECT new_channel_id, delete_time FROM scheduled_deletions "
+            "WHERE delete_time <= :now ORDER BY delete_time, new_channel_id LIMIT :limit"),
+            {"now": now, "limit": DUE_PAGE_SIZE}).all()
+    return [row[-1] for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Tabellengrößen, kommagetrennt")
+    parser.add_argument("--due", type=int, default=DUE_PAGE_SIZE, help="fällige Zeilen")
+    parser.add_argument("--legacy-max", type=int, default=100_000, help="größte Tabelle für den Vergleich")
+    args = parser.parse_args()
+
+    now = datetime.now()
+    results = []
+    seeded = 0
+    for size in sorted(int(size) for size in args.sizes.split(",")):
+        harness.seed_deletions(size, now, due=args.due, start_id=seeded + 1)
+        seeded = size
+
+        due_page = harness.measure(lambda: _select_due_page(now, DUE_PAGE_SIZE, None, None), repeat=20)
+        after = middle_row(size)
+        deep_page = harness.measure(lambda: _select_due_page(datetime.max, DUE_PAGE_SIZE, after, None), repeat=20)
+        legacy = harness.measure(legacy_load_all, repeat=3) if size <= args.legacy_max else None
+        results.append([size, f"{due_page * 1000:.2f}", f"{deep_page * 1000:.2f}",
+                        f"{legacy * 1000:.0f}" if legacy is not None else "-"])
+
+    print(f"{args.due} fällige Zeilen, Seitengröße {DUE_PAGE_SIZE}\n")
+    harness.print_table(["Zeilen", "fällige Seite (ms)", "Seite Tabellenmitte (ms)", "alle Zeilen laden (ms)"],
+                        results)
+    print("\nQuery-Plan der fälligen Seite: " + "; ".join(query_plan(now)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Gemeinsame Helfer der Benchmarks: Arbeitsverzeichnis, Zeitmessung und Ausgabe
+
+Die Services legen data/ und logs/ relativ zum Arbeitsverzeichnis an. Benchmarks rufen daher
+setup_workdir() auf, bevor sie Services importieren, und laufen in einem Temp-Verzeichnis.
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+_workdir = None
+
+
+def setup_workdir() -> str:
+    """App-Verzeichnis in den Importpfad, leeres Temp-Verzeichnis als Arbeitsverzeichnis."""
+    global _workdir
+    if _workdir is None:
+        sys.path.insert(0, str(APP_DIR))
+        _workdir = tempfile.TemporaryDirectory(prefix="group-helper-bench-")
+        os.chdir(_workdir.name)
+    return _workdir.name
+
+
+def measure(func, repeat: int = 5) -> float:
+    """Median der Laufzeit (Sekunden) über `repeat` Aufrufe."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+def print_table(headers, rows):
+    """Gibt eine Tabelle mit rechtsbündigen Spalten aus."""
+    cells = [[str(header) for header in headers]] + [[str(cell) for cell in row] for row in rows]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(headers))]
+    for i, row in enumerate(cells):
+        print("  ".join(cell.rjust(width) for cell, width in zip(row, widths)))
+        if i == 0:
+            print("  ".join("-" * width for width in widths))
+
+
+def seed_deletions(count: int, now, spread_days: float = 7, due: int = 0, chunk: int = 50_000, start_id: int = 1):
+    """
+    Legt Löschaufträge mit den Channel-IDs start_id..count an; bei start_id 1 in einer frischen
+    Datenbank, sonst zusätzlich zu den vorhandenen (um eine Tabelle schrittweise wachsen zu lassen).
+
+    Die Aufträge mit ID <= `due` sind bereits fällig, die übrigen liegen gleichverteilt in den
+    nächsten `spread_days` Tagen. Eingefügt wird per executemany ohne ORM-Objekte.
+    """
+    import random
+    from datetime import timedelta
+    from services.database import Base, engine, init_db
+    from services.models import ScheduledDeletion
+
+    if start_id == 1:
+        Base.metadata.drop_all(engine)
+        init_db()
+    rng = random.Random(count)
+    spread = spread_days * 86400
+    insert = ScheduledDeletion.__table__.insert()
+    with engine.begin() as connection:
+        for first in range(start_id, count + 1, chunk):
+            rows = []
+            for channel_id in range(first, min(first + chunk, count + 1)):
+                offset = -rng.uniform(1, 3600) if channel_id <= due else rng.uniform(1, spread)
+                delete_time = now + timedelta(seconds=offset)
+                rows.append({
+                    "new_channel_id": channel_id,
+                    "base_channel_id": channel_id % 50 + 1,
+                    "guild_id": channel_id % 20 + 1,
+                    "event_time": delete_time - timedelta(hours=24),
+                    "delete_time": delete_time,
+                    "event_title": f"event-{channel_id}",
+                })
+            connection.execute(insert, rows)
@@ -0,0 +1,74 @@
+"""
+Startzeit beider Bots: Import-Profil per -X importtime und Zeit bis zur Gateway-Verbindung
+
+Startet group-helper.py und auto-group.py über bot_startup.py ohne Discord. Ein Lauf mit
+`-X importtime` liefert die Importzeit insgesamt und die teuersten Pakete; die Zeitläufe (ohne
+importtime) messen die Zeit vom Login-Beginn bis connect() (Login und setup_hook), einmal ohne und einmal
+mit simuliertem Login. group-helper.py
+importiert seine Features in einem Thread, während der Login läuft; "im Login versteckt" ist der Teil
+der Login-Zeit, um den der Start dadurch nicht länger wird (auto-group.py importiert alles vorab).
+
+    python benchmarks/import_time.py [--login-ms 150] [--repeat 3] [--top 8]
+"""
+import argparse
+import re
+import statistics
+from collections import Counter
+
+import harness
+from bot_startup import launch
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def parse_importtime(stderr: str):
+    """Summe der Eigenzeiten (ms) und kumulierte Zeit (ms) je Top-Level-Paket."""
+    total = 0
+    packages = Counter()
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        total += int(self_us)
+        if not indent:
+            packages[name.split(".")[0]] += int(cumulative_us)
+    return total / 1000, {name: us / 1000 for name, us in packages.most_common()}
+
+
+def startup_times(bot: str, login_ms: float, repeat: int) -> tuple[float, float]:
+    """Mediane Zeit bis connect() und vom Login-Beginn bis connect() (Login plus setup_hook)."""
+    results = [launch(bot, login_ms=login_ms)[0] for _ in range(repeat)]
+    return (statistics.median(result["connect"] for result in results),
+            statistics.median(result["connect"] - result["login"] for result in results))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--login-ms", type=float, default=150, help="simulierte Dauer des Logins")
+    parser.add_argument("--repeat", type=int, default=5, help="Zeitläufe pro Bot und Variante (Median)")
+    parser.add_argument("--top", type=int, default=8, help="Anzahl der teuersten Pakete")
+    args = parser.parse_args()
+
+    rows = []
+    profiles = {}
+    for bot in ("group-helper", "auto-group"):
+        _, _, stderr = launch(bot, login_ms=args.login_ms, importtime=True)
+        total, packages = parse_importtime(stderr)
+        profiles[bot] = packages
+        connect, without_login = startup_times(bot, 0, args.repeat)
+        _, with_login = startup_times(bot, args.login_ms, args.repeat)
+        hidden = without_login * 1000 + args.login_ms - with_login * 1000
+        rows.append([bot, f"{total:.0f}", f"{connect * 1000:.0f}", f"{without_login * 1000:.0f}",
+                     f"{with_login * 1000:.0f}", f"{hidden:.0f}"])
+
+    print(f"Zeiten seit Start des Treibers, Login simuliert mit {args.login_ms:g} ms\n")
+    harness.print_table(["Bot", "Importe ms", "bis connect ms", "Login→connect ohne Login ms",
+                         "Login→connect mit Login ms", "im Login versteckt ms"], rows)
+    for bot, packages in profiles.items():
+        print(f"\n{bot}: teuerste Pakete (kumuliert)")
+        harness.print_table(["Paket", "ms"], [[name, f"{ms:.1f}"] for name, ms in list(packages.items())[:args.top]])
+
+
+if __name__ == "__main__":
+    main()
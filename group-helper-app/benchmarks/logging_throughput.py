@@ -0,0 +1,130 @@
+"""
+Logging unter Last: 10.000 Records/s direkt in die Handler gegen die Queue mit Listener-Thread
+
+Jede Variante läuft in einem eigenen Prozess (das Logging ist prozessweit konfiguriert): Ein Task
+schreibt im Event Loop alle 10 ms die bis dahin fälligen Records, ein Heartbeat-Task misst im Millisekundentakt,
+wie lange der Loop blockiert war. "direkt" hängt die Datei- und Konsolen-Handler wie vor der Queue an
+den Root-Logger, "queue" nutzt setup_logging(). Die Konsole geht nach /dev/null.
+
+    python benchmarks/logging_throughput.py [--rate 10000] [--seconds 5]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+
+import harness
+
+HEARTBEAT_SECONDS = 0.001
+BURST_SECONDS = 0.01
+
+
+def configure(variant: str):
+    if variant == "queue":
+        from utils.logger import setup_logging
+        setup_logging()
+        return
+    from logging.handlers import TimedRotatingFileHandler
+    os.makedirs("logs", exist_ok=True)
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s')
+    handlers = []
+    for filename, level in (("logs/bot.log", logging.INFO), ("logs/errors.log", logging.ERROR)):
+        handler = TimedRotatingFileHandler(filename, when="midnight", backupCount=30, encoding="utf-8")
+        handler.setLevel(level)
+        handlers.append(handler)
+    handlers.append(logging.StreamHandler())
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    logging.basicConfig(level=logging.INFO, handlers=handlers)
+
+
+async def load(rate: int, seconds: float) -> dict:
+    stalls = []
+    done = asyncio.Event()
+
+    async def heartbeat():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(HEARTBEAT_SECONDS)
+            stalls.append(time.perf_counter() - start - HEARTBEAT_SECONDS)
+
+    async def produce():
+        sent = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            # So viele Records, wie bei `rate` bis jetzt fällig sind
+            for _ in range(int((time.perf_counter() - start) * rate) - sent):
+                sent += 1
+                if sent % 1000 == 0:
+                    logging.error("Record %d: Fehler beim Löschen von Channel %d", sent, sent)
+                else:
+                    logging.info("Record %d: Channel %d gelöscht, Verspätung %.3fs", sent, sent, 0.25)
+            await asyncio.sleep(BURST_SECONDS)
+        done.set()
+        return sent, time.perf_counter() - start
+
+    beat = asyncio.create_task(heartbeat())
+    sent, elapsed = await produce()
+    await beat
+    return {"sent": sent, "elapsed": elapsed, "max_stall": max(stalls), "p99_stall": harness.percentile(stalls, 0.99)}
+
+
+def child(variant: str, rate: int, seconds: float):
+    harness.setup_workdir()
+    configure(variant)
+    result = asyncio.run(load(rate, seconds))
+    start = time.perf_counter()
+    if variant == "queue":
+        from utils.logger import stop_logging
+        from utils.metrics import LOG_RECORDS_DROPPED
+        stop_logging()
+        result["dropped"] = LOG_RECORDS_DROPPED.get()
+    else:
+        result["dropped"] = 0
+    result["flush"] = time.perf_counter() - start
+    with open("logs/bot.log", encoding="utf-8") as log_file:
+        result["written"] = sum(1 for line in log_file if line.startswith("20") and "Record " in line)
+    print(json.dumps(result), file=sys.__stdout__)
+
+
+def run_variant(variant: str, rate: int, seconds: float) -> dict:
+    completed = subprocess.run(
+        [sys.executable, __file__, "--child", variant, "--rate", str(rate), "--seconds", str(seconds)],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rate", type=int, default=10_000, help="Records pro Sekunde")
+    parser.add_argument("--seconds", type=float, default=5, help="Dauer pro Variante")
+    parser.add_argument("--child", choices=["direkt", "queue"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.rate, args.seconds)
+        return
+
+    rows = []
+    for variant in ("direkt", "queue"):
+        result = run_variant(variant, args.rate, args.seconds)
+        rows.append([
+            variant,
+            f"{result['sent'] / result['elapsed']:,.0f}",
+            f"{result['p99_stall'] * 1000:.2f}",
+            f"{result['max_stall'] * 1000:.2f}",
+            f"{result['written']:,}",
+            f"{result['dropped']:,}",
+            f"{result['flush'] * 1000:.0f}",
+        ])
+    print(f"Ziel: {args.rate:,} Records/s für {args.seconds:g}s, davon jeder 1000. als ERROR\n")
+    harness.print_table(["Variante", "Records/s", "Stall p99 ms", "Stall max ms", "geschrieben", "verworfen",
+                         "Flush ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Speicher des Discord-Caches: synthetischer READY einer großen Guild plus Event-Replay, alte gegen neue Profile
+
+Jedes Profil (Intents und Cache-Einstellungen wie vor und nach user-016) läuft in einem eigenen Prozess.
+Die Gateway-Payloads werden direkt in die Parser von discord.py gegeben: READY, GUILD_CREATE für jede
+Guild, danach ein Replay aus Nachrichten, Voice-Updates, Typing und Reaktionen. Wie beim echten
+Gateway kommen nur Events an, deren Intent aktiv ist; ohne message_content ist der Inhalt leer.
+Gemessen wird das RSS vor dem READY (Client und vorab erzeugte Payloads), nach dem READY und nach
+dem Replay; "Cache MB" ist der Zuwachs zwischen erster und letzter Messung.
+
+    python benchmarks/ready_memory.py [--guilds 5] [--channels 500] [--voice-members 2000] [--events 100000]
+"""
+import argparse
+import asyncio
+import gc
+import json
+import random
+import subprocess
+import sys
+
+import harness
+
+TIMESTAMP = "2026-01-01T20:00:00+00:00"
+
+
+def profiles():
+    import discord
+
+    def old(intents):
+        return {"intents": intents}
+
+    def new(intents):
+        return {"intents": intents, "max_messages": None, "chunk_guilds_at_startup": False,
+                "member_cache_flags": discord.MemberCacheFlags.from_intents(intents)}
+
+    group_helper_old = discord.Intents.default()
+    group_helper_old.message_content = True
+    auto_group_new = discord.Intents.none()
+    auto_group_new.guilds = auto_group_new.voice_states = True
+    return {
+        "group-helper alt": old(group_helper_old),
+        "group-helper neu": new(discord.Intents(guilds=True)),
+        "auto-group alt": old(discord.Intents.default()),
+        "auto-group neu / kombiniert": new(auto_group_new),
+    }
+
+
+def rss_mb() -> float:
+    gc.collect()
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+class Payloads:
+    """Gateway-Payloads einer Bot-Installation mit `guilds` großen Guilds."""
+
+    def __init__(self, guilds: int, channels: int, voice_members: int, intents):
+        self.rng = random.Random(16)
+        self.intents = intents
+        self.guild_ids = [10**17 + g for g in range(guilds)]
+        self.channels = channels
+        self.voice_members = voice_members
+
+    @staticmethod
+    def user(user_id: int) -> dict:
+        return {"id": str(user_id), "username": f"user{user_id}", "discriminator": "0", "avatar": None,
+                "global_name": f"User {user_id}"}
+
+    def member(self, user_id: int, with_user: bool = True) -> dict:
+        member = {"roles": [], "joined_at": TIMESTAMP, "deaf": False, "mute": False, "nick": None, "flags": 0}
+        if with_user:
+            member["user"] = self.user(user_id)
+        return member
+
+    def channel_id(self, guild_id: int, n: int) -> int:
+        return guild_id * 10_000 + n
+
+    def voice_channel_id(self, guild_id: int) -> int:
+        # Die zweite Hälfte der Channels sind Voice-Channels
+        return self.channel_id(guild_id, self.rng.randrange(self.channels // 2, self.channels))
+
+    def text_channel_id(self, guild_id: int) -> int:
+        return self.channel_id(guild_id, self.rng.randrange(self.channels // 2))
+
+    def ready(self) -> dict:
+        return {"v": 10, "user": {**self.user(1), "bot": True}, "session_id": "bench",
+                "resume_gateway_url": "wss://gateway.invalid", "application": {"id": "1", "flags": 0},
+                "guilds": [{"id": str(guild_id), "unavailable": True} for guild_id in self.guild_ids]}
+
+    def guild_create(self, guild_id: int) -> dict:
+        channels = []
+        for n in range(self.channels):
+            channel = {"id": str(self.channel_id(guild_id, n)), "name": f"channel-{n}", "position": n,
+                       "permission_overwrites": [], "parent_id": None, "nsfw": False}
+            if n < self.channels // 2:
+                channel.update(type=0, topic=f"Thema {n}", rate_limit_per_user=0, last_message_id=None)
+            else:
+                channel.update(type=2, bitrate=64000, user_limit=0, rtc_region=None)
+            channels.append(channel)
+        voice_states, members = [], [self.member(1)]
+        if self.intents.voice_states:
+            for user_id in range(2, self.voice_members + 2):
+                members.append(self.member(user_id))
+                voice_states.append({"user_id": str(user_id), "channel_id": str(self.voice_channel_id(guild_id)),
+                                     "session_id": "s", "deaf": False, "mute": False, "self_deaf": False,
+                                     "self_mute": False, "self_video": False, "suppress": False,
+                                     "request_to_speak_timestamp": None})
+        return {
+            "id": str(guild_id), "name": f"Guild {guild_id}", "owner_id": "2", "member_count": 100_000,
+            "large": True, "unavailable": False, "verification_level": 0, "default_message_notifications": 0,
+            "explicit_content_filter": 0, "mfa_level": 0, "nsfw_level": 0, "premium_tier": 0, "afk_timeout": 300,
+            "features": [], "channels": channels, "threads": [], "members": members, "voice_states": voice_states,
+            "presences": [], "stickers": [],
+            "roles": [{"id": str(guild_id + r), "name": f"role-{r}", "color": 0, "hoist": False, "position": r,
+                       "permissions": "0", "managed": False, "mentionable": False} for r in range(200)],
+            "emojis": [{"id": str(guild_id * 1000 + e), "name": f"emoji{e}", "roles": [], "require_colons": True,
+                        "managed": False, "animated": False, "available": True} for e in range(100)],
+        }
+
+    def events(self, count: int):
+        """(Event-Name, Payload) in Gateway-Reihenfolge; nur Events, deren Intent aktiv ist."""
+        for n in range(count):
+            guild_id = self.rng.choice(self.guild_ids)
+            user_id = self.rng.randrange(2, 50_000)
+            kind = self.rng.random()
+            if kind < 0.6:
+                if not self.intents.guild_messages:
+                    continue
+                content = f"Nachricht {n} " + "x" * self.rng.randrange(20, 400)
+                yield "MESSAGE_CREATE", {
+                    "id": str(10**18 + n), "channel_id": str(self.text_channel_id(guild_id)), "guild_id": str(guild_id),
+                    "author": self.user(user_id), "member": self.member(user_id, with_user=False),
+                    "content": content if self.intents.message_content else "", "timestamp": TIMESTAMP,
+                    "edited_timestamp": None, "tts": False, "mention_everyone": False, "mentions": [],
+                    "mention_roles": [], "attachments": [], "embeds": [], "pinned": False, "type": 0}
+            elif kind < 0.8:
+                if not self.intents.voice_states:
+                    continue
+                user_id = self.rng.randrange(2, self.voice_members + 2)
+                channel_id = self.voice_channel_id(guild_id) if self.rng.random() < 0.8 else None
+                yield "VOICE_STATE_UPDATE", {
+                    "guild_id": str(guild_id), "channel_id": channel_id and str(channel_id), "user_id": str(user_id),
+                    "member": self.member(user_id), "session_id": "s", "deaf": False, "mute": False,
+                    "self_deaf": False, "self_mute": False, "self_video": False, "suppress": False,
+                    "request_to_speak_timestamp": None}
+            elif kind < 0.9:
+                if not self.intents.guild_typing:
+                    continue
+                yield "TYPING_START", {"channel_id": str(self.text_channel_id(guild_id)), "guild_id": str(guild_id),
+                                       "user_id": str(user_id), "timestamp": 1_800_000_000,
+                                       "member": self.member(user_id)}
+            else:
+                if not self.intents.guild_reactions:
+                    continue
+                yield "MESSAGE_REACTION_ADD", {
+                    "user_id": str(user_id), "channel_id": str(self.text_channel_id(guild_id)),
+                    "message_id": str(10**18 + self.rng.randrange(n + 1)), "guild_id": str(guild_id),
+                    "emoji": {"id": None, "name": "👍"}, "member": self.member(user_id), "type": 0}
+
+
+async def replay(profile: str, args) -> dict:
+    import discord
+
+    settings = profiles()[profile]
+    client = discord.Client(**settings)
+    # Wie in Client.login(): Loop-gebundene Teile des Clients anlegen, ohne Gateway
+    await client._async_setup_hook()
+    state = client._connection
+    state.guild_ready_timeout = 0.01
+    payloads = Payloads(args.guilds, args.channels, args.voice_members, settings["intents"])
+    # Payloads vorab erzeugen, damit sie nicht in die Messung nach dem Replay eingehen
+    ready = payloads.ready()
+    guild_creates = [payloads.guild_create(guild_id) for guild_id in payloads.guild_ids]
+    result = {"start": rss_mb()}
+
+    state.parsers["READY"](ready)
+    for data in guild_creates:
+        state.parsers["GUILD_CREATE"](data)
+    del ready, guild_creates
+    while not client.is_ready():
+        await asyncio.sleep(0.01)
+    result["ready"] = rss_mb()
+
+    delivered = 0
+    for name, data in payloads.events(args.events):
+        state.parsers[name](data)
+        delivered += 1
+        if delivered % 1000 == 0:
+            # Dispatch-Tasks abarbeiten lassen
+            await asyncio.sleep(0)
+    await asyncio.sleep(0.05)
+    result.update(replay=rss_mb(), delivered=delivered, messages=len(state._messages or ()),
+                  members=sum(len(guild.members) for guild in client.guilds))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--guilds", type=int, default=5, help="Anzahl großer Guilds")
+    parser.add_argument("--channels", type=int, default=500, help="Channels pro Guild")
+    parser.add_argument("--voice-members", type=int, default=2000, help="Mitglieder im Voice pro Guild")
+    parser.add_argument("--events", type=int, default=100_000, help="Events im Replay (vor dem Intent-Filter)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(replay(args.child, args))), file=sys.__stdout__)
+        return
+
+    rows = []
+    for profile in profiles():
+        command = [sys.executable, __file__, "--child", profile, "--guilds", str(args.guilds), "--channels",
+                   str(args.channels), "--voice-members", str(args.voice_members), "--events", str(args.events)]
+        result = json.loads(subprocess.run(command, capture_output=True, text=True, check=True).stdout)
+        rows.append([profile, f"{result['start']:.1f}", f"{result['ready']:.1f}", f"{result['replay']:.1f}",
+                     f"{result['replay'] - result['start']:.1f}", f"{result['delivered']:,}",
+                     f"{result['messages']:,}", f"{result['members']:,}"])
+
+    print(f"{args.guilds} Guilds mit je {args.channels} Channels und {args.voice_members} Mitgliedern im Voice, "
+          f"{args.events:,} Events\n")
+    harness.print_table(["Profil", "RSS vor READY MB", "nach READY MB", "nach Replay MB", "Cache MB", "Events",
+                         "Nachrichten", "Mitglieder"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Kombinierter Betrieb gegen zwei Bots: Startzeit und Speicher (RSS) bis zur Gateway-Verbindung
+
+Startet über bot_startup.py ohne Discord einmal group-helper.py mit BOT_FEATURES=group_events,auto_grouping
+und einmal die beiden getrennten Bots (group-helper.py mit group_events, auto-group.py). Gemessen werden
+die Zeit bis connect(), die Wandzeit des Prozesses und das RSS bei connect(); für den getrennten Betrieb
+zählt die längere Startzeit und die Summe des RSS. Ohne Gateway fehlt der Cache der Guilds, der im
+getrennten Betrieb zusätzlich doppelt gehalten wird; den misst ready_memory.py.
+
+    python benchmarks/startup.py [--login-ms 150] [--repeat 5]
+"""
+import argparse
+import statistics
+
+import harness
+from bot_startup import launch
+
+VARIANTS = {
+    "group-helper.py (group_events)": ("group-helper", "group_events"),
+    "auto-group.py": ("auto-group", "group_events"),
+    "kombiniert (group_events,auto_grouping)": ("group-helper", "group_events,auto_grouping"),
+}
+
+
+def measure(bot: str, features: str, login_ms: float, repeat: int) -> dict:
+    runs = [launch(bot, features, login_ms) for _ in range(repeat)]
+    return {
+        "connect": statistics.median(result["connect"] for result, _, _ in runs),
+        "wall": statistics.median(wall for _, wall, _ in runs),
+        "rss_mb": statistics.median(result["rss_kb"] for result, _, _ in runs) / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--login-ms", type=float, default=150, help="simulierte Dauer des Logins")
+    parser.add_argument("--repeat", type=int, default=5, help="Läufe pro Variante (Median)")
+    args = parser.parse_args()
+
+    results = {name: measure(bot, features, args.login_ms, args.repeat) for name, (bot, features) in VARIANTS.items()}
+    separate = [results["group-helper.py (group_events)"], results["auto-group.py"]]
+    results["getrennt gesamt (beide Prozesse)"] = {
+        "connect": max(result["connect"] for result in separate),
+        "wall": max(result["wall"] for result in separate),
+        "rss_mb": sum(result["rss_mb"] for result in separate),
+    }
+
+    print(f"Median aus {args.repeat} Läufen, Login simuliert mit {args.login_ms:g} ms\n")
+    harness.print_table(["Variante", "bis connect ms", "Prozess ms", "RSS MB"], [
+        [name, f"{result['connect'] * 1000:.0f}", f"{result['wall'] * 1000:.0f}", f"{result['rss_mb']:.1f}"]
+        for name, result in results.items()
+    ])
+
+
+if __name__ == "__main__":
+    main()
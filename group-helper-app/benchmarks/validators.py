@@ -0,0 +1,133 @@
+"""
+Validierung von Event-Eingaben: Aufrufe pro Sekunde, bisherige Implementierung gegen validate_event
+
+Der Korpus benchmarks/data/validation_corpus.json enthält 500 Events in allen erlaubten Datums- und
+Zeitformaten, dazu ungültige Eingaben (falsche Kalenderdaten, verbotene Titel-Zeichen, zu lange
+Texte). Die bisherige Implementierung (strptime über alle Formate, Titelprüfung Zeichen für Zeichen)
+ist hier als Referenz nachgebaut. Abweichende Ergebnisse beider Varianten werden mit ausgegeben.
+
+    python benchmarks/validators.py [--repeat 20]
+"""
+import argparse
+import json
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+
+import harness
+
+harness.setup_workdir()
+
+from validators import validate_description, validate_event, validate_many  # noqa: E402
+
+CORPUS = Path(__file__).resolve().parent / "data" / "validation_corpus.json"
+
+
+def legacy_parse_date(date_str):
+    if not date_str or not isinstance(date_str, str):
+        return None, "Datum fehlt oder ist ungültig."
+    date_str = date_str.strip()
+    for date_format in ('%Y-%m-%d', '%d.%m.%Y', '%d/%m/%Y', '%d-%m-%Y', '%Y/%m/%d'):
+        try:
+            return datetime.strptime(date_str, date_format), None
+        except ValueError:
+            continue
+    return None, f"Ungültiges Datumsformat: `{date_str}`"
+
+
+def legacy_parse_time(time_str):
+    if not time_str or not isinstance(time_str, str):
+        return None, "Zeit fehlt oder ist ungültig."
+    time_str = time_str.strip()
+    if ':' in time_str:
+        match = re.match(r'^(\d{1,2}):(\d{2})$', time_str)
+        if not match:
+            return None, f"Ungültiges Zeitformat: `{time_str}` (erwarte **HH:MM**)"
+        hour, minute = int(match.group(1)), int(match.group(2))
+    elif '.' in time_str:
+        match = re.match(r'^(\d{1,2})\.(\d{2})$', time_str)
+        if not match:
+            return None, f"Ungültiges Zeitformat: `{time_str}` (erwarte **HH.MM**)"
+        hour, minute = int(match.group(1)), int(match.group(2))
+    elif len(time_str) in [3, 4] and time_str.isdigit():
+        hour, minute = (int(time_str[:2]), int(time_str[2:])) if len(time_str) == 4 else (int(time_str[0]), int(time_str[1:]))
+    else:
+        return None, f"Ungültiges Zeitformat: `{time_str}`"
+    if not (0 <= hour <= 23):
+        return None, f"Ungültige Stunde: {hour} (muss zwischen 0 und 23 liegen)"
+    if not (0 <= minute <= 59):
+        return None, f"Ungültige Minute: {minute} (muss zwischen 0 und 59 liegen)"
+    return (hour, minute), None
+
+
+def legacy_validate_title(title):
+    if not title or not isinstance(title, str):
+        return False, "Titel fehlt."
+    title = title.strip()
+    if len(title) < 3:
+        return False, "Titel muss mindestens 3 Zeichen lang sein."
+    if len(title) > 100:
+        return False, "Titel darf maximal 100 Zeichen lang sein."
+    for char in ['@', '#', ':', '```', 'discord']:
+        if char.lower() in title.lower():
+            return False, f"Titel darf '{char}' nicht enthalten."
+    return True, None
+
+
+def legacy_validate_event(date, time_str, title, desc):
+    """Vier getrennte Aufrufe wie im bisherigen Command, zusammengesetzt wie validate_event."""
+    parsed_date, date_error = legacy_parse_date(date)
+    parsed_time, time_error = legacy_parse_time(time_str)
+    _, title_error = legacy_validate_title(title)
+    _, desc_error = validate_description(desc)
+    errors = {field: error for field, error in
+              (("Datum", date_error), ("Zeit", time_error), ("Titel", title_error), ("Beschreibung", desc_error)) if error}
+    if errors:
+        return None, errors
+    return parsed_date.replace(hour=parsed_time[0], minute=parsed_time[1]), errors
+
+
+def fields(spec):
+    return spec["date"], spec["time"], spec["title"], spec["desc"]
+
+
+def verdict(result):
+    return "gültig" if result[0] else "ungültig"
+
+
+def calls_per_second(func, corpus, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(corpus)
+    return len(corpus) * repeat / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20, help="Durchläufe über den Korpus")
+    args = parser.parse_args()
+
+    corpus = json.loads(CORPUS.read_text(encoding="utf-8"))
+    variants = {
+        "bisher (4 Aufrufe, strptime)": lambda specs: [legacy_validate_event(*fields(spec)) for spec in specs],
+        "validate_event": lambda specs: [validate_event(*fields(spec)) for spec in specs],
+        "validate_many": validate_many,
+    }
+    rows = [[name, f"{calls_per_second(func, corpus, args.repeat):,.0f}"] for name, func in variants.items()]
+
+    legacy = [legacy_validate_event(*fields(spec)) for spec in corpus]
+    current = validate_many(corpus)
+    valid = sum(1 for _, errors in current if not errors)
+    print(f"{len(corpus)} Events im Korpus, davon {valid} gültig, {args.repeat} Durchläufe\n")
+    harness.print_table(["Variante", "Events/s"], rows)
+
+    differing = [(spec, old, new) for spec, old, new in zip(corpus, legacy, current)
+                 if old[0] != new[0]]
+    print(f"\nAbweichende Ergebnisse: {len(differing)}")
+    for spec, old, new in differing:
+        print(f"  {spec['date']!r} {spec['time']!r}: bisher {verdict(old)}, jetzt {verdict(new)}")
+
+
+if __name__ == "__main__":
+    main()
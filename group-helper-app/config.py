@@ -9,9 +9,55 @@ UTC_PLUS_ONE = timezone(timedelta(hours=1))
 # Channel wird nach X Stunden gelöscht
 DELETE_DELAY_HOURS = 24
 
+# Fehlgeschlagene Löschungen werden nach X Minuten erneut versucht
+DELETION_RETRY_MINUTES = 5
+
+# SQLite-Profil für die Lösch-Datenbank ("tuned" oder "legacy", siehe services/database.py)
+DB_PROFILE = "tuned"
+
 # Raid Helper Template ID für Events
 RAID_HELPER_TEMPLATE_ID = 2
 
+# Raid Helper HTTP-Client: max. parallele Verbindungen, DNS-Cache und Timeout (Sekunden)
+RAID_HELPER_CONNECTION_LIMIT = 10
+RAID_HELPER_DNS_CACHE_SECONDS = 300
+RAID_HELPER_TIMEOUT_SECONDS = 15
+
+# Anzahl paralleler Worker für die Event-Outbox
+OUTBOX_WORKERS = 3
+
+# Nicht gesendete Outbox-Jobs (API nicht erreichbar, Rate Limit): max. Versuche, danach
+# fehlgeschlagen; Wartezeit vor dem nächsten Versuch (Sekunden, verdoppelt sich bis zum Maximum)
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_RETRY_SECONDS = 60
+OUTBOX_RETRY_MAX_SECONDS = 900
+
+# Raid Helper Retries: max. Wiederholungen und Backoff (Sekunden)
+RAID_HELPER_MAX_RETRIES = 3
+RAID_HELPER_BACKOFF_SECONDS = 1
+RAID_HELPER_BACKOFF_MAX_SECONDS = 30
+
+# Raid Helper Circuit Breaker: nach X Fehlern in Folge Y Sekunden keine Requests
+RAID_HELPER_BREAKER_THRESHOLD = 5
+RAID_HELPER_BREAKER_COOLDOWN_SECONDS = 60
+
+# Event-Import (/group-event-import): max. Events und Dateigröße, parallele Channel-Klone,
+# Mindestabstand zwischen Fortschritts-Updates (Sekunden) und max. angezeigte Fehler
+IMPORT_MAX_EVENTS = 100
+IMPORT_MAX_BYTES = 256 * 1024
+IMPORT_CONCURRENCY = 5
+IMPORT_PROGRESS_SECONDS = 2
+IMPORT_MAX_ERRORS_SHOWN = 20
+
+# Event-Serien: Termine werden X Stunden vorher angelegt, Prüfung alle Y Minuten
+SERIES_LEAD_HOURS = 72
+SERIES_CHECK_MINUTES = 15
+
+# Lokaler Metrics-Endpunkt (Prometheus-Format, /metrics); Port 0 = deaktiviert.
+# Im Multi-Prozess-Betrieb nutzt Worker i den Port METRICS_PORT + i
+METRICS_HOST = "127.0.0.1"
+METRICS_PORT = 9464
+
 # Trigger-Zeichen
 TRIGGER_SIGN = '🎧'
 
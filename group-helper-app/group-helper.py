@@ -1,212 +1,188 @@
+import time
+
+# Prozessstart, für die Messung der Zeit bis Gateway-Ready
+started_at = time.perf_counter()
+
 import os
+import sys
+import asyncio
+import importlib
+import multiprocessing
+from concurrent.futures import Future, ThreadPoolExecutor
 import discord
-from discord import Interaction, app_commands
 import logging
-import asyncio
-from discord.ext import commands, tasks
+from pathlib import Path
+from discord.ext import commands
 
-from utils.secrets import get_discord_token
+from utils.secrets import get_discord_token, install_reload_signal
 from utils.logger import setup_logging
-from datetime import datetime, timedelta, timezone
-from config import UTC_PLUS_ONE, DELETE_DELAY_HOURS, RAID_HELPER_TEMPLATE_ID, DEBUG, DEBUG_GUILD_ID
-from validators import validate_and_parse_date, validate_and_parse_time, validate_title, validate_description
-from services.raid_helper import create_event
-from services.channel_manager import clone_channel_for_event, delete_channel_after_event
-from services.scheduler import get_pending_deletions, remove_deletion
-from services.database import init_db
-
-# Logging initialisieren
-setup_logging()
-
-# Define intents
-intents = discord.Intents.default()
-intents.message_content = True
-intents.messages = True
-
-bot = commands.Bot(command_prefix='!', intents=intents)
+from utils.metrics import metrics_server
+from utils.sharding import split_shards
+from config import DEBUG, DEBUG_GUILD_ID, METRICS_HOST, METRICS_PORT
+
+# Logging initialisieren; Shard-Worker (per "spawn" gestartet, Modulname __mp_main__) schreiben in eigene Dateien
+setup_logging(multiprocessing.current_process().name if __name__ == "__mp_main__" else None)
+
+# Secrets bei SIGHUP neu laden
+install_reload_signal()
+
+# Features (Extensions) dieses Deployments, z.B. "group_events,auto_grouping" für beide Bots in einem Prozess
+features = [feature.strip() for feature in os.getenv("BOT_FEATURES", "group_events").split(",") if feature.strip()]
+
+# Benötigte Intents je Feature
+FEATURE_INTENTS = {
+    "group_events": ["guilds"],
+    "auto_grouping": ["guilds", "voice_states"],
+}
+
+# Das Auto-Grouping Feature liegt in auto-group-app
+AUTO_GROUP_APP_PATH = Path(__file__).resolve().parent.parent / "auto-group-app"
+if "auto_grouping" in features:
+    sys.path.append(str(AUTO_GROUP_APP_PATH))
+
+# Define intents: nur was die aktivierten Features brauchen
+intents = discord.Intents.none()
+for feature in features:
+    for intent in FEATURE_INTENTS[feature]:
+        setattr(intents, intent, True)
+
+
+# Sharding: Anzahl Shards (leer = von Discord empfohlen) und Anzahl Worker-Prozesse, auf die sie verteilt werden
+shard_count = int(os.getenv("SHARD_COUNT", 0)) or None
+shard_processes = int(os.getenv("SHARD_PROCESSES", 1))
+
 secrets_path = os.getenv("SECRETS_PATH", "secrets.json")
 
 if DEBUG:
     guild_id = DEBUG_GUILD_ID
-    guild_obj = discord.Object(id=guild_id)
 else:
     guild_id = None
-    guild_obj = None
 
-token = get_discord_token("discord-group-helper-app-token", secrets_path)
+
+def preload_features() -> Future:
+    """
+    Importiert die Feature-Module samt ihrer Abhängigkeiten (SQLAlchemy, Services) in einem
+    Hintergrund-Thread, während sich der Bot bei Discord einloggt. discord.py ruft setup_hook erst
+    nach dem Login (static_login und application_info) auf; setup_hook wartet nur noch auf den Rest
+    der Importe, und load_extension findet die Module danach bereits im Modul-Cache.
+    """
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="preload")
+    future = executor.submit(lambda: [importlib.import_module(feature) for feature in features])
+    executor.shutdown(wait=False)
+    return future
 
 
-@bot.tree.command(name="group-event", guild=guild_obj)
-@app_commands.describe(
-    date="Datum (Formate: YYYY-MM-DD, DD.MM.YYYY, DD/MM/YYYY)",
-    time="Uhrzeit (Formate: HH:MM, HH.MM, HHMM)",
-    title="Titel des Gruppen-Events",
-    desc="Beschreibung des Events")
-async def group_event(interaction: Interaction, date: str, time: str, title: str, desc: str):
+def init_database():
     """
-    Erstellt ein neues Gruppen-Event mit eigenem Channel und Raid Helper Integration.
+    Legt die Tabellen an und migriert das Schema, einmal pro Start statt in jedem Worker-Prozess.
+    Nur nötig, wenn das Group-Event Feature aktiv ist.
     """
-    try:
-        # Sofort bestätigen, um Timeout zu vermeiden
-        await interaction.response.defer(ephemeral=True)
-
-        channel = interaction.channel
-        user_id = str(interaction.user.id)
-
-        # Validierung der Eingaben
-        parsed_date, date_error = validate_and_parse_date(date)
-        parsed_time, time_error = validate_and_parse_time(time)
-        title_valid, title_error = validate_title(title)
-        desc_valid, desc_error = validate_description(desc)
-
-        # Validierung sammeln
-        validation_errors = {
-            "Datum": date_error,
-            "Zeit": time_error,
-            "Titel": title_error if not title_valid else None,
-            "Beschreibung": desc_error if not desc_valid else None
-        }
-
-        # Nur Fehler filtern
-        error_messages = [f"**{field}:** {error}" for field, error in validation_errors.items() if error]
-
-        # Falls Fehler vorhanden (nur für User sichtbar)
-        if error_messages:
-            await interaction.followup.send(
-                "❌ **Fehlerhafte Eingaben:**\n" + "\n".join(error_messages)
-            )
-            logging.warning(f"Validierungsfehler von User {interaction.user.name}: {', '.join(error_messages)}")
-            return
+    if "group_events" not in features:
+        return
+    from services.database import engine, init_db
+    init_db()
+    # Keine Verbindung aus dem Pool an die Worker-Prozesse vererben
+    engine.dispose()
 
-        # DateTime-Objekt aus validierten Werten erstellen
-        hour, minute = parsed_time
-        event_datetime = parsed_date.replace(hour=hour, minute=minute, second=0, microsecond=0)
 
-        # Prüfen ob Event in der Zukunft liegt
-        if datetime.now() >= event_datetime:
-            await interaction.followup.send(
-                "❌ Das Gruppen-Event liegt in der Vergangenheit!"
-            )
-            logging.warning(f"Event-Erstellung abgelehnt: Event liegt in Vergangenheit ({event_datetime})")
-            return
+class GroupHelperBot(commands.AutoShardedBot):
+    """Bot, der die aktivierten Features als Extensions lädt."""
 
-        # Channel klonen
+    def __init__(self, *args, process_index: int = 0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.process_index = process_index
+        self.preloaded = preload_features()
+
+    async def setup_hook(self):
         try:
-            new_channel = await clone_channel_for_event(channel, title, event_datetime)
-        except discord.Forbidden:
-            logging.error("Bot hat keine Berechtigung, den Channel zu klonen")
-            await interaction.followup.send(
-                "❌ Ich habe keine Berechtigung, Channels zu erstellen!"
-            )
+            await asyncio.wrap_future(self.preloaded)
+        except Exception:
+            # Den eigentlichen Fehler meldet load_extension mit vollständigem Traceback
+            pass
+        if shard_processes == 1 and "group_events" in features:
+            # Im Multi-Prozess-Betrieb erledigt das der Elternprozess vor dem Start der Worker
+            from services.database import init_db, run_db
+            await run_db(init_db)
+        for feature in features:
+            await self.load_extension(feature)
+            logging.info(f"Feature geladen: {feature}")
+        if METRICS_PORT:
+            # Metriken sind optional: ein belegter Port darf den Bot nicht am Start hindern
+            try:
+                await metrics_server.start(METRICS_HOST, METRICS_PORT + self.process_index)
+            except Exception as e:
+                logging.error(f"Metrics-Endpunkt konnte nicht gestartet werden: {e}")
+
+    async def close(self):
+        await metrics_server.stop()
+        await super().close()
+
+    async def on_ready(self):
+        """
+        Event-Handler für Bot-Start.
+        """
+        logging.info(f'Bot verbunden als {self.user.name} ({self.user.id}), Shards {self.shard_ids or "alle"} von {self.shard_count}')
+        logging.info(f'Discord.py Version: {discord.__version__}')
+        logging.info(f"Gateway bereit nach {time.perf_counter() - started_at:.2f}s seit Prozessstart")
+
+        await self.change_presence(status=discord.Status.online)
+        logging.info(f"Bot Application ID: {self.application_id}")
+
+        # Commands nur einmal synchronisieren, nicht von jedem Worker-Prozess
+        if self.shard_ids and 0 not in self.shard_ids:
             return
 
-        # Raid Helper Event erstellen
-        response = await create_event(
-            channel=new_channel,
-            user_id=user_id,
-            date=date,
-            time=time,
-            title=title,
-            desc=desc,
-            template_id=RAID_HELPER_TEMPLATE_ID,
-            secrets_path=secrets_path
-        )
-
-        # Erfolgsmeldung (öffentlich, damit alle den neuen Channel sehen)
-        if response and response.status == 200:
-            await interaction.followup.send(
-                f"✅ **Gruppen-Event erstellt!**\n"
-                f"📅 **Datum:** {event_datetime.strftime('%d.%m.%Y um %H:%M Uhr')}\n"
-                f"📍 **Channel:** {new_channel.mention}\n"
-                f"🗑️ **Löschung geplant:** {DELETE_DELAY_HOURS}h nach Event-Ende",
-                ephemeral=True
-            )
-            logging.info(f"Event erfolgreich erstellt: {title} am {event_datetime}")
-
-            deletion_time = event_datetime + timedelta(hours=DELETE_DELAY_HOURS)
-            await delete_channel_after_event(
-                base_channel=channel,
-                new_channel=new_channel,
-                event_time=event_datetime,
-                delete_time=deletion_time
-                )
-
+        if guild_id:
+            guild = await self.fetch_guild(guild_id)
+            synced = await self.tree.sync(guild=guild)
+            logging.info(f"Slash commands synchronisiert für Guild: {guild.name} ({guild.id}) - {len(synced)} Commands")
         else:
-            await interaction.response.send_message(
-                f"⚠️ **Channel erstellt, aber Raid-Helper Event fehlgeschlagen!**\n"
-                f"📍 **Channel:** {new_channel.mention}\n"
-                f"Bitte erstelle das Event manuell oder überprüfe die API-Konfiguration.",
-                ephemeral=True
-            )
-            logging.error(f"Raid Helper Event konnte nicht erstellt werden für: {title}")
-
-    except Exception as e:
-        logging.error(f"Unerwarteter Fehler bei Event-Erstellung: {e}", exc_info=True)
-        try:
-            if not interaction.response.is_done():
-                await interaction.response.send_message(
-                    "❌ Es ist ein Fehler aufgetreten beim Ausführen des Befehls."
-                )
-            else:
-                await interaction.followup.send(
-                    "❌ Es ist ein Fehler aufgetreten beim Ausführen des Befehls."
-                )
-        except:
-            logging.error("Konnte Fehlermeldung nicht senden")
-
-
-@tasks.loop(hours=1)
-async def check_scheduled_deletions():
-    """Prüft alle 5 Minuten auf fällige Channel-Löschungen."""
-    deletions = get_pending_deletions()
-    now = datetime.now()
-    logging.info(f'Prüfen von {len(deletions)} Pending Deletions')
-
-    for deletion in deletions:
-        try:
-            channel = bot.get_channel(deletion.new_channel_id)
+            # Alle guild-spezifischen Commands löschen
+            synced = await self.tree.sync()
+            logging.info(f"Slash commands global synchronisiert - {len(synced)} Commands")
 
-            if not channel:
-                logging.warning(f"Channel {deletion.new_channel_id} existiert nicht mehr")
-                remove_deletion(deletion.new_channel_id)
-                continue
 
-            if deletion.delete_time <= now:
-                await channel.delete(reason="Event-Channel nach Zeitablauf gelöscht")
-                remove_deletion(deletion.new_channel_id)
-                logging.info(f"Channel {channel.name} erfolgreich gelöscht")
-            else:
-                logging.info(f"Channel {deletion.event_title} noch nicht löschen.")
+def create_bot(shard_ids: list[int] | None = None, process_index: int = 0) -> GroupHelperBot:
+    # Minimaler Cache: keine Nachrichten, Member nur soweit für Voice nötig, kein Chunking
+    return GroupHelperBot(
+        command_prefix='!',
+        intents=intents,
+        shard_count=shard_count,
+        shard_ids=shard_ids,
+        process_index=process_index,
+        max_messages=None,
+        member_cache_flags=discord.MemberCacheFlags.from_intents(intents),
+        chunk_guilds_at_startup=False
+    )
 
-        except Exception as e:
-            logging.error(f"Fehler beim Löschen von Channel {deletion.new_channel_id}: {e}")
 
-    logging.info("Prüfung der ausstehenden Löschungen beendet.")
+def run_shard_process(process_index: int, shard_ids: list[int]):
+    """Worker-Prozess: betreibt nur die angegebenen Shards."""
+    global started_at
+    started_at = time.perf_counter()
+    logging.info(f"Starte Worker-Prozess {process_index} für Shards {shard_ids}...")
+    create_bot(shard_ids, process_index).run(token)
 
 
-@bot.event
-async def on_ready():
-    """
-    Event-Handler für Bot-Start.
-    """
-    logging.info(f'Bot verbunden als {bot.user.name} ({bot.user.id})')
-    logging.info(f'Discord.py Version: {discord.__version__}')
-
-    init_db()
-    check_scheduled_deletions.start()
+token = get_discord_token(os.getenv("DISCORD_APP_NAME", "discord-group-helper-app-token"), secrets_path)
 
-    await bot.change_presence(status=discord.Status.online)
-    logging.info(f"Bot Application ID: {bot.application_id}")
-
-    if guild_id:
-        guild = await bot.fetch_guild(guild_id)
-        synced = await bot.tree.sync(guild=guild)
-        logging.info(f"Slash commands synchronisiert für Guild: {guild.name} ({guild.id}) - {len(synced)} Commands")
-    else:
-        # Alle guild-spezifischen Commands löschen
-        synced = await bot.tree.sync()
-        logging.info(f"Slash commands global synchronisiert - {len(synced)} Commands")
 
 if __name__ == "__main__":
     logging.info("Starte Group Helper Bot...")
-    bot.run(token)
+    if shard_processes > 1:
+        if not shard_count:
+            raise SystemExit("SHARD_PROCESSES > 1 erfordert SHARD_COUNT")
+        init_database()
+        # Shards reihum auf die Prozesse verteilen. "spawn" statt fork: Jeder Worker führt das Modul neu aus
+        # und startet so seinen eigenen Log-Listener-Thread (ein Fork erbt nur die Queue, nicht den Thread)
+        spawn = multiprocessing.get_context("spawn")
+        processes = [
+            spawn.Process(target=run_shard_process, args=(i, shard_ids), name=f"group-helper-shards-{i}")
+            for i, shard_ids in enumerate(split_shards(shard_count, shard_processes))
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+    else:
+        create_bot().run(token)
@@ -0,0 +1,483 @@
+"""
+Group-Event Feature (Extension) für den Group Helper Bot
+
+Enthält die Commands /group-event, /group-event-import und die Event-Serien, die geplanten Channel-Löschungen und die
+Event-Outbox. Wird per bot.load_extension("group_events") geladen.
+"""
+import os
+import discord
+from discord import Interaction, app_commands
+import logging
+import asyncio
+from discord.ext import commands, tasks
+
+from utils.secrets import get_raid_helper_api_key
+from utils.timing import StageTimer
+from utils.metrics import CHANNEL_DELETIONS, COMMAND_LATENCY
+from datetime import datetime, timedelta, timezone
+from config import (UTC_PLUS_ONE, DELETE_DELAY_HOURS, DELETION_RETRY_MINUTES, RAID_HELPER_TEMPLATE_ID, DEBUG, DEBUG_GUILD_ID,
+                    IMPORT_MAX_BYTES, IMPORT_MAX_ERRORS_SHOWN, SERIES_CHECK_MINUTES)
+from validators import validate_event, validate_many
+from services.raid_helper import raid_helper_client
+from services.outbox import event_outbox
+from services.channel_manager import (MissingPermissionsError, check_clone_permissions, clone_channel_for_event,
+                                      delete_channel_after_event, rollback_event_channel)
+from services.scheduler import backfill_deletion_guilds, deletion_scheduler, remove_deletions, schedule_deletions
+from services.event_import import ImportFileError, ImportProgress, clone_event_channels, parse_event_file
+from services.series import create_series, materialise_due_series, stop_series
+from services.database import ShardFilter, run_db
+
+secrets_path = os.getenv("SECRETS_PATH", "secrets.json")
+
+
+class GroupEvents(commands.Cog):
+    """Gruppen-Events: Command, Löschungs-Scheduler und Outbox samt Lebenszyklus."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self._series_task: asyncio.Task | None = None
+
+    async def cog_load(self):
+        raid_helper_client.open()
+
+    async def cog_unload(self):
+        self.check_scheduled_deletions.cancel()
+        self.materialise_series.cancel()
+        await event_outbox.stop()
+        await raid_helper_client.close()
+
+    def shard_filter(self) -> ShardFilter | None:
+        """Shards dieses Prozesses, falls er nicht alle Shards des Bots betreibt."""
+        shard_count = getattr(self.bot, "shard_count", None) or 1
+        shard_ids = getattr(self.bot, "shard_ids", None)
+        if shard_count == 1 or not shard_ids or len(shard_ids) == shard_count:
+            return None
+        return shard_count, list(shard_ids)
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        shards = self.shard_filter()
+        if not self.check_scheduled_deletions.is_running():
+            await backfill_deletion_guilds(self.bot.get_channel)
+            await deletion_scheduler.rebuild(shards)
+            self.check_scheduled_deletions.start()
+        if not event_outbox.is_running:
+            await event_outbox.start(self.bot, secrets_path, shards)
+        if not self.materialise_series.is_running():
+            self.materialise_series.start()
+
+    @app_commands.command(name="group-event")
+    @app_commands.describe(
+        date="Datum (Formate: YYYY-MM-DD, DD.MM.YYYY, DD/MM/YYYY)",
+        time="Uhrzeit (Formate: HH:MM, HH.MM, HHMM)",
+        title="Titel des Gruppen-Events",
+        desc="Beschreibung des Events")
+    async def group_event(self, interaction: Interaction, date: str, time: str, title: str, desc: str):
+        """
+        Erstellt ein neues Gruppen-Event mit eigenem Channel und Raid Helper Integration.
+        """
+        timer = StageTimer("group-event")
+        outcome = "error"
+        try:
+            # Sofort bestätigen, um Timeout zu vermeiden
+            with timer.stage("defer"):
+                await interaction.response.defer(ephemeral=True)
+
+            channel = interaction.channel
+            user_id = str(interaction.user.id)
+
+            # Validierung der Eingaben
+            with timer.stage("validate"):
+                event_datetime, validation_errors = validate_event(date, time, title, desc)
+
+            # Falls Fehler vorhanden (nur für User sichtbar)
+            if validation_errors:
+                error_messages = [f"**{field}:** {error}" for field, error in validation_errors.items()]
+                await interaction.followup.send(
+                    "❌ **Fehlerhafte Eingaben:**\n" + "\n".join(error_messages)
+                )
+                logging.warning(f"Validierungsfehler von User {interaction.user.name}: {', '.join(error_messages)}")
+                outcome = "invalid"
+                return
+
+            # Prüfen ob Event in der Zukunft liegt
+            if datetime.now() >= event_datetime:
+                await interaction.followup.send(
+                    "❌ Das Gruppen-Event liegt in der Vergangenheit!"
+                )
+                logging.warning(f"Event-Erstellung abgelehnt: Event liegt in Vergangenheit ({event_datetime})")
+                outcome = "past"
+                return
+
+            # Vorbedingungen vor dem Klonen prüfen, damit kein Channel verwaist
+            with timer.stage("preflight"):
+                try:
+                    check_clone_permissions(channel)
+                except MissingPermissionsError:
+                    logging.error("Bot hat keine Berechtigung, den Channel zu klonen")
+                    await interaction.followup.send(
+                        "❌ Ich habe keine Berechtigung, Channels zu erstellen!"
+                    )
+                    outcome = "forbidden"
+                    return
+
+                if not get_raid_helper_api_key(secret_id=f"{channel.guild.id}", json_path=secrets_path):
+                    await interaction.followup.send(
+                        "❌ Für diesen Server ist kein Raid-Helper API Key hinterlegt!"
+                    )
+                    outcome = "no_api_key"
+                    return
+
+            # Channel klonen
+            with timer.stage("clone"):
+                try:
+                    new_channel = await clone_channel_for_event(channel, title, event_datetime)
+                except (MissingPermissionsError, discord.Forbidden):
+                    logging.error("Bot hat keine Berechtigung, den Channel zu klonen")
+                    await interaction.followup.send(
+                        "❌ Ich habe keine Berechtigung, Channels zu erstellen!"
+                    )
+                    outcome = "forbidden"
+                    return
+
+            # Erst die Löschung planen, dann das Raid Helper Event in die Outbox legen. Der Job entsteht
+            # zuletzt: schlägt eine Stufe fehl, gibt es noch keinen Job, der in einen Channel postet,
+            # den der Rollback gerade entfernt
+            deletion_time = event_datetime + timedelta(hours=DELETE_DELAY_HOURS)
+            try:
+                with timer.stage("persist"):
+                    await delete_channel_after_event(
+                        base_channel=channel,
+                        new_channel=new_channel,
+                        event_time=event_datetime,
+                        delete_time=deletion_time
+                    )
+                    await event_outbox.enqueue(
+                        new_channel_id=new_channel.id,
+                        guild_id=new_channel.guild.id,
+                        user_id=user_id,
+                        date=date,
+                        time=time,
+                        title=title,
+                        desc=desc,
+                        template_id=RAID_HELPER_TEMPLATE_ID
+                    )
+            except Exception:
+                with timer.stage("rollback"):
+                    await rollback_event_channel(new_channel)
+                raise
+
+            # Sofortige Rückmeldung, das Raid Helper Event folgt im neuen Channel
+            with timer.stage("reply"):
+                await interaction.followup.send(
+                    f"✅ **Gruppen-Event angelegt!**\n"
+                    f"📅 **Datum:** {event_datetime.strftime('%d.%m.%Y um %H:%M Uhr')}\n"
+                    f"📍 **Channel:** {new_channel.mention}\n"
+                    f"📝 **Raid-Helper Event:** wird im Channel erstellt\n"
+                    f"🗑️ **Löschung geplant:** {DELETE_DELAY_HOURS}h nach Event-Ende",
+                    ephemeral=True
+                )
+            outcome = "ok"
+            logging.info(f"Event angelegt: {title} am {event_datetime}")
+
+        except Exception as e:
+            logging.error(f"Unerwarteter Fehler bei Event-Erstellung: {e}", exc_info=True)
+            await self._send_error(interaction)
+        finally:
+            timer.log(outcome=outcome)
+            COMMAND_LATENCY.observe(timer.total, command="group-event", outcome=outcome)
+
+    @app_commands.command(name="group-event-import")
+    @app_commands.describe(
+        file="CSV- oder JSON-Datei mit den Spalten date, time, title, desc (ein Event pro Zeile)")
+    async def group_event_import(self, interaction: Interaction, file: discord.Attachment):
+        """
+        Legt viele Gruppen-Events aus einer Datei auf einmal an.
+        """
+        timer = StageTimer("group-event-import")
+        outcome = "error"
+        try:
+            await interaction.response.defer(ephemeral=True)
+
+            channel = interaction.channel
+            user_id = str(interaction.user.id)
+
+            # Datei lesen und alle Events vorab validieren
+            with timer.stage("parse"):
+                if file.size > IMPORT_MAX_BYTES:
+                    await interaction.followup.send(f"❌ Die Datei ist zu groß (max. {IMPORT_MAX_BYTES // 1024} KB).")
+                    outcome = "invalid"
+                    return
+                try:
+                    specs = parse_event_file(file.filename, await file.read())
+                except ImportFileError as e:
+                    await interaction.followup.send(f"❌ {e}")
+                    outcome = "invalid"
+                    return
+
+            with timer.stage("validate"):
+                validated = validate_many(specs)
+
+            now = datetime.now()
+            error_messages = []
+            for row, (event_datetime, validation_errors) in enumerate(validated, start=1):
+                error_messages.extend(f"**Event {row}, {field}:** {error}" for field, error in validation_errors.items())
+                if not validation_errors and event_datetime <= now:
+                    error_messages.append(f"**Event {row}:** liegt in der Vergangenheit")
+
+            if error_messages:
+                shown = "\n".join(error_messages[:IMPORT_MAX_ERRORS_SHOWN])
+                if len(error_messages) > IMPORT_MAX_ERRORS_SHOWN:
+                    shown += f"\n… und {len(error_messages) - IMPORT_MAX_ERRORS_SHOWN} weitere Fehler"
+                await interaction.followup.send(f"❌ **Import abgebrochen, fehlerhafte Events:**\n{shown}"[:2000])
+                logging.warning(f"Event-Import von User {interaction.user.name} abgelehnt: {len(error_messages)} Fehler")
+                outcome = "invalid"
+                return
+
+            # Vorbedingungen einmal für den ganzen Import prüfen
+            with timer.stage("preflight"):
+                try:
+                    check_clone_permissions(channel)
+                except MissingPermissionsError:
+                    logging.error("Bot hat keine Berechtigung, den Channel zu klonen")
+                    await interaction.followup.send(
+                        "❌ Ich habe keine Berechtigung, Channels zu erstellen!"
+                    )
+                    outcome = "forbidden"
+                    return
+
+                if not get_raid_helper_api_key(secret_id=f"{channel.guild.id}", json_path=secrets_path):
+                    await interaction.followup.send(
+                        "❌ Für diesen Server ist kein Raid-Helper API Key hinterlegt!"
+                    )
+                    outcome = "no_api_key"
+                    return
+
+            # Channels mit begrenzter Parallelität klonen, Fortschritt im Channel anzeigen
+            events = [(spec, event_datetime) for spec, (event_datetime, _) in zip(specs, validated)]
+            progress = ImportProgress(
+                await channel.send(f"⏳ **Event-Import:** 0/{len(events)} Channels angelegt"), len(events))
+            with timer.stage("clone"):
+                channels = await clone_event_channels(
+                    channel, [(spec["title"], event_datetime) for spec, event_datetime in events], progress.update)
+            created = [(spec, event_datetime, new_channel)
+                       for (spec, event_datetime), new_channel in zip(events, channels) if new_channel]
+
+            # Alle Löschungen in einer Transaktion planen, danach alle Raid Helper Events in die Outbox legen
+            # (Jobs zuletzt, damit der Rollback keine bereits eingereihten Jobs zurücklässt)
+            try:
+                with timer.stage("persist"):
+                    await schedule_deletions([
+                        (new_channel.id, channel.id, event_datetime,
+                         event_datetime + timedelta(hours=DELETE_DELAY_HOURS), new_channel.name, new_channel.guild.id)
+                        for _, event_datetime, new_channel in created
+                    ])
+                    await event_outbox.enqueue_many([
+                        {
+                            "new_channel_id": new_channel.id,
+                            "guild_id": new_channel.guild.id,
+                            "user_id": user_id,
+                            "date": spec["date"],
+                            "time": spec["time"],
+                            "title": spec["title"],
+                            "desc": spec["desc"],
+                            "template_id": RAID_HELPER_TEMPLATE_ID
+                        }
+                        for spec, _, new_channel in created
+                    ])
+            except Exception:
+                with timer.stage("rollback"):
+                    await asyncio.gather(*(rollback_event_channel(new_channel) for _, _, new_channel in created))
+                await progress.finish("❌ **Event-Import fehlgeschlagen**, angelegte Channels wurden wieder entfernt.")
+                raise
+
+            failed = len(events) - len(created)
+            summary = f"{len(created)}/{len(events)} Channels angelegt"
+            if failed:
+                summary += f", {failed} fehlgeschlagen"
+            await progress.finish(f"✅ **Event-Import:** {summary}. Die Raid-Helper Events werden in den Channels erstellt.")
+            await interaction.followup.send(
+                f"✅ **Event-Import abgeschlossen:** {summary}\n"
+                f"🗑️ **Löschung geplant:** jeweils {DELETE_DELAY_HOURS}h nach Event-Ende",
+                ephemeral=True
+            )
+            outcome = "ok" if not failed else "partial"
+            logging.info(f"Event-Import: {summary}")
+
+        except Exception as e:
+            logging.error(f"Unerwarteter Fehler beim Event-Import: {e}", exc_info=True)
+            await self._send_error(interaction)
+        finally:
+            timer.log(outcome=outcome)
+            COMMAND_LATENCY.observe(timer.total, command="group-event-import", outcome=outcome)
+
+    @app_commands.command(name="group-event-series")
+    @app_commands.describe(
+        date="Datum des ersten Termins (Formate: YYYY-MM-DD, DD.MM.YYYY, DD/MM/YYYY)",
+        time="Uhrzeit (Formate: HH:MM, HH.MM, HHMM)",
+        title="Titel der Gruppen-Events",
+        desc="Beschreibung der Events",
+        interval="Wiederholung",
+        count="Anzahl Termine (leer = bis zum Beenden mit /group-event-series-stop)")
+    @app_commands.choices(interval=[
+        app_commands.Choice(name="wöchentlich", value=7),
+        app_commands.Choice(name="alle 2 Wochen", value=14),
+    ])
+    async def group_event_series(self, interaction: Interaction, date: str, time: str, title: str, desc: str,
+                                 interval: app_commands.Choice[int], count: app_commands.Range[int, 1] | None = None):
+        """
+        Legt ein wiederkehrendes Gruppen-Event an. Channel und Raid Helper Event eines
+        Termins werden erst kurz vorher erstellt.
+        """
+        try:
+            await interaction.response.defer(ephemeral=True)
+
+            channel = interaction.channel
+            first_occurrence, validation_errors = validate_event(date, time, title, desc)
+            if validation_errors:
+                error_messages = [f"**{field}:** {error}" for field, error in validation_errors.items()]
+                await interaction.followup.send(
+                    "❌ **Fehlerhafte Eingaben:**\n" + "\n".join(error_messages)
+                )
+                return
+
+            if datetime.now() >= first_occurrence:
+                await interaction.followup.send(
+                    "❌ Der erste Termin liegt in der Vergangenheit!"
+                )
+                return
+
+            try:
+                check_clone_permissions(channel)
+            except MissingPermissionsError:
+                await interaction.followup.send(
+                    "❌ Ich habe keine Berechtigung, Channels zu erstellen!"
+                )
+                return
+
+            if not get_raid_helper_api_key(secret_id=f"{channel.guild.id}", json_path=secrets_path):
+                await interaction.followup.send(
+                    "❌ Für diesen Server ist kein Raid-Helper API Key hinterlegt!"
+                )
+                return
+
+            until = first_occurrence + timedelta(days=interval.value * (count - 1)) if count else None
+            series_id = await create_series(
+                guild_id=channel.guild.id,
+                base_channel_id=channel.id,
+                user_id=str(interaction.user.id),
+                title=title,
+                desc=desc,
+                template_id=RAID_HELPER_TEMPLATE_ID,
+                first_occurrence=first_occurrence,
+                interval_days=interval.value,
+                until=until
+            )
+            # Falls der erste Termin schon bald ist, nicht auf den nächsten Lauf warten
+            self._series_task = asyncio.create_task(self._materialise_due_series())
+
+            await interaction.followup.send(
+                f"✅ **Event-Serie #{series_id} angelegt!**\n"
+                f"📅 **Erster Termin:** {first_occurrence.strftime('%d.%m.%Y um %H:%M Uhr')}, {interval.name}\n"
+                f"🔁 **Termine:** {count if count else 'bis zum Beenden'}\n"
+                f"📝 Channel und Raid-Helper Event werden jeweils kurz vor dem Termin erstellt",
+                ephemeral=True
+            )
+
+        except Exception as e:
+            logging.error(f"Unerwarteter Fehler beim Anlegen der Event-Serie: {e}", exc_info=True)
+            await self._send_error(interaction)
+
+    @app_commands.command(name="group-event-series-stop")
+    @app_commands.describe(series_id="Nummer der Event-Serie")
+    async def group_event_series_stop(self, interaction: Interaction, series_id: int):
+        """
+        Beendet eine Event-Serie; bereits angelegte Termine bleiben bestehen.
+        """
+        try:
+            await interaction.response.defer(ephemeral=True)
+            if await stop_series(series_id, interaction.guild.id):
+                await interaction.followup.send(f"✅ Event-Serie #{series_id} beendet.")
+            else:
+                await interaction.followup.send(f"❌ Keine laufende Event-Serie #{series_id} auf diesem Server.")
+        except Exception as e:
+            logging.error(f"Unerwarteter Fehler beim Beenden der Event-Serie: {e}", exc_info=True)
+            await self._send_error(interaction)
+
+    @staticmethod
+    async def _send_error(interaction: Interaction):
+        """Meldet dem User einen unerwarteten Fehler."""
+        try:
+            if not interaction.response.is_done():
+                await interaction.response.send_message(
+                    "❌ Es ist ein Fehler aufgetreten beim Ausführen des Befehls."
+                )
+            else:
+                await interaction.followup.send(
+                    "❌ Es ist ein Fehler aufgetreten beim Ausführen des Befehls."
+                )
+        except:
+            logging.error("Konnte Fehlermeldung nicht senden")
+
+    @tasks.loop()
+    async def check_scheduled_deletions(self):
+        """Wartet bis zur nächsten fälligen Löschung und löscht die fälligen Channels."""
+        due_channel_ids = await deletion_scheduler.wait_for_due()
+        if not due_channel_ids:
+            return
+
+        logging.info('%d fällige Löschungen (%d weitere ausstehend)', len(due_channel_ids), len(deletion_scheduler))
+
+        completed = []
+        failed = []
+        for channel_id in due_channel_ids:
+            try:
+                channel = self.bot.get_channel(channel_id)
+
+                if not channel:
+                    logging.warning("Channel %s existiert nicht mehr", channel_id)
+                    CHANNEL_DELETIONS.inc(outcome="missing")
+                    completed.append(channel_id)
+                    continue
+
+                await channel.delete(reason="Event-Channel nach Zeitablauf gelöscht")
+                completed.append(channel_id)
+                CHANNEL_DELETIONS.inc(outcome="deleted")
+                logging.info("Channel %s erfolgreich gelöscht", channel.name)
+
+            except Exception as e:
+                logging.error("Fehler beim Löschen von Channel %s: %s", channel_id, e)
+                CHANNEL_DELETIONS.inc(outcome="failed")
+                failed.append(channel_id)
+
+        # Ergebnisse gesammelt in einer Transaktion bzw. einem Retry-Schritt übernehmen
+        try:
+            await remove_deletions(completed)
+        except Exception:
+            failed.extend(completed)
+
+        retry_at = datetime.now() + timedelta(minutes=DELETION_RETRY_MINUTES)
+        for channel_id in failed:
+            deletion_scheduler.push(channel_id, retry_at)
+
+        logging.info("Fällige Löschungen abgearbeitet.")
+
+    @tasks.loop(minutes=SERIES_CHECK_MINUTES)
+    async def materialise_series(self):
+        """Legt die anstehenden Termine aller Event-Serien an."""
+        await self._materialise_due_series()
+
+    async def _materialise_due_series(self):
+        try:
+            created = await materialise_due_series(self.bot, datetime.now(), self.shard_filter())
+            if created:
+                logging.info(f"{created} Serien-Termine angelegt")
+        except Exception as e:
+            logging.error(f"Fehler beim Anlegen der Serien-Termine: {e}", exc_info=True)
+
+
+async def setup(bot: commands.Bot):
+    if DEBUG:
+        await bot.add_cog(GroupEvents(bot), guild=discord.Object(id=DEBUG_GUILD_ID))
+    else:
+        await bot.add_cog(GroupEvents(bot))
@@ -8,7 +8,11 @@ from typing import Tuple
 import discord
 from discord import TextChannel
 from datetime import datetime, timedelta, timezone
-from services.scheduler import schedule_deletion
+from services.scheduler import schedule_deletion, remove_deletion
+
+
+class MissingPermissionsError(Exception):
+    """Dem Bot fehlen Berechtigungen, um den Channel zu klonen."""
 
 
 async def delete_channel_after_event(base_channel: TextChannel,
@@ -18,49 +22,75 @@ async def delete_channel_after_event(base_channel: TextChannel,
     """
     Löscht den Channel nach dem Event (nach delete_delay_hours).
     """
-    schedule_deletion(
+    await schedule_deletion(
         channel_id=new_channel.id,
         base_channel_id=base_channel.id,
         event_time=event_time,
         delete_at=delete_time,
-        event_title=new_channel.name
+        event_title=new_channel.name,
+        guild_id=new_channel.guild.id
     )
 
-async def clone_channel_for_event(
-    source_channel: TextChannel,
-    title: str,
-    event_date: datetime
-) -> TextChannel:
+async def rollback_event_channel(new_channel: TextChannel):
     """
-    Klont einen Channel für ein Event.
+    Macht einen geklonten Event-Channel rückgängig, wenn eine spätere Stufe
+    von /group-event fehlschlägt (Channel und geplante Löschung entfernen).
+    """
+    try:
+        await remove_deletion(new_channel.id)
+    except Exception as e:
+        logging.error(f"Rollback: Lösch-Eintrag für Channel {new_channel.id} nicht entfernt: {e}")
+    try:
+        await new_channel.delete(reason="Group-Event fehlgeschlagen")
+        logging.info(f"Rollback: Channel {new_channel.name} gelöscht")
+    except Exception as e:
+        logging.error(f"Rollback: Channel {new_channel.name} konnte nicht gelöscht werden: {e}")
 
-    Args:
-        source_channel: Quell-Channel zum Klonen
-        title: Event-Titel für den Channel-Namen
-        event_date: Datum des Events
 
-    Returns:
-        Der geklonte TextChannel
+def check_clone_permissions(source_channel: TextChannel):
+    """
+    Prüft, ob der Bot den Channel klonen darf.
 
     Raises:
-        discord.Forbidden: Wenn keine Berechtigung zum Klonen
+        MissingPermissionsError: Wenn keine Berechtigung zum Klonen
     """
     # Server-weite Bot-Berechtigungen prüfen
     bot_permissions = source_channel.guild.me.guild_permissions
     if not bot_permissions.manage_channels:
         logging.error("Bot hat keine 'Manage Channels' Berechtigung")
-        raise discord.Forbidden("Bot hat keine 'Manage Channels' Berechtigung")
+        raise MissingPermissionsError("Bot hat keine 'Manage Channels' Berechtigung")
 
     # Channel-spezifische Bot-Berechtigungen prüfen
     channel_permissions = source_channel.permissions_for(source_channel.guild.me)
     if not channel_permissions.view_channel:
         logging.error(f"Bot kann Channel '{source_channel.name}' nicht sehen")
-        raise discord.Forbidden(f"Bot kann Channel '{source_channel.name}' nicht sehen")
+        raise MissingPermissionsError(f"Bot kann Channel '{source_channel.name}' nicht sehen")
 
     if not channel_permissions.manage_channels:
         logging.error(f"Bot kann Channels in Kategorie von '{source_channel.name}' nicht verwalten")
-        raise discord.Forbidden("Bot hat keine Channel-Verwaltungs-Berechtigung für diesen Channel")
+        raise MissingPermissionsError("Bot hat keine Channel-Verwaltungs-Berechtigung für diesen Channel")
+
+async def clone_channel_for_event(
+    source_channel: TextChannel,
+    title: str,
+    event_date: datetime
+) -> TextChannel:
+    """
+    Klont einen Channel für ein Event.
 
+    Args:
+        source_channel: Quell-Channel zum Klonen
+        title: Event-Titel für den Channel-Namen
+        event_date: Datum des Events
+
+    Returns:
+        Der geklonte TextChannel
+
+    Raises:
+        MissingPermissionsError: Wenn laut Berechtigungen kein Klonen möglich ist
+        discord.Forbidden: Wenn Discord das Klonen ablehnt
+    """
+    check_clone_permissions(source_channel)
 
     date_str = event_date.strftime('%d-%m-%Y')
     channel_name = f"{title}-{date_str}"
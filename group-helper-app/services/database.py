@@ -1,24 +1,95 @@
-from sqlalchemy import create_engine
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import QueuePool
 from pathlib import Path
 
+from config import DB_PROFILE
+
+# Speicher-Profile für die SQLite-Datei
+DB_PROFILES = {
+    # Ursprüngliche Einstellungen (Server-DB-Defaults, keine PRAGMAs)
+    "legacy": {
+        "pragmas": {},
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_pre_ping": True,
+        "pool_recycle": 3600,
+    },
+    # Lokale Datei: WAL erlaubt Lesen parallel zum einzigen Schreiber (DB-Thread),
+    # Pre-Ping und Recycling sind ohne Netzwerkverbindung überflüssig.
+    "tuned": {
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "busy_timeout": 5000,
+            "mmap_size": 64 * 1024 * 1024,
+            "temp_store": "MEMORY",
+        },
+        "pool_size": 1,
+        "max_overflow": 2,
+        "pool_pre_ping": False,
+        "pool_recycle": -1,
+    },
+}
+
 DB_PATH = Path("data/scheduled_deletions.db")
 DB_PATH.parent.mkdir(exist_ok=True)
 DATABASE_URL = f"sqlite:///./{DB_PATH}"
-engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False},
-    poolclass=QueuePool,
-    pool_size=5,
-    max_overflow=10,
-    pool_pre_ping=True,  # Prüft Connections vor Verwendung
-    pool_recycle=3600  # Recycelt Connections nach 1h
-)
+db_profile = DB_PROFILES[DB_PROFILE]
+
+
+def create_db_engine(url: str, profile: dict):
+    """Engine mit den Pool-Einstellungen und PRAGMAs eines Profils aus DB_PROFILES."""
+    db_engine = create_engine(
+        url, connect_args={"check_same_thread": False},
+        poolclass=QueuePool,
+        pool_size=profile["pool_size"],
+        max_overflow=profile["max_overflow"],
+        pool_pre_ping=profile["pool_pre_ping"],
+        pool_recycle=profile["pool_recycle"]
+    )
+
+    @event.listens_for(db_engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        """Setzt die PRAGMAs des Profils auf jeder neuen SQLite-Verbindung."""
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in profile["pragmas"].items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    return db_engine
+
+
+engine = create_db_engine(DATABASE_URL, db_profile)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+# Ein einzelner DB-Thread: serialisiert alle Schreibzugriffe auf SQLite und
+# hält blockierende Commits vom Discord Event-Loop fern.
+_db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db")
+
+async def run_db(func, *args, **kwargs):
+    """Führt eine synchrone DB-Funktion im DB-Thread aus und wartet asynchron auf das Ergebnis."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_db_executor, functools.partial(func, *args, **kwargs))
+
+# (shard_count, shard_ids) eines Prozesses im Multi-Prozess-Betrieb; None = alle Guilds
+ShardFilter = Tuple[int, List[int]]
+
+def guild_shard_filter(guild_id_column, shards: ShardFilter):
+    """SQL-Bedingung: die Guild gehört zu einem der Shards (Discord: (guild_id >> 22) % shard_count)."""
+    shard_count, shard_ids = shards
+    return guild_id_column.op('>>')(22).op('%')(shard_count).in_(shard_ids)
+
 def get_db():
     db = SessionLocal()
     try:
@@ -28,4 +99,24 @@ def get_db():
 
 def init_db():
     """Erstellt alle Tabellen in der Datenbank"""
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    Base.metadata.create_all(bind=engine)
+    migrate_db()
+
+def migrate_db():
+    """
+    Bringt bestehende Datenbanken auf den aktuellen Schema-Stand.
+
+    create_all() legt Spalten und Indizes nur für neu erstellte Tabellen an; für
+    ältere Dateien (z.B. data/scheduled_deletions.db) werden fehlende (nullable)
+    Spalten und Indizes hier nachgezogen.
+    """
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        with engine.begin() as connection:
+            for column in table.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
\ No newline at end of file
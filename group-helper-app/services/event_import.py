@@ -0,0 +1,140 @@
+"""
+Import vieler Gruppen-Events aus einer CSV- oder JSON-Datei (/group-event-import)
+"""
+import asyncio
+import csv
+import io
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, List, Tuple
+
+import discord
+from discord import TextChannel
+
+from config import IMPORT_CONCURRENCY, IMPORT_MAX_EVENTS, IMPORT_PROGRESS_SECONDS
+from services.channel_manager import clone_channel_for_event
+
+# Spalten bzw. Schlüssel eines Events in der Import-Datei
+IMPORT_FIELDS = ("date", "time", "title", "desc")
+
+
+class ImportFileError(ValueError):
+    """Die Import-Datei kann nicht gelesen werden."""
+
+
+def parse_event_file(filename: str, data: bytes) -> List[dict]:
+    """
+    Liest Events aus einer CSV- (Kopfzeile date,time,title,desc; Trenner , oder ;)
+    oder JSON-Datei (Liste von Objekten mit diesen Schlüsseln).
+
+    Raises:
+        ImportFileError: Wenn die Datei nicht gelesen werden kann oder zu viele Events enthält
+    """
+    try:
+        text = data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise ImportFileError("Die Datei ist nicht UTF-8 kodiert.")
+
+    name = filename.lower()
+    if name.endswith(".json"):
+        rows = _parse_json(text)
+    elif name.endswith(".csv"):
+        rows = _parse_csv(text)
+    else:
+        raise ImportFileError("Nur .csv- und .json-Dateien werden unterstützt.")
+
+    if not rows:
+        raise ImportFileError("Die Datei enthält keine Events.")
+    if len(rows) > IMPORT_MAX_EVENTS:
+        raise ImportFileError(f"Maximal {IMPORT_MAX_EVENTS} Events pro Import (Datei enthält {len(rows)}).")
+
+    return [
+        {field: str(row[field]).strip() if row.get(field) is not None else None for field in IMPORT_FIELDS}
+        for row in rows
+    ]
+
+
+def _parse_json(text: str) -> List[dict]:
+    try:
+        rows = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ImportFileError(f"Ungültiges JSON: {e.msg} (Zeile {e.lineno})")
+    if isinstance(rows, dict):
+        rows = rows.get("events")
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise ImportFileError("Das JSON muss eine Liste von Events (Objekten) sein.")
+    return rows
+
+
+def _parse_csv(text: str) -> List[dict]:
+    try:
+        dialect = csv.Sniffer().sniff(text.split("\n", 1)[0], delimiters=",;")
+    except csv.Error:
+        dialect = csv.excel
+    reader = csv.DictReader(io.StringIO(text), dialect=dialect)
+    missing = [field for field in IMPORT_FIELDS if field not in (reader.fieldnames or [])]
+    if missing:
+        raise ImportFileError(f"Fehlende Spalten: {', '.join(missing)} (erwartet: {', '.join(IMPORT_FIELDS)})")
+    return [row for row in reader if any(row.values())]
+
+
+class ImportProgress:
+    """
+    Fortschrittsanzeige als Nachricht im Channel. Bearbeitet die Nachricht höchstens
+    alle IMPORT_PROGRESS_SECONDS, um nicht in Discords Rate Limit zu laufen.
+    """
+
+    def __init__(self, message: discord.Message, total: int):
+        self.message = message
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self._last_edit = time.monotonic()
+
+    async def update(self, success: bool):
+        self.done += 1
+        if not success:
+            self.failed += 1
+        if time.monotonic() - self._last_edit < IMPORT_PROGRESS_SECONDS:
+            return
+        self._last_edit = time.monotonic()
+        await self._edit(f"⏳ **Event-Import:** {self.done}/{self.total} Channels angelegt")
+
+    async def finish(self, text: str):
+        await self._edit(text)
+
+    async def _edit(self, text: str):
+        try:
+            await self.message.edit(content=text)
+        except discord.HTTPException as e:
+            logging.warning(f"Fortschritt des Event-Imports konnte nicht aktualisiert werden: {e}")
+
+
+async def clone_event_channels(source_channel: TextChannel,
+                               events: List[Tuple[str, datetime]],
+                               on_done: Callable[[bool], Awaitable[None]]) -> List[TextChannel | None]:
+    """
+    Klont die Channels für alle Events mit begrenzter Parallelität (IMPORT_CONCURRENCY).
+
+    Discords Rate Limits behandelt discord.py selbst; die Begrenzung verhindert, dass
+    ein großer Import alle Requests gleichzeitig in dieselbe Route schickt.
+
+    Returns:
+        Pro Event (title, event_datetime) der neue Channel oder None, wenn das Klonen fehlschlug
+    """
+    semaphore = asyncio.Semaphore(IMPORT_CONCURRENCY)
+    channels: List[TextChannel | None] = [None] * len(events)
+
+    async def clone(index: int, title: str, event_datetime: datetime):
+        async with semaphore:
+            try:
+                channels[index] = await clone_channel_for_event(source_channel, title, event_datetime)
+            except Exception as e:
+                logging.error(f"Import: Channel für '{title}' konnte nicht geklont werden: {e}")
+            await on_done(channels[index] is not None)
+
+    await asyncio.gather(*(clone(index, title, event_datetime)
+                           for index, (title, event_datetime) in enumerate(events)))
+    return channels
@@ -1,13 +1,54 @@
 from sqlalchemy import Column, Integer, String, DateTime
 from services.database import Base
-from datetime import timezone
+from datetime import datetime, timezone
 
 
 class ScheduledDeletion(Base):
     __tablename__ = "scheduled_deletions"
 
     new_channel_id = Column(Integer, primary_key=True)
-    base_channel_id = Column(Integer, nullable=False)
+    base_channel_id = Column(Integer, nullable=False, index=True)
+    guild_id = Column(Integer, nullable=True, index=True)
     event_time = Column(DateTime, nullable=False)
-    delete_time = Column(DateTime, nullable=False)
+    delete_time = Column(DateTime, nullable=False, index=True)
     event_title = Column(String, nullable=True)
+
+
+class EventJob(Base):
+    """Outbox-Eintrag für ein noch zu erstellendes Raid Helper Event."""
+    __tablename__ = "event_outbox"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    new_channel_id = Column(Integer, nullable=False)
+    guild_id = Column(Integer, nullable=True, index=True)
+    user_id = Column(String, nullable=False)
+    date = Column(String, nullable=False)
+    time = Column(String, nullable=False)
+    title = Column(String, nullable=False)
+    description = Column(String, nullable=False)
+    template_id = Column(Integer, nullable=False)
+    status = Column(String, nullable=False, default="pending", index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(String, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.now)
+
+
+class EventSeries(Base):
+    """
+    Wiederkehrendes Gruppen-Event (Regel + Vorlage). Channels und Raid Helper Events
+    werden erst kurz vor dem jeweiligen Termin angelegt (siehe services/series.py).
+    """
+    __tablename__ = "event_series"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    guild_id = Column(Integer, nullable=False, index=True)
+    base_channel_id = Column(Integer, nullable=False)
+    user_id = Column(String, nullable=False)
+    title = Column(String, nullable=False)
+    description = Column(String, nullable=False)
+    template_id = Column(Integer, nullable=False)
+    interval_days = Column(Integer, nullable=False)
+    # Nächster noch nicht angelegter Termin; None = Serie beendet
+    next_occurrence = Column(DateTime, nullable=True, index=True)
+    until = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.now)
@@ -0,0 +1,386 @@
+"""
+Persistente Outbox für Raid Helper Events
+
+Die Event-Erstellung wird als Job in der SQLite-DB abgelegt und von einem
+Worker-Pool im Hintergrund abgearbeitet. Jobs überleben Neustarts; ein Job
+wird vor dem API-Request atomar von "pending" auf "processing" gesetzt,
+sodass er höchstens einmal gesendet wird. Kam der Request sicher nicht bei
+Raid Helper an (API nicht erreichbar, Rate Limit), geht der Job verzögert
+zurück auf "pending", bis OUTBOX_MAX_ATTEMPTS erreicht ist.
+"""
+import asyncio
+import logging
+from typing import Dict, List, Tuple
+
+from config import OUTBOX_WORKERS, OUTBOX_MAX_ATTEMPTS, OUTBOX_RETRY_SECONDS, OUTBOX_RETRY_MAX_SECONDS
+from services.database import SessionLocal, ShardFilter, guild_shard_filter, run_db
+from services.models import EventJob
+from services.raid_helper import EventNotSent, create_event
+from utils.metrics import OUTBOX_QUEUE_DEPTH
+
+STATUS_PENDING = "pending"
+STATUS_PROCESSING = "processing"
+STATUS_FAILED = "failed"
+
+
+class EventOutboxWorker:
+    """Arbeitet ausstehende Event-Jobs mit begrenzter Parallelität ab."""
+
+    def __init__(self, concurrency: int = OUTBOX_WORKERS):
+        self.concurrency = concurrency
+        self._queue: asyncio.Queue[int] = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+        self._retries: Dict[int, asyncio.TimerHandle] = {}
+        self._bot = None
+        self._secrets_path = None
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._tasks)
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    async def start(self, bot, secrets_path: str, shards: ShardFilter | None = None):
+        """
+        Startet die Worker. Jobs, die beim letzten Lauf mitten im API-Request
+        unterbrochen wurden, werden als fehlgeschlagen gemeldet statt erneut
+        gesendet (ein zweiter POST könnte ein doppeltes Event erzeugen).
+
+        Mit `shards` übernimmt der Prozess nur Jobs aus Guilds seiner Shards.
+        """
+        self._bot = bot
+        self._secrets_path = secrets_path
+
+        # guild_id für Jobs aus der Zeit vor dem Sharding ergänzen (soweit im Cache sichtbar)
+        guild_ids = {}
+        for job_id, channel_id in await run_db(_select_jobs_missing_guild):
+            channel = bot.get_channel(channel_id)
+            if channel:
+                guild_ids[job_id] = channel.guild.id
+        if guild_ids:
+            await run_db(_update_job_guilds, guild_ids)
+
+        for job in await run_db(_fail_interrupted_jobs, shards):
+            logging.warning(f"Event-Job {job['id']} wurde unterbrochen, Status unklar")
+            channel = bot.get_channel(job["new_channel_id"])
+            if channel:
+                await self._report(channel, job, success=False, interrupted=True)
+
+        pending = await run_db(_select_pending_job_ids, shards)
+        for job_id in pending:
+            self._queue.put_nowait(job_id)
+
+        self._tasks = [asyncio.create_task(self._work(), name=f"event-outbox-{i}")
+                       for i in range(self.concurrency)]
+        logging.info(f"Event-Outbox gestartet mit {self.concurrency} Workern, {len(pending)} Jobs ausstehend")
+
+    async def stop(self):
+        """Stoppt die Worker; nicht abgearbeitete Jobs bleiben in der DB."""
+        for handle in self._retries.values():
+            handle.cancel()
+        self._retries.clear()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def enqueue(self,
+                      new_channel_id: int,
+                      guild_id: int,
+                      user_id: str,
+                      date: str,
+                      time: str,
+                      title: str,
+                      desc: str,
+                      template_id: int) -> int:
+        """Legt einen Event-Job dauerhaft an und reiht ihn zur Abarbeitung ein."""
+        job_id = await run_db(_insert_job, new_channel_id, guild_id, user_id, date, time, title, desc, template_id)
+        self._queue.put_nowait(job_id)
+        logging.info(f"Event-Job {job_id} für Channel {new_channel_id} eingereiht")
+        return job_id
+
+    async def enqueue_many(self, jobs: List[dict]) -> List[int]:
+        """
+        Legt mehrere Event-Jobs in einer Transaktion an und reiht sie ein.
+
+        Args:
+            jobs: Mappings mit den Parametern von enqueue
+        """
+        if not jobs:
+            return []
+        job_ids = await run_db(_insert_jobs, jobs)
+        for job_id in job_ids:
+            self._queue.put_nowait(job_id)
+        logging.info(f"{len(job_ids)} Event-Jobs eingereiht")
+        return job_ids
+
+    async def _work(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._process(job_id)
+            except Exception as e:
+                logging.error(f"Fehler bei Event-Job {job_id}: {e}", exc_info=True)
+            finally:
+                self._queue.task_done()
+
+    async def _process(self, job_id: int):
+        job = await run_db(_claim_job, job_id)
+        if job is None:
+            # Bereits von einem anderen Worker übernommen oder erledigt
+            return
+
+        channel = self._bot.get_channel(job["new_channel_id"])
+        if not channel:
+            logging.warning(f"Channel {job['new_channel_id']} für Event-Job {job_id} existiert nicht mehr")
+            await run_db(_finish_job, job_id, "Channel existiert nicht mehr")
+            return
+
+        response = await create_event(
+            channel=channel,
+            user_id=job["user_id"],
+            date=job["date"],
+            time=job["time"],
+            title=job["title"],
+            desc=job["description"],
+            template_id=job["template_id"],
+            secrets_path=self._secrets_path
+        )
+
+        if isinstance(response, EventNotSent):
+            if job["attempts"] < OUTBOX_MAX_ATTEMPTS:
+                await self._retry_later(job, response)
+                return
+            await run_db(_finish_job, job_id, f"Nach {job['attempts']} Versuchen nicht gesendet: {response.reason}")
+            logging.error(f"Event-Job {job_id} nach {job['attempts']} Versuchen aufgegeben: {job['title']}")
+            await self._report(channel, job, success=False)
+            return
+
+        success = response is not None and response.status == 200
+        if success:
+            await run_db(_finish_job, job_id, None)
+            logging.info(f"Event-Job {job_id} erledigt: {job['title']}")
+        else:
+            status = response.status if response is not None else None
+            await run_db(_finish_job, job_id, f"Raid Helper API Fehler (Status {status})")
+            logging.error(f"Raid Helper Event konnte nicht erstellt werden für: {job['title']}")
+
+        await self._report(channel, job, success=success)
+
+    async def _retry_later(self, job: dict, result: EventNotSent):
+        """
+        Gibt einen nicht gesendeten Job zurück (pending) und reiht ihn nach exponentiellem
+        Backoff wieder ein, frühestens nach der vom Server verlangten Wartezeit.
+        """
+        delay = min(OUTBOX_RETRY_SECONDS * 2 ** (job["attempts"] - 1), OUTBOX_RETRY_MAX_SECONDS)
+        delay = max(delay, result.retry_after or 0)
+        await run_db(_release_job, job["id"], result.reason)
+        self._retries[job["id"]] = asyncio.get_running_loop().call_later(delay, self._requeue, job["id"])
+        logging.warning(f"Event-Job {job['id']} nicht gesendet ({result.reason}), "
+                        f"Versuch {job['attempts']}/{OUTBOX_MAX_ATTEMPTS}, neuer Versuch in {delay:.0f}s")
+
+    def _requeue(self, job_id: int):
+        self._retries.pop(job_id, None)
+        self._queue.put_nowait(job_id)
+
+    @staticmethod
+    async def _report(channel, job: dict, success: bool, interrupted: bool = False):
+        """Meldet das Ergebnis eines Jobs im Event-Channel."""
+        if success:
+            message = f"✅ **Raid-Helper Event erstellt:** {job['title']}"
+        elif interrupted:
+            message = (
+                f"⚠️ <@{job['user_id']}> Die Erstellung des Raid-Helper Events wurde durch einen Neustart unterbrochen.\n"
+                f"Bitte prüfe, ob das Event existiert, und erstelle es sonst manuell."
+            )
+        else:
+            message = (
+                f"⚠️ <@{job['user_id']}> **Raid-Helper Event fehlgeschlagen!**\n"
+                f"Bitte erstelle das Event manuell oder überprüfe die API-Konfiguration."
+            )
+        try:
+            await channel.send(message)
+        except Exception as e:
+            logging.error(f"Konnte Ergebnis von Event-Job {job['id']} nicht melden: {e}")
+
+
+event_outbox = EventOutboxWorker()
+OUTBOX_QUEUE_DEPTH.set_function(lambda: event_outbox.queue_depth)
+
+
+# Synchrone DB-Zugriffe, laufen ausschließlich im DB-Thread (siehe run_db)
+
+def _job_to_dict(job: EventJob) -> dict:
+    return {
+        "id": job.id,
+        "new_channel_id": job.new_channel_id,
+        "user_id": job.user_id,
+        "date": job.date,
+        "time": job.time,
+        "title": job.title,
+        "description": job.description,
+        "template_id": job.template_id,
+        "attempts": job.attempts,
+    }
+
+
+def _insert_job(new_channel_id: int,
+                guild_id: int,
+                user_id: str,
+                date: str,
+                time: str,
+                title: str,
+                desc: str,
+                template_id: int) -> int:
+    session = SessionLocal()
+    try:
+        job = EventJob(
+            new_channel_id=new_channel_id,
+            guild_id=guild_id,
+            user_id=user_id,
+            date=date,
+            time=time,
+            title=title,
+            description=desc,
+            template_id=template_id,
+            status=STATUS_PENDING
+        )
+        session.add(job)
+        session.commit()
+        return job.id
+    finally:
+        session.close()
+
+
+def _insert_jobs(jobs: List[dict]) -> List[int]:
+    session = SessionLocal()
+    try:
+        rows = [
+            EventJob(
+                new_channel_id=job["new_channel_id"],
+                guild_id=job["guild_id"],
+                user_id=job["user_id"],
+                date=job["date"],
+                time=job["time"],
+                title=job["title"],
+                description=job["desc"],
+                template_id=job["template_id"],
+                status=STATUS_PENDING
+            )
+            for job in jobs
+        ]
+        session.add_all(rows)
+        session.commit()
+        return [row.id for row in rows]
+    finally:
+        session.close()
+
+
+def _select_pending_job_ids(shards: ShardFilter | None) -> List[int]:
+    session = SessionLocal()
+    try:
+        query = session.query(EventJob.id).filter(EventJob.status == STATUS_PENDING)
+        if shards:
+            query = query.filter(guild_shard_filter(EventJob.guild_id, shards))
+        rows = query.order_by(EventJob.id).all()
+        return [job_id for job_id, in rows]
+    finally:
+        session.close()
+
+
+def _select_jobs_missing_guild() -> List[Tuple[int, int]]:
+    session = SessionLocal()
+    try:
+        rows = session.query(EventJob.id, EventJob.new_channel_id)\
+            .filter(EventJob.guild_id.is_(None), EventJob.status != STATUS_FAILED)\
+            .all()
+        return [(job_id, channel_id) for job_id, channel_id in rows]
+    finally:
+        session.close()
+
+
+def _update_job_guilds(guild_ids: dict[int, int]):
+    session = SessionLocal()
+    try:
+        for job_id, guild_id in guild_ids.items():
+            session.query(EventJob).filter(EventJob.id == job_id)\
+                .update({EventJob.guild_id: guild_id}, synchronize_session=False)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def _claim_job(job_id: int) -> dict | None:
+    session = SessionLocal()
+    try:
+        claimed = session.query(EventJob)\
+            .filter(EventJob.id == job_id, EventJob.status == STATUS_PENDING)\
+            .update({EventJob.status: STATUS_PROCESSING, EventJob.attempts: EventJob.attempts + 1},
+                    synchronize_session=False)
+        session.commit()
+        if not claimed:
+            return None
+        return _job_to_dict(session.get(EventJob, job_id))
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def _release_job(job_id: int, error: str):
+    """Setzt einen beanspruchten, nicht gesendeten Job zurück auf pending."""
+    session = SessionLocal()
+    try:
+        session.query(EventJob)\
+            .filter(EventJob.id == job_id, EventJob.status == STATUS_PROCESSING)\
+            .update({EventJob.status: STATUS_PENDING, EventJob.last_error: error}, synchronize_session=False)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def _finish_job(job_id: int, error: str | None):
+    """Erledigte Jobs werden gelöscht, fehlgeschlagene bleiben zur Analyse stehen."""
+    session = SessionLocal()
+    try:
+        query = session.query(EventJob).filter(EventJob.id == job_id)
+        if error is None:
+            query.delete(synchronize_session=False)
+        else:
+            query.update({EventJob.status: STATUS_FAILED, EventJob.last_error: error},
+                         synchronize_session=False)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def _fail_interrupted_jobs(shards: ShardFilter | None) -> List[dict]:
+    session = SessionLocal()
+    try:
+        query = session.query(EventJob).filter(EventJob.status == STATUS_PROCESSING)
+        if shards:
+            query = query.filter(guild_shard_filter(EventJob.guild_id, shards))
+        jobs = query.all()
+        interrupted = [_job_to_dict(job) for job in jobs]
+        for job in jobs:
+            job.status = STATUS_FAILED
+            job.last_error = "Unterbrochen während des API-Requests"
+        session.commit()
+        return interrupted
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
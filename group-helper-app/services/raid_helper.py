@@ -1,11 +1,238 @@
 """
 Raid Helper API Integration
 """
+import asyncio
 import logging
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 import aiohttp
 from discord import TextChannel
 
+from config import (RAID_HELPER_CONNECTION_LIMIT, RAID_HELPER_DNS_CACHE_SECONDS, RAID_HELPER_TIMEOUT_SECONDS,
+                    RAID_HELPER_MAX_RETRIES, RAID_HELPER_BACKOFF_SECONDS, RAID_HELPER_BACKOFF_MAX_SECONDS,
+                    RAID_HELPER_BREAKER_THRESHOLD, RAID_HELPER_BREAKER_COOLDOWN_SECONDS)
 from utils.secrets import get_raid_helper_api_key
+from utils.metrics import RAID_HELPER_LATENCY, RAID_HELPER_RESPONSES
+
+# Status-Codes, bei denen der Request sicher nicht verarbeitet wurde und wiederholt werden darf
+RETRY_STATUSES = {429, 503}
+
+
+class RaidHelperRetryableError(aiohttp.ClientError):
+    """
+    Der Request wurde sicher nicht verarbeitet und darf später erneut gesendet werden.
+
+    `retry_after` ist die vom Server (oder Backoff) verlangte Mindestwartezeit in Sekunden.
+    """
+
+    def __init__(self, message: str, retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RaidHelperUnavailableError(RaidHelperRetryableError):
+    """Die Raid Helper API gilt als nicht erreichbar (Circuit Breaker offen)."""
+
+
+class EventNotSent:
+    """
+    Ergebnis von create_event, wenn der Request sicher nicht verarbeitet wurde
+    (Circuit Breaker offen, Verbindung abgelehnt, 429/503 nach allen Versuchen).
+    Das Event kann ohne Gefahr eines Duplikats später erneut gesendet werden.
+    """
+
+    def __init__(self, reason: str, retry_after: float | None = None):
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Einfacher Circuit Breaker: nach `threshold` Fehlern in Folge werden Requests
+    für `cooldown_seconds` sofort abgelehnt. Danach darf ein einzelner
+    Test-Request durch; schlägt er fehl, bleibt der Breaker offen.
+    """
+
+    def __init__(self, threshold: int, cooldown_seconds: float):
+        self.threshold = threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.failures = 0
+        self.opened_at: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if time.monotonic() - self.opened_at >= self.cooldown_seconds:
+            # Half-open: genau ein Test-Request, alle anderen warten den nächsten Cooldown ab
+            self.opened_at = time.monotonic()
+            return True
+        return False
+
+    def record_success(self):
+        if self.opened_at is not None:
+            logging.info("Raid Helper API wieder erreichbar, Circuit Breaker geschlossen")
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= self.threshold:
+            if self.opened_at is None:
+                logging.warning(f"Raid Helper API {self.failures}x fehlgeschlagen, Circuit Breaker geöffnet")
+            self.opened_at = time.monotonic()
+
+
+class RaidHelperClient:
+    """
+    Langlebige HTTP-Session für die Raid Helper API.
+
+    Wird mit dem Bot geöffnet und geschlossen, damit Verbindungen (TCP/TLS) per
+    Keep-Alive wiederverwendet und DNS-Antworten gecacht werden.
+    """
+
+    def __init__(self,
+                 connection_limit: int = RAID_HELPER_CONNECTION_LIMIT,
+                 dns_cache_seconds: int = RAID_HELPER_DNS_CACHE_SECONDS,
+                 timeout_seconds: float = RAID_HELPER_TIMEOUT_SECONDS,
+                 max_retries: int = RAID_HELPER_MAX_RETRIES,
+                 backoff_seconds: float = RAID_HELPER_BACKOFF_SECONDS,
+                 backoff_max_seconds: float = RAID_HELPER_BACKOFF_MAX_SECONDS):
+        self.connection_limit = connection_limit
+        self.dns_cache_seconds = dns_cache_seconds
+        self.timeout_seconds = timeout_seconds
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.breaker = CircuitBreaker(RAID_HELPER_BREAKER_THRESHOLD, RAID_HELPER_BREAKER_COOLDOWN_SECONDS)
+        self._session: aiohttp.ClientSession | None = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Die offene Session; wird bei Bedarf lazy geöffnet."""
+        if self._session is None or self._session.closed:
+            self.open()
+        return self._session
+
+    def open(self):
+        """Öffnet die Session (idempotent)."""
+        if self._session is not None and not self._session.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.connection_limit,
+            limit_per_host=self.connection_limit,
+            ttl_dns_cache=self.dns_cache_seconds,
+            keepalive_timeout=60
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout_seconds)
+        )
+        logging.info("Raid Helper HTTP-Session geöffnet")
+
+    async def close(self):
+        """Schließt die Session und alle offenen Verbindungen."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logging.info("Raid Helper HTTP-Session geschlossen")
+        self._session = None
+
+
+    async def post(self, url: str, **kwargs) -> aiohttp.ClientResponse:
+        """
+        POST mit Retry, Backoff und Circuit Breaker.
+
+        Wiederholt wird nur, wenn der Request sicher nicht verarbeitet wurde:
+        bei 429/503 und bei fehlgeschlagenem Verbindungsaufbau. Retry-After wird
+        nie unterschritten; verlangt der Server länger als backoff_max_seconds,
+        wird nicht gewartet, sondern der Aufrufer plant den Request neu ein.
+        Der Body der Antwort ist bereits gelesen.
+
+        Raises:
+            RaidHelperRetryableError: Bei 429/503 nach dem letzten Versuch oder wenn
+                Retry-After das Retry-Budget übersteigt
+            RaidHelperUnavailableError: Wenn der Circuit Breaker offen ist
+            aiohttp.ClientError: Bei nicht wiederholbaren Verbindungsfehlern
+        """
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow():
+                RAID_HELPER_RESPONSES.inc(status="breaker_open")
+                raise RaidHelperUnavailableError("Raid Helper API vorübergehend nicht erreichbar",
+                                                 retry_after=self.breaker.cooldown_seconds)
+
+            start = time.perf_counter()
+            try:
+                async with self.session.post(url, **kwargs) as response:
+                    await response.read()
+            except aiohttp.ClientConnectorError as e:
+                RAID_HELPER_RESPONSES.inc(status="connect_error")
+                self.breaker.record_failure()
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                logging.warning(f"Raid Helper nicht erreichbar ({e}), neuer Versuch in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                RAID_HELPER_RESPONSES.inc(status="error")
+                self.breaker.record_failure()
+                raise
+            finally:
+                RAID_HELPER_LATENCY.observe(time.perf_counter() - start)
+
+            RAID_HELPER_RESPONSES.inc(status=str(response.status))
+
+            if response.status >= 500:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+
+            if response.status in RETRY_STATUSES:
+                delay = self._retry_after(response)
+                if delay is None:
+                    delay = self._backoff(attempt)
+                if attempt >= self.max_retries or delay > self.backoff_max_seconds:
+                    raise RaidHelperRetryableError(
+                        f"Raid Helper antwortet mit {response.status}, erneut versuchen in {delay:.1f}s",
+                        retry_after=delay
+                    )
+                logging.warning(f"Raid Helper antwortet mit {response.status}, neuer Versuch in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+
+            return response
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponentielles Backoff mit Full Jitter."""
+        return random.uniform(0, min(self.backoff_max_seconds, self.backoff_seconds * 2 ** attempt))
+
+    def _retry_after(self, response: aiohttp.ClientResponse) -> float | None:
+        """Wartezeit aus Retry-After bzw. X-RateLimit-Reset-After (Sekunden oder HTTP-Datum), ungekürzt."""
+        for header in ("Retry-After", "X-RateLimit-Reset-After"):
+            value = response.headers.get(header)
+            if value is None:
+                continue
+            try:
+                return max(float(value), 0.0)
+            except ValueError:
+                pass
+            # Retry-After darf auch ein HTTP-Datum sein, z.B. "Wed, 21 Oct 2026 07:28:00 GMT"
+            try:
+                retry_at = parsedate_to_datetime(value)
+            except (TypeError, ValueError):
+                continue
+            if retry_at.tzinfo is None:
+                retry_at = retry_at.replace(tzinfo=timezone.utc)
+            return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+        return None
+
+
+raid_helper_client = RaidHelperClient()
 
 
 async def create_event(
@@ -17,7 +244,7 @@ async def create_event(
     desc: str,
     template_id: int,
     secrets_path: str = "secrets.json"
-) -> aiohttp.ClientResponse | None:
+) -> aiohttp.ClientResponse | EventNotSent | None:
     """
     Erstellt ein Raid Helper Event im angegebenen Channel.
 
@@ -32,7 +259,8 @@ async def create_event(
         secrets_path: Pfad zu lokalen Secrets
 
     Returns:
-        ClientResponse bei Erfolg, None bei Fehler
+        ClientResponse bei Erfolg, EventNotSent wenn der Request sicher nicht
+        verarbeitet wurde, None bei Ablehnung oder unklarem Ausgang (z.B. Timeout)
     """
     try:
         server_id = channel.guild.id
@@ -59,16 +287,21 @@ async def create_event(
             'description': desc
         }
 
-        # API Request ausführen
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(url, headers=headers, json=details_event) as response:
-                    response.raise_for_status()
-                    logging.info(f"Raid Helper Event erstellt: {title} am {date} {time}")
-                    return response
-            except aiohttp.ClientError as e:
-                logging.error(f"Raid Helper API Fehler: {e}")
-                return None
+        # API Request über die geteilte Session ausführen
+        try:
+            response = await raid_helper_client.post(url, headers=headers, json=details_event)
+            response.raise_for_status()
+            logging.info(f"Raid Helper Event erstellt: {title} am {date} {time}")
+            return response
+        except RaidHelperRetryableError as e:
+            logging.warning(f"Raid Helper Event nicht gesendet: {e}")
+            return EventNotSent(str(e), retry_after=e.retry_after)
+        except aiohttp.ClientConnectorError as e:
+            logging.warning(f"Raid Helper Event nicht gesendet, Verbindung fehlgeschlagen: {e}")
+            return EventNotSent(f"Verbindung fehlgeschlagen: {e}")
+        except aiohttp.ClientError as e:
+            logging.error(f"Raid Helper API Fehler: {e}")
+            return None
 
     except Exception as e:
         logging.error(f"Fehler beim Erstellen des Raid Helper Events: {e}")
@@ -1,53 +1,308 @@
 import sqlite3
 import asyncio
+import heapq
 import logging
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Tuple
+from typing import Iterable, List, Tuple
+from sqlalchemy import or_
 from services.models import ScheduledDeletion
-from services.database import SessionLocal
+from services.database import SessionLocal, ShardFilter, guild_shard_filter, run_db
+from utils.metrics import DELETION_LATENESS, PENDING_DELETIONS
 
+# Maximale Anzahl Zeilen pro Abfrage fälliger Löschungen
+DUE_PAGE_SIZE = 500
 
-def schedule_deletion(channel_id: int,
-                      base_channel_id: int,
-                      event_time: datetime,
-                      delete_at: datetime,
-                      event_title: str = None):
+# Maximale Anzahl IDs pro IN(...)-Klausel (SQLite-Variablenlimit)
+REMOVE_CHUNK_SIZE = 500
+
+
+class DeletionScheduler:
+    """
+    Hält alle ausstehenden Löschaufträge im Speicher, sortiert nach delete_time.
+
+    Die Einträge liegen in einem Min-Heap, sodass der nächste fällige Auftrag
+    in O(1) bekannt ist und der Lösch-Loop genau bis zu dieser Deadline schlafen
+    kann, statt periodisch die ganze Tabelle zu laden. Entfernte oder
+    verschobene Aufträge werden lazy beim Poppen verworfen.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[datetime, int]] = []
+        self._pending: dict[int, datetime] = {}
+        self._wakeup = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def rebuild(self, shards: ShardFilter | None = None):
+        """
+        Baut den Heap aus der Datenbank neu auf (beim Bot-Start).
+
+        Mit `shards` werden nur Löschungen aus Guilds dieser Shards geladen, damit
+        im Multi-Prozess-Betrieb jeder Job von genau einem Prozess bearbeitet wird.
+        """
+        self._pending = {channel_id: delete_time
+                         async for channel_id, delete_time in iter_due_deletions(until=datetime.max, shards=shards)}
+        self._heap = [(delete_time, channel_id) for channel_id, delete_time in self._pending.items()]
+        heapq.heapify(self._heap)
+        self._wakeup.set()
+        logging.info(f"Lösch-Scheduler mit {len(self._pending)} ausstehenden Löschungen geladen")
+
+    def push(self, channel_id: int, delete_time: datetime):
+        """Plant einen Channel (neu) ein und weckt den Lösch-Loop."""
+        self._pending[channel_id] = delete_time
+        heapq.heappush(self._heap, (delete_time, channel_id))
+        self._wakeup.set()
+
+    def discard(self, channel_id: int):
+        """Entfernt einen Channel aus der Planung (Heap-Eintrag verfällt lazy)."""
+        self._pending.pop(channel_id, None)
+
+    def next_deadline(self) -> datetime | None:
+        """Liefert die nächste gültige Deadline oder None, wenn nichts geplant ist."""
+        while self._heap:
+            delete_time, channel_id = self._heap[0]
+            if self._pending.get(channel_id) == delete_time:
+                return delete_time
+            heapq.heappop(self._heap)
+        return None
+
+    def pop_due(self, now: datetime) -> List[int]:
+        """Entnimmt alle Channel-IDs, deren delete_time <= now ist."""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            delete_time, channel_id = heapq.heappop(self._heap)
+            if self._pending.get(channel_id) == delete_time:
+                del self._pending[channel_id]
+                due.append(channel_id)
+                DELETION_LATENESS.observe((now - delete_time).total_seconds())
+        return due
+
+    async def wait_for_due(self) -> List[int]:
+        """
+        Schläft bis zur nächsten Deadline (oder bis ein neuer Auftrag eingeplant
+        wird) und gibt die dann fälligen Channel-IDs zurück.
+        """
+        self._wakeup.clear()
+        deadline = self.next_deadline()
+        timeout = None if deadline is None else max((deadline - datetime.now()).total_seconds(), 0)
+        if timeout != 0:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.pop_due(datetime.now())
+
+
+deletion_scheduler = DeletionScheduler()
+PENDING_DELETIONS.set_function(lambda: len(deletion_scheduler))
+
+
+async def schedule_deletion(channel_id: int,
+                            base_channel_id: int,
+                            event_time: datetime,
+                            delete_at: datetime,
+                            event_title: str = None,
+                            guild_id: int = None):
     """Speichert einen Löschauftrag in der Datenbank."""
+    await run_db(_insert_deletion, channel_id, base_channel_id, event_time, delete_at, event_title, guild_id)
+    deletion_scheduler.push(channel_id, delete_at)
+    logging.info("Löschung geplant für Channel %s um %s", channel_id, delete_at)
+
+
+async def schedule_deletions(deletions: List[Tuple[int, int, datetime, datetime, str | None, int | None]]):
+    """
+    Speichert mehrere Löschaufträge in einer Transaktion (z.B. beim Event-Import).
+
+    Args:
+        deletions: (channel_id, base_channel_id, event_time, delete_at, event_title, guild_id) je Auftrag
+    """
+    if not deletions:
+        return
+    await run_db(_insert_deletions, deletions)
+    for channel_id, _, _, delete_at, _, _ in deletions:
+        deletion_scheduler.push(channel_id, delete_at)
+    logging.info("%d Löschungen geplant", len(deletions))
+
+
+async def get_due_deletions(until: datetime,
+                            limit: int = DUE_PAGE_SIZE,
+                            after: Tuple[datetime, int] | None = None,
+                            shards: ShardFilter | None = None) -> List[Tuple[int, datetime]]:
+    """
+    Holt eine Seite fälliger Löschaufträge (delete_time <= until), sortiert nach Deadline.
+
+    Es werden nur (new_channel_id, delete_time) gelesen, keine ORM-Objekte.
+    Über `after` (letzte (delete_time, new_channel_id) der Vorseite) wird per
+    Keyset-Pagination weitergeblättert, sodass jede Seite über den Index auf
+    delete_time läuft. Mit `shards` nur Guilds der angegebenen Shards.
+    """
+    return await run_db(_select_due_page, until, limit, after, shards)
+
+
+async def iter_due_deletions(until: datetime, page_size: int = DUE_PAGE_SIZE, shards: ShardFilter | None = None):
+    """Iteriert seitenweise über alle fälligen Löschaufträge (new_channel_id, delete_time)."""
+    after = None
+    while True:
+        page = await get_due_deletions(until, limit=page_size, after=after, shards=shards)
+        for row in page:
+            yield row
+        if len(page) < page_size:
+            return
+        last_channel_id, last_delete_time = page[-1]
+        after = (last_delete_time, last_channel_id)
+
+
+async def backfill_deletion_guilds(get_channel) -> int:
+    """
+    Ergänzt die guild_id bei Löschaufträgen aus der Zeit vor dem Sharding.
+
+    Args:
+        get_channel: Lookup im Channel-Cache (z.B. bot.get_channel); erfasst werden
+            nur Channels, die dieser Prozess sieht
+
+    Returns:
+        Anzahl der ergänzten Einträge
+    """
+    guild_ids = {}
+    for channel_id, base_channel_id in await run_db(_select_missing_guild):
+        channel = get_channel(channel_id) or get_channel(base_channel_id)
+        if channel:
+            guild_ids[channel_id] = channel.guild.id
+    if guild_ids:
+        await run_db(_update_guilds, guild_ids)
+        logging.info(f"guild_id für {len(guild_ids)} Lösch-Einträge ergänzt")
+    return len(guild_ids)
+
+
+async def remove_deletion(channel_id: int):
+    """Entfernt einen Löschauftrag aus der Datenbank."""
+    deletion_scheduler.discard(channel_id)
+    await run_db(_delete_one, channel_id)
+
+
+async def remove_deletions(channel_ids: Iterable[int]) -> int:
+    """
+    Entfernt mehrere Löschaufträge in einer einzigen Transaktion.
+
+    Returns:
+        Anzahl der entfernten Einträge
+    """
+    channel_ids = list(set(channel_ids))
+    if not channel_ids:
+        return 0
+
+    for channel_id in channel_ids:
+        deletion_scheduler.discard(channel_id)
+
+    return await run_db(_delete_many, channel_ids)
+
+
+# Synchrone DB-Zugriffe, laufen ausschließlich im DB-Thread (siehe run_db)
+
+def _insert_deletion(channel_id: int,
+                     base_channel_id: int,
+                     event_time: datetime,
+                     delete_at: datetime,
+                     event_title: str | None,
+                     guild_id: int | None):
     session = SessionLocal()
     try:
         deletion = ScheduledDeletion(
             new_channel_id=channel_id,
             base_channel_id=base_channel_id,
+            guild_id=guild_id,
             event_time=event_time,
             delete_time=delete_at,
             event_title=event_title
         )
         session.add(deletion)
         session.commit()
-        logging.info(f"Löschung geplant für Channel {channel_id} um {delete_at}")
     finally:
         session.close()
 
 
-def get_pending_deletions() -> List[ScheduledDeletion]:
-    """Holt alle ausstehenden Löschaufträge."""
+def _insert_deletions(deletions: List[Tuple[int, int, datetime, datetime, str | None, int | None]]):
     session = SessionLocal()
     try:
-        return session.query(ScheduledDeletion).all()
+        session.add_all([
+            ScheduledDeletion(
+                new_channel_id=channel_id,
+                base_channel_id=base_channel_id,
+                guild_id=guild_id,
+                event_time=event_time,
+                delete_time=delete_at,
+                event_title=event_title
+            )
+            for channel_id, base_channel_id, event_time, delete_at, event_title, guild_id in deletions
+        ])
+        session.commit()
     finally:
         session.close()
 
 
-def remove_deletion(channel_id: int):
-    """Entfernt einen Löschauftrag aus der Datenbank."""
+def _select_due_page(until: datetime,
+                     limit: int,
+                     after: Tuple[datetime, int] | None,
+                     shards: ShardFilter | None) -> List[Tuple[int, datetime]]:
+    session = SessionLocal()
+    try:
+        query = session.query(ScheduledDeletion.new_channel_id, ScheduledDeletion.delete_time)\
+            .filter(ScheduledDeletion.delete_time <= until)
+        if shards:
+            query = query.filter(guild_shard_filter(ScheduledDeletion.guild_id, shards))
+        if after:
+            # Die Untergrenze delete_time >= after_time steht separat, damit SQLite den Index-Scan dort
+            # beginnt; nur mit der OR-Bedingung liest jede Seite den Index von vorne
+            after_time, after_channel_id = after
+            query = query.filter(
+                ScheduledDeletion.delete_time >= after_time,
+                or_(ScheduledDeletion.delete_time > after_time,
+                    ScheduledDeletion.new_channel_id > after_channel_id)
+            )
+        rows = query.order_by(ScheduledDeletion.delete_time, ScheduledDeletion.new_channel_id)\
+            .limit(limit)\
+            .all()
+        return [(channel_id, delete_time) for channel_id, delete_time in rows]
+    finally:
+        session.close()
+
+
+def _select_missing_guild() -> List[Tuple[int, int]]:
+    session = SessionLocal()
+    try:
+        rows = session.query(ScheduledDeletion.new_channel_id, ScheduledDeletion.base_channel_id)\
+            .filter(ScheduledDeletion.guild_id.is_(None))\
+            .all()
+        return [(channel_id, base_channel_id) for channel_id, base_channel_id in rows]
+    finally:
+        session.close()
+
+
+def _update_guilds(guild_ids: dict[int, int]):
+    session = SessionLocal()
+    try:
+        for channel_id, guild_id in guild_ids.items():
+            session.query(ScheduledDeletion)\
+                .filter(ScheduledDeletion.new_channel_id == channel_id)\
+                .update({ScheduledDeletion.guild_id: guild_id}, synchronize_session=False)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def _delete_one(channel_id: int):
     session = SessionLocal()
     try:
         deletion = session.query(ScheduledDeletion).filter_by(new_channel_id=channel_id).first()
         if deletion:
             session.delete(deletion)
             session.commit()
-            logging.info(f"Lösch-Eintrag für Channel {channel_id} entfernt")
+            logging.info("Lösch-Eintrag für Channel %s entfernt", channel_id)
     except Exception as e:
         session.rollback()
         logging.error(f"Fehler beim Entfernen des Lösch-Eintrags: {e}")
@@ -55,3 +310,22 @@ def remove_deletion(channel_id: int):
     finally:
         session.close()
 
+
+def _delete_many(channel_ids: List[int]) -> int:
+    session = SessionLocal()
+    try:
+        removed = 0
+        for i in range(0, len(channel_ids), REMOVE_CHUNK_SIZE):
+            chunk = channel_ids[i:i + REMOVE_CHUNK_SIZE]
+            removed += session.query(ScheduledDeletion)\
+                .filter(ScheduledDeletion.new_channel_id.in_(chunk))\
+                .delete(synchronize_session=False)
+        session.commit()
+        logging.info("%d Lösch-Einträge entfernt", removed)
+        return removed
+    except Exception as e:
+        session.rollback()
+        logging.error(f"Fehler beim Entfernen der Lösch-Einträge: {e}")
+        raise
+    finally:
+        session.close()
@@ -0,0 +1,240 @@
+"""
+Wiederkehrende Gruppen-Events (Serien)
+
+Eine Serie speichert nur Regel (Startzeit, Intervall, Ende) und Vorlage
+(Titel, Beschreibung, Basis-Channel). Erst wenn ein Termin innerhalb von
+SERIES_LEAD_HOURS liegt, legt der Hintergrund-Job dafür Channel, Löschauftrag
+und Raid Helper Job an und rückt next_occurrence um ein Intervall weiter.
+So bleibt die Zahl der Channels und DB-Zeilen unabhängig davon begrenzt, wie
+weit eine Serie im Voraus geplant ist.
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import List
+
+from sqlalchemy import and_
+
+from config import DELETE_DELAY_HOURS, SERIES_LEAD_HOURS
+from services.channel_manager import clone_channel_for_event, delete_channel_after_event, rollback_event_channel
+from services.database import SessionLocal, ShardFilter, guild_shard_filter, run_db
+from services.models import EventSeries
+from services.outbox import event_outbox
+
+
+def next_occurrence_from(start: datetime, interval_days: int, now: datetime) -> datetime:
+    """
+    Erster Termin der Regel (start + k * interval_days) ab `now`. Verpasste Termine
+    (z.B. während der Bot offline war) werden übersprungen statt nachgeholt.
+    """
+    if start >= now:
+        return start
+    interval = timedelta(days=interval_days)
+    missed = -(-(now - start) // interval)  # aufgerundet
+    return start + missed * interval
+
+
+async def create_series(guild_id: int,
+                        base_channel_id: int,
+                        user_id: str,
+                        title: str,
+                        desc: str,
+                        template_id: int,
+                        first_occurrence: datetime,
+                        interval_days: int,
+                        until: datetime | None = None) -> int:
+    """Legt eine Serie an; der erste Termin wird vom Hintergrund-Job materialisiert."""
+    series_id = await run_db(_insert_series, guild_id, base_channel_id, user_id, title, desc, template_id,
+                             first_occurrence, interval_days, until)
+    logging.info(f"Event-Serie {series_id} angelegt: {title} alle {interval_days} Tage ab {first_occurrence}")
+    return series_id
+
+
+async def stop_series(series_id: int, guild_id: int) -> bool:
+    """
+    Beendet eine Serie. Bereits angelegte Termine bleiben bestehen.
+
+    Returns:
+        False, wenn es in der Guild keine laufende Serie mit dieser ID gibt
+    """
+    stopped = await run_db(_stop_series, series_id, guild_id)
+    if stopped:
+        logging.info(f"Event-Serie {series_id} beendet")
+    return stopped
+
+
+async def materialise_due_series(bot, now: datetime, shards: ShardFilter | None = None) -> int:
+    """
+    Legt alle Termine an, die innerhalb von SERIES_LEAD_HOURS nach `now` liegen.
+
+    Jeder Termin wird vor dem Anlegen atomar beansprucht (next_occurrence weiterrücken),
+    sodass er auch bei mehreren Prozessen höchstens einmal angelegt wird. Schlägt das
+    Anlegen fehl, wird der Anspruch zurückgegeben und beim nächsten Lauf erneut versucht.
+
+    Returns:
+        Anzahl angelegter Termine
+    """
+    created = 0
+    horizon = now + timedelta(hours=SERIES_LEAD_HOURS)
+    for series in await run_db(_select_due_series, horizon, shards):
+        occurrence = series["next_occurrence"]
+        if occurrence < now:
+            # Verpasste Termine überspringen, ohne Channels in der Vergangenheit anzulegen
+            upcoming = _within_series(series, next_occurrence_from(occurrence, series["interval_days"], now))
+            if not await run_db(_advance_series, series["id"], occurrence, upcoming):
+                continue
+            logging.warning(f"Event-Serie {series['id']}: verpasste Termine übersprungen, weiter ab {upcoming}")
+            if upcoming is None or upcoming > horizon:
+                continue
+            occurrence = upcoming
+
+        following = _within_series(series, occurrence + timedelta(days=series["interval_days"]))
+        if not await run_db(_advance_series, series["id"], occurrence, following):
+            # Bereits von einem anderen Prozess übernommen
+            continue
+
+        try:
+            await _materialise(bot, series, occurrence)
+            created += 1
+        except Exception as e:
+            logging.error(f"Event-Serie {series['id']}: Termin {occurrence} konnte nicht angelegt werden: {e}")
+            await run_db(_release_occurrence, series["id"], following, occurrence)
+    return created
+
+
+def _within_series(series: dict, occurrence: datetime) -> datetime | None:
+    """Der Termin, oder None wenn er nach dem Ende der Serie liegt."""
+    if series["until"] is not None and occurrence > series["until"]:
+        return None
+    return occurrence
+
+
+async def _materialise(bot, series: dict, occurrence: datetime):
+    """Legt Channel, Löschauftrag und Raid Helper Job für einen Termin an."""
+    base_channel = bot.get_channel(series["base_channel_id"])
+    if not base_channel:
+        raise LookupError(f"Basis-Channel {series['base_channel_id']} existiert nicht mehr")
+
+    new_channel = await clone_channel_for_event(base_channel, series["title"], occurrence)
+    # Job zuletzt anlegen: schlägt die Löschung fehl, gibt es nichts, was in den entfernten Channel postet
+    try:
+        await delete_channel_after_event(
+            base_channel=base_channel,
+            new_channel=new_channel,
+            event_time=occurrence,
+            delete_time=occurrence + timedelta(hours=DELETE_DELAY_HOURS)
+        )
+        await event_outbox.enqueue(
+            new_channel_id=new_channel.id,
+            guild_id=new_channel.guild.id,
+            user_id=series["user_id"],
+            date=occurrence.strftime("%Y-%m-%d"),
+            time=occurrence.strftime("%H:%M"),
+            title=series["title"],
+            desc=series["description"],
+            template_id=series["template_id"]
+        )
+    except Exception:
+        await rollback_event_channel(new_channel)
+        raise
+    logging.info(f"Event-Serie {series['id']}: Termin {occurrence} angelegt in {new_channel.name}")
+
+
+# Synchrone DB-Zugriffe, laufen ausschließlich im DB-Thread (siehe run_db)
+
+def _series_to_dict(series: EventSeries) -> dict:
+    return {
+        "id": series.id,
+        "guild_id": series.guild_id,
+        "base_channel_id": series.base_channel_id,
+        "user_id": series.user_id,
+        "title": series.title,
+        "description": series.description,
+        "template_id": series.template_id,
+        "interval_days": series.interval_days,
+        "next_occurrence": series.next_occurrence,
+        "until": series.until,
+    }
+
+
+def _insert_series(guild_id: int,
+                   base_channel_id: int,
+                   user_id: str,
+                   title: str,
+                   desc: str,
+                   template_id: int,
+                   first_occurrence: datetime,
+                   interval_days: int,
+                   until: datetime | None) -> int:
+    session = SessionLocal()
+    try:
+        series = EventSeries(
+            guild_id=guild_id,
+            base_channel_id=base_channel_id,
+            user_id=user_id,
+            title=title,
+            description=desc,
+            template_id=template_id,
+            interval_days=interval_days,
+            next_occurrence=first_occurrence,
+            until=until
+        )
+        session.add(series)
+        session.commit()
+        return series.id
+    finally:
+        session.close()
+
+
+def _select_due_series(horizon: datetime, shards: ShardFilter | None) -> List[dict]:
+    session = SessionLocal()
+    try:
+        query = session.query(EventSeries).filter(EventSeries.next_occurrence <= horizon)
+        if shards:
+            query = query.filter(guild_shard_filter(EventSeries.guild_id, shards))
+        return [_series_to_dict(series) for series in query.order_by(EventSeries.next_occurrence).all()]
+    finally:
+        session.close()
+
+
+def _advance_series(series_id: int, current: datetime, following: datetime | None) -> bool:
+    """Rückt next_occurrence von `current` auf `following` (None = Serie beendet) weiter."""
+    session = SessionLocal()
+    try:
+        updated = session.query(EventSeries)\
+            .filter(and_(EventSeries.id == series_id, EventSeries.next_occurrence == current))\
+            .update({EventSeries.next_occurrence: following}, synchronize_session=False)
+        session.commit()
+        return updated == 1
+    finally:
+        session.close()
+
+
+def _release_occurrence(series_id: int, following: datetime | None, occurrence: datetime):
+    """
+    Gibt einen beanspruchten Termin zurück, sofern die Serie seitdem nicht verändert (z.B. beendet) wurde.
+    Beim letzten Termin (following None) steht next_occurrence seit dem Anspruch auf None; die Serie lässt
+    sich in dieser Zeit nicht beenden, der Termin wird also in jedem Fall zurückgegeben.
+    """
+    claimed = EventSeries.next_occurrence.is_(None) if following is None else EventSeries.next_occurrence == following
+    session = SessionLocal()
+    try:
+        session.query(EventSeries)\
+            .filter(and_(EventSeries.id == series_id, claimed))\
+            .update({EventSeries.next_occurrence: occurrence}, synchronize_session=False)
+        session.commit()
+    finally:
+        session.close()
+
+
+def _stop_series(series_id: int, guild_id: int) -> bool:
+    session = SessionLocal()
+    try:
+        updated = session.query(EventSeries)\
+            .filter(and_(EventSeries.id == series_id,
+                         EventSeries.guild_id == guild_id,
+                         EventSeries.next_occurrence.isnot(None)))\
+            .update({EventSeries.next_occurrence: None}, synchronize_session=False)
+        session.commit()
+        return updated == 1
+    finally:
+        session.close()
@@ -0,0 +1,58 @@
+"""
+Gemeinsame Fixtures der Tests für den Group Helper Bot
+"""
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Die Services legen data/ und logs/ relativ zum Arbeitsverzeichnis an: Tests laufen in einem Temp-Verzeichnis
+_workdir = tempfile.TemporaryDirectory(prefix="group-helper-tests-")
+os.chdir(_workdir.name)
+
+
+@pytest.fixture
+def db():
+    """Leere Datenbank mit aktuellem Schema."""
+    from services.database import Base, engine, init_db
+    Base.metadata.drop_all(engine)
+    init_db()
+    yield engine
+
+
+@pytest.fixture
+def commits(db):
+    """Liste, die pro COMMIT auf der Datenbank einen Eintrag erhält."""
+    from sqlalchemy import event
+    counted = []
+
+    def count(connection):
+        counted.append(connection)
+
+    event.listen(db, "commit", count)
+    yield counted
+    event.remove(db, "commit", count)
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    """Frischer DeletionScheduler statt der prozessweiten Instanz."""
+    import group_events
+    from services import scheduler as scheduler_module
+    fresh = scheduler_module.DeletionScheduler()
+    monkeypatch.setattr(scheduler_module, "deletion_scheduler", fresh)
+    monkeypatch.setattr(group_events, "deletion_scheduler", fresh)
+    return fresh
+
+
+@pytest.fixture
+def secrets_path(tmp_path):
+    """Lokale secrets.json mit dem Raid Helper API Key der Guild 7."""
+    path = tmp_path / "secrets.json"
+    path.write_text(json.dumps({"RAID-HELPER": [{"ServerID": "7", "ApiKey": "key"}]}), encoding="utf-8")
+    return str(path)
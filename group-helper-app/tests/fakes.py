@@ -0,0 +1,175 @@
+"""
+Minimale Fakes für die Discord-Objekte, die Cog und Services benutzen, und eine lokale Raid Helper API
+"""
+import asyncio
+import itertools
+import json
+from collections import Counter
+from types import SimpleNamespace
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from services.raid_helper import RaidHelperClient
+
+RAID_HELPER_URL = "https://raid-helper.xyz"
+
+_ids = itertools.count(10_000)
+
+
+def guild_id_for_shard(shard_id: int, shard_count: int, n: int = 0) -> int:
+    """Eine Guild-ID, die Discord dem Shard `shard_id` zuordnet ((guild_id >> 22) % shard_count)."""
+    return ((n * shard_count + shard_id) << 22) + 1
+
+
+class FakePermissions:
+    def __init__(self, allowed: bool = True):
+        self.manage_channels = allowed
+        self.view_channel = allowed
+
+
+class FakeGuild:
+    def __init__(self, guild_id: int):
+        self.id = guild_id
+        self.me = SimpleNamespace(guild_permissions=FakePermissions())
+        self.channels = {}
+
+
+class FakeChannel:
+    def __init__(self, guild: FakeGuild, name: str = "event", fail_delete: bool = False, channel_id: int | None = None):
+        self.id = channel_id or next(_ids)
+        self.name = name
+        self.guild = guild
+        self.fail_delete = fail_delete
+        self.deletions = 0
+        self.messages = []
+        guild.channels[self.id] = self
+
+    @property
+    def mention(self) -> str:
+        return f"<#{self.id}>"
+
+    def permissions_for(self, member) -> FakePermissions:
+        return FakePermissions()
+
+    async def clone(self, name: str, reason: str = None) -> "FakeChannel":
+        return FakeChannel(self.guild, name)
+
+    async def delete(self, reason: str = None):
+        self.deletions += 1
+        if self.fail_delete:
+            raise RuntimeError("Discord nicht erreichbar")
+        self.guild.channels.pop(self.id, None)
+
+    async def send(self, content: str) -> "FakeMessage":
+        self.messages.append(content)
+        return FakeMessage(content)
+
+
+class FakeMessage:
+    def __init__(self, content: str):
+        self.content = content
+        self.edits = []
+
+    async def edit(self, content: str):
+        self.content = content
+        self.edits.append(content)
+
+
+class FakeBot:
+    """Bot-Ersatz: Channel-Cache über alle Guilds, optional mit Shards eines Worker-Prozesses."""
+
+    def __init__(self, guilds, shard_count: int | None = None, shard_ids: list[int] | None = None):
+        self.guilds = list(guilds)
+        self.shard_count = shard_count
+        self.shard_ids = shard_ids
+
+    def get_channel(self, channel_id: int):
+        for guild in self.guilds:
+            if channel_id in guild.channels:
+                return guild.channels[channel_id]
+        return None
+
+
+class FakeResponse:
+    def __init__(self):
+        self.messages = []
+        self.deferred = False
+
+    async def defer(self, ephemeral: bool = False):
+        self.deferred = True
+
+    def is_done(self) -> bool:
+        return self.deferred or bool(self.messages)
+
+    async def send_message(self, content: str, ephemeral: bool = False):
+        self.messages.append(content)
+
+
+class FakeFollowup:
+    def __init__(self):
+        self.messages = []
+
+    async def send(self, content: str, ephemeral: bool = False):
+        self.messages.append(content)
+
+
+class FakeInteraction:
+    """Slash-Command-Aufruf aus `channel`; Antworten landen in response.messages und followup.messages."""
+
+    def __init__(self, channel: FakeChannel, user_id: int = 1, user_name: str = "leader"):
+        self.channel = channel
+        self.user = SimpleNamespace(id=user_id, name=user_name)
+        self.response = FakeResponse()
+        self.followup = FakeFollowup()
+
+class StubRaidHelper:
+    """
+    Lokale Raid Helper API; `behaviour` bestimmt pro Titel die Antworten der Reihe nach:
+    ein Status-Code, ein Tupel (Status, Header) oder "block" für einen hängenden Request.
+    """
+
+    def __init__(self):
+        self.received = Counter()
+        self.behaviour = {}
+        self.blocked = asyncio.Event()
+        # Client-Adressen (Host, Port) der Requests: eine pro TCP-Verbindung
+        self.connections = set()
+        self.server = None
+
+    async def handle(self, request):
+        self.connections.add(request.transport.get_extra_info("peername"))
+        body = await request.json()
+        title = body["title"]
+        self.received[title] += 1
+        responses = self.behaviour.get(title)
+        action = responses.pop(0) if responses else 200
+        if action == "block":
+            # Request hängt, bis der Worker abgebrochen wird
+            self.blocked.set()
+            await asyncio.Event().wait()
+        if isinstance(action, tuple):
+            status, headers = action
+            return web.Response(status=status, headers=headers)
+        if action == 429:
+            return web.Response(status=429, headers={"Retry-After": "0"})
+        return web.Response(status=action, text=json.dumps({"title": title}))
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_post("/api/v4/servers/{server_id}/channels/{channel_id}/event", self.handle)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        return f"http://{self.server.host}:{self.server.port}"
+
+
+class StubbedClient(RaidHelperClient):
+    """Echter Client (Retry, Breaker, Session), der statt raid-helper.xyz die Stub-API anspricht."""
+
+    def __init__(self, base_url: str, **kwargs):
+        kwargs.setdefault("max_retries", 0)
+        super().__init__(**kwargs)
+        self.base_url = base_url
+
+    async def post(self, url: str, **kwargs):
+        return await super().post(url.replace(RAID_HELPER_URL, self.base_url), **kwargs)
@@ -0,0 +1,38 @@
+"""
+Worker-Prozess für den Sharding-Test: GroupEvents-Cog wie in run_shard_process, aber mit FakeBot statt Gateway
+"""
+import asyncio
+import time
+
+from fakes import FakeBot, FakeChannel, FakeGuild
+
+
+def run_worker(process_index: int, shard_count: int, shard_ids: list[int], channels: list[tuple[int, int]],
+               barrier, results, timeout: float = 20.0):
+    """
+    Sieht alle `channels` (Paare aus Guild- und Channel-ID), bearbeitet aber nur die Löschungen seiner Shards.
+    Meldet (process_index, gelöschte Channel-IDs) über die Queue `results`.
+    """
+    # Erst im Worker importieren: Das Modul legt die SQLite-Engine im Arbeitsverzeichnis des Prozesses an
+    from group_events import GroupEvents
+    from services.scheduler import deletion_scheduler
+
+    guilds = {}
+    fake_channels = []
+    for guild_id, channel_id in channels:
+        guild = guilds.setdefault(guild_id, FakeGuild(guild_id))
+        fake_channels.append(FakeChannel(guild, channel_id=channel_id))
+
+    async def run():
+        cog = GroupEvents(FakeBot(guilds.values(), shard_count=shard_count, shard_ids=shard_ids))
+        await cog.cog_load()
+        # Alle Worker starten gleichzeitig, wie nach einem Neustart des Launchers
+        await asyncio.to_thread(barrier.wait)
+        await cog.on_ready()
+        deadline = time.monotonic() + timeout
+        while len(deletion_scheduler) and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        await cog.cog_unload()
+
+    asyncio.run(run())
+    results.put((process_index, [channel.id for channel in fake_channels for _ in range(channel.deletions)]))
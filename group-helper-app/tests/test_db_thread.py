@@ -0,0 +1,55 @@
+"""
+DB-Thread: 1.000 gleichzeitige schedule_deletion-Aufrufe blockieren den Event Loop nicht (user-004)
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from services.scheduler import _insert_deletion, schedule_deletion
+
+CALLS = 1000
+
+
+async def _max_stall(workload) -> float:
+    """Größte Lücke (Sekunden) zwischen zwei Heartbeats eines 1-ms-Timers, während `workload` läuft."""
+    gaps = []
+    done = asyncio.Event()
+
+    async def heartbeat():
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    beat = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0.01)
+    await workload()
+    done.set()
+    await beat
+    return max(gaps)
+
+
+def _args(i: int):
+    delete_at = datetime.now() + timedelta(days=1, seconds=i)
+    return i + 1, 1, delete_at, delete_at, f"event-{i}", 1
+
+
+def test_schedule_deletion_keeps_the_event_loop_responsive(db, scheduler):
+    async def blocking():
+        # Vorher: die Coroutinen riefen die synchrone Session direkt auf dem Event Loop auf
+        async def schedule(i):
+            _insert_deletion(*_args(i + CALLS))
+        await asyncio.gather(*(schedule(i) for i in range(CALLS)))
+
+    async def db_thread():
+        await asyncio.gather(*(schedule_deletion(*_args(i)) for i in range(CALLS)))
+
+    before = asyncio.run(_max_stall(blocking))
+    after = asyncio.run(_max_stall(db_thread))
+
+    assert len(scheduler) == CALLS
+    # Vorher stand der Loop für alle Commits am Stück; jetzt laufen sie im DB-Thread und der Loop kommt
+    # zwischendurch dran (übrig bleibt vor allem das Starten der 1.000 Tasks)
+    assert after < before / 4
@@ -0,0 +1,185 @@
+"""
+/group-event-import: Datei-Parser, alles-oder-nichts-Validierung, begrenzte Parallelität beim
+Klonen, ein Commit für alle Löschungen und 100 Events über die Outbox an eine Stub-API (user-022)
+"""
+import asyncio
+import json
+import time
+from collections import Counter
+
+import pytest
+
+import group_events
+from config import IMPORT_CONCURRENCY, IMPORT_MAX_EVENTS
+from fakes import FakeBot, FakeChannel, FakeGuild, FakeInteraction, StubbedClient, StubRaidHelper
+from group_events import GroupEvents
+from services import raid_helper
+from services.database import SessionLocal
+from services.event_import import ImportFileError, parse_event_file
+from services.models import EventJob, ScheduledDeletion
+from services.outbox import EventOutboxWorker
+
+EVENT = {"date": "2030-01-01", "time": "20:00", "title": "Raid", "desc": "Heroisch"}
+
+
+class FakeAttachment:
+    def __init__(self, filename: str, data: bytes):
+        self.filename = filename
+        self.size = len(data)
+        self._data = data
+
+    async def read(self) -> bytes:
+        return self._data
+
+
+class SlowChannel(FakeChannel):
+    """Basis-Channel, dessen Klonen wie ein HTTP-Request dauert; merkt sich die höchste Parallelität."""
+
+    def __init__(self, guild, latency: float = 0.01):
+        super().__init__(guild, "raid")
+        self.latency = latency
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.clones = 0
+
+    async def clone(self, name, reason=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            self.clones += 1
+            return await super().clone(name, reason)
+        finally:
+            self.in_flight -= 1
+
+
+def _events(count: int) -> list[dict]:
+    return [{**EVENT, "title": f"Raid {n:03d}"} for n in range(1, count + 1)]
+
+
+def _json_file(events) -> FakeAttachment:
+    return FakeAttachment("events.json", json.dumps(events).encode())
+
+
+def _rows(model) -> int:
+    session = SessionLocal()
+    try:
+        return session.query(model).count()
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    fresh = EventOutboxWorker()
+    monkeypatch.setattr(group_events, "event_outbox", fresh)
+    return fresh
+
+
+@pytest.fixture
+def cog(db, scheduler, worker, secrets_path, monkeypatch):
+    monkeypatch.setattr(group_events, "secrets_path", secrets_path)
+    guild = FakeGuild(7)
+    base = SlowChannel(guild)
+    return GroupEvents(FakeBot([guild])), guild, base
+
+
+async def _import(cog, interaction, attachment):
+    await GroupEvents.group_event_import.callback(cog, interaction, attachment)
+
+
+# Datei-Parser
+
+def test_parse_csv_with_comma_and_semicolon():
+    for delimiter in ",;":
+        text = delimiter.join(EVENT) + "\n" + delimiter.join(EVENT.values()) + "\n\n"
+        assert parse_event_file("events.CSV", text.encode("utf-8-sig")) == [EVENT]
+
+
+def test_parse_json_list_and_events_object():
+    padded = {field: f" {value} " for field, value in EVENT.items()}
+    assert parse_event_file("events.json", json.dumps([padded]).encode()) == [EVENT]
+    assert parse_event_file("events.json", json.dumps({"events": [EVENT]}).encode()) == [EVENT]
+
+
+def test_parse_keeps_missing_json_fields_for_validation():
+    assert parse_event_file("events.json", b'[{"date": "2030-01-01"}]') == \
+        [{"date": "2030-01-01", "time": None, "title": None, "desc": None}]
+
+
+@pytest.mark.parametrize("filename, data, message", [
+    ("events.txt", b"date,time,title,desc", "Nur .csv"),
+    ("events.csv", "date,time,title\n1,2,3".encode(), "Fehlende Spalten: desc"),
+    ("events.csv", b"date,time,title,desc\n", "keine Events"),
+    ("events.json", b"[]", "keine Events"),
+    ("events.json", b"{\"date\": ", "Ungültiges JSON"),
+    ("events.json", b"[1, 2]", "Liste von Events"),
+    ("events.csv", "date,time,title,desc\n1,2,Über,4".encode("latin-1"), "UTF-8"),
+    ("events.json", json.dumps(_events(IMPORT_MAX_EVENTS + 1)).encode(), f"Maximal {IMPORT_MAX_EVENTS}"),
+])
+def test_parse_errors(filename, data, message):
+    with pytest.raises(ImportFileError, match=message):
+        parse_event_file(filename, data)
+
+
+# Command
+
+def test_one_invalid_event_creates_nothing(cog, worker):
+    cog, guild, base = cog
+    events = _events(10)
+    events[6]["date"] = "31.02.2030"
+    interaction = FakeInteraction(base)
+
+    asyncio.run(_import(cog, interaction, _json_file(events)))
+
+    assert base.clones == 0 and list(guild.channels) == [base.id]
+    assert _rows(ScheduledDeletion) == 0 and _rows(EventJob) == 0 and worker._queue.qsize() == 0
+    assert interaction.followup.messages[0].startswith("❌ **Import abgebrochen, fehlerhafte Events:**")
+    assert "**Event 7, Datum:**" in interaction.followup.messages[0]
+
+
+def test_clones_are_bounded_and_deletions_committed_once(cog, worker, commits):
+    cog, guild, base = cog
+    interaction = FakeInteraction(base)
+
+    asyncio.run(_import(cog, interaction, _json_file(_events(IMPORT_MAX_EVENTS))))
+
+    assert base.clones == IMPORT_MAX_EVENTS
+    assert base.max_in_flight == IMPORT_CONCURRENCY
+    # Eine Transaktion für alle Löschungen, eine für alle Jobs
+    assert len(commits) == 2
+    assert _rows(ScheduledDeletion) == IMPORT_MAX_EVENTS and _rows(EventJob) == IMPORT_MAX_EVENTS
+    assert interaction.followup.messages[-1].startswith(
+        f"✅ **Event-Import abgeschlossen:** {IMPORT_MAX_EVENTS}/{IMPORT_MAX_EVENTS} Channels angelegt")
+
+
+def test_100_events_reach_the_raid_helper_api_once_each(cog, worker, secrets_path, monkeypatch):
+    cog, guild, base = cog
+    stub = StubRaidHelper()
+    interaction = FakeInteraction(base)
+
+    async def main():
+        client = StubbedClient(await stub.start())
+        monkeypatch.setattr(raid_helper, "raid_helper_client", client)
+        await worker.start(cog.bot, secrets_path)
+        try:
+            start = time.perf_counter()
+            await _import(cog, interaction, _json_file(_events(IMPORT_MAX_EVENTS)))
+            while _rows(EventJob):
+                await asyncio.sleep(0.01)
+            return time.perf_counter() - start
+        finally:
+            await worker.stop()
+            await client.close()
+            await stub.server.close()
+
+    elapsed = asyncio.run(main())
+
+    assert stub.received == Counter({event["title"]: 1 for event in _events(IMPORT_MAX_EVENTS)})
+    assert len(stub.connections) <= worker.concurrency
+    created = [channel for channel in guild.channels.values() if channel is not base]
+    assert len(created) == IMPORT_MAX_EVENTS
+    assert all(channel.messages == [f"✅ **Raid-Helper Event erstellt:** {channel.name.rsplit('-', 3)[0]}"]
+               for channel in created)
+    # 20 Runden à 10 ms Klonen plus lokale Requests, weit unter einer Sekunde pro Event
+    assert elapsed < 10
@@ -0,0 +1,85 @@
+"""
+/group-event: Löschung und Outbox-Job werden nacheinander angelegt, ein Fehler hinterlässt
+weder Channel noch Job (user-010)
+"""
+import asyncio
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+import group_events
+from fakes import FakeBot, FakeChannel, FakeGuild, FakeInteraction
+from group_events import GroupEvents
+from services import outbox, scheduler as scheduler_module
+from services.database import SessionLocal
+from services.models import EventJob, ScheduledDeletion
+from services.outbox import EventOutboxWorker
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    """Nicht gestarteter Outbox-Worker: eingereihte Jobs bleiben in seiner Queue."""
+    fresh = EventOutboxWorker()
+    monkeypatch.setattr(group_events, "event_outbox", fresh)
+    return fresh
+
+
+@pytest.fixture
+def setup(db, scheduler, worker, secrets_path, monkeypatch):
+    monkeypatch.setattr(group_events, "secrets_path", secrets_path)
+    guild = FakeGuild(7)
+    base = FakeChannel(guild, "raid")
+    return guild, base, GroupEvents(FakeBot([guild]))
+
+
+def _rows(model) -> int:
+    session = SessionLocal()
+    try:
+        return session.query(model).count()
+    finally:
+        session.close()
+
+
+def _fail(*args, **kwargs):
+    raise OperationalError("INSERT", {}, Exception("database is locked"))
+
+
+def _group_event(cog, interaction):
+    asyncio.run(GroupEvents.group_event.callback(cog, interaction, "01.01.2031", "20:00", "Raid", "desc"))
+
+
+def test_group_event_persists_deletion_and_job(setup, scheduler, worker):
+    guild, base, cog = setup
+    interaction = FakeInteraction(base)
+
+    _group_event(cog, interaction)
+
+    assert len(guild.channels) == 2
+    assert _rows(ScheduledDeletion) == 1 and len(scheduler) == 1
+    assert _rows(EventJob) == 1 and worker._queue.qsize() == 1
+    assert interaction.followup.messages[0].startswith("✅ **Gruppen-Event angelegt!**")
+
+
+def test_failed_deletion_leaves_no_job(setup, scheduler, worker, monkeypatch):
+    guild, base, cog = setup
+    monkeypatch.setattr(scheduler_module, "_insert_deletion", _fail)
+    interaction = FakeInteraction(base)
+
+    _group_event(cog, interaction)
+
+    # Der Job wird erst nach der Löschung angelegt: nichts postet in den entfernten Channel
+    assert _rows(EventJob) == 0 and worker._queue.qsize() == 0
+    assert list(guild.channels) == [base.id]
+    assert len(scheduler) == 0
+    assert interaction.followup.messages == ["❌ Es ist ein Fehler aufgetreten beim Ausführen des Befehls."]
+
+
+def test_failed_enqueue_rolls_back_deletion_and_channel(setup, scheduler, worker, monkeypatch):
+    guild, base, cog = setup
+    monkeypatch.setattr(outbox, "_insert_job", _fail)
+
+    _group_event(cog, FakeInteraction(base))
+
+    assert _rows(EventJob) == 0 and worker._queue.qsize() == 0
+    assert _rows(ScheduledDeletion) == 0 and len(scheduler) == 0
+    assert list(guild.channels) == [base.id]
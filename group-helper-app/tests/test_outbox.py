@@ -0,0 +1,142 @@
+"""
+Event-Outbox gegen eine lokale Stub-API: Abbruch mitten in der Queue, Wiederholung nicht
+gesendeter Requests und Exactly-once-Zustellung (user-009)
+"""
+import asyncio
+from collections import Counter
+
+import pytest
+
+from fakes import FakeBot, FakeChannel, FakeGuild, StubbedClient, StubRaidHelper
+from services import outbox, raid_helper
+from services.database import SessionLocal
+from services.models import EventJob
+from services.outbox import EventOutboxWorker
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(outbox, "OUTBOX_RETRY_SECONDS", 0.01)
+    monkeypatch.setattr(outbox, "OUTBOX_RETRY_MAX_SECONDS", 0.05)
+
+
+async def _wait_for(predicate, timeout: float = 10):
+    async def poll():
+        while not predicate():
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout)
+
+
+def _jobs() -> dict[str, str]:
+    session = SessionLocal()
+    try:
+        return {job.title: job.status for job in session.query(EventJob).all()}
+    finally:
+        session.close()
+
+
+async def _enqueue(worker, channels):
+    for title, channel in channels.items():
+        await worker.enqueue(channel.id, channel.guild.id, "1", "2030-01-01", "20:00", title, "desc", 2)
+
+
+def _run(stub, scenario, monkeypatch):
+    async def main():
+        base_url = await stub.start()
+        client = StubbedClient(base_url)
+        monkeypatch.setattr(raid_helper, "raid_helper_client", client)
+        try:
+            await scenario()
+        finally:
+            await client.close()
+            await stub.server.close()
+    asyncio.run(main())
+
+
+def test_kill_mid_queue_delivers_every_event_at_most_once(db, secrets_path, monkeypatch):
+    guild = FakeGuild(7)
+    channels = {title: FakeChannel(guild, title) for title in "ABCDE"}
+    bot = FakeBot([guild])
+    stub = StubRaidHelper()
+    stub.behaviour["C"] = ["block"]
+
+    async def scenario():
+        first = EventOutboxWorker(concurrency=1)
+        await first.start(bot, secrets_path)
+        await _enqueue(first, channels)
+        await _wait_for(stub.blocked.is_set)
+        # "Kill": C ist mitten im Request, D und E warten noch in der Queue
+        await first.stop()
+        assert _jobs() == {"C": "processing", "D": "pending", "E": "pending"}
+
+        second = EventOutboxWorker(concurrency=1)
+        await second.start(bot, secrets_path)
+        await _wait_for(lambda: _jobs() == {"C": "failed"})
+        await second.stop()
+
+    _run(stub, scenario, monkeypatch)
+
+    # Kein Event doppelt: C wird nach dem Neustart nicht erneut gesendet, sondern gemeldet
+    assert stub.received == Counter({"A": 1, "B": 1, "C": 1, "D": 1, "E": 1})
+    for title in "ABDE":
+        assert channels[title].messages == [f"✅ **Raid-Helper Event erstellt:** {title}"]
+    assert len(channels["C"].messages) == 1 and "unterbrochen" in channels["C"].messages[0]
+
+
+def test_unsent_request_is_retried_and_delivered_once(db, secrets_path, monkeypatch):
+    guild = FakeGuild(7)
+    channels = {"R": FakeChannel(guild, "R")}
+    stub = StubRaidHelper()
+    stub.behaviour["R"] = [429, 503]
+
+    async def scenario():
+        worker = EventOutboxWorker(concurrency=1)
+        await worker.start(FakeBot([guild]), secrets_path)
+        await _enqueue(worker, channels)
+        await _wait_for(lambda: not _jobs())
+        await worker.stop()
+
+    _run(stub, scenario, monkeypatch)
+
+    assert stub.received["R"] == 3
+    # Keine Fehlermeldung an den Leader für die nicht verarbeiteten Versuche
+    assert channels["R"].messages == ["✅ **Raid-Helper Event erstellt:** R"]
+
+
+def test_unsent_request_gives_up_after_max_attempts(db, secrets_path, monkeypatch):
+    monkeypatch.setattr(outbox, "OUTBOX_MAX_ATTEMPTS", 3)
+    guild = FakeGuild(7)
+    channels = {"S": FakeChannel(guild, "S")}
+    stub = StubRaidHelper()
+    stub.behaviour["S"] = [503] * 10
+
+    async def scenario():
+        worker = EventOutboxWorker(concurrency=1)
+        await worker.start(FakeBot([guild]), secrets_path)
+        await _enqueue(worker, channels)
+        await _wait_for(lambda: _jobs() == {"S": "failed"})
+        await worker.stop()
+
+    _run(stub, scenario, monkeypatch)
+
+    assert stub.received["S"] == 3
+    assert len(channels["S"].messages) == 1 and "fehlgeschlagen" in channels["S"].messages[0]
+
+
+def test_rejected_request_fails_without_retry(db, secrets_path, monkeypatch):
+    guild = FakeGuild(7)
+    channels = {"X": FakeChannel(guild, "X")}
+    stub = StubRaidHelper()
+    stub.behaviour["X"] = [400]
+
+    async def scenario():
+        worker = EventOutboxWorker(concurrency=1)
+        await worker.start(FakeBot([guild]), secrets_path)
+        await _enqueue(worker, channels)
+        await _wait_for(lambda: _jobs() == {"X": "failed"})
+        await worker.stop()
+
+    _run(stub, scenario, monkeypatch)
+
+    assert stub.received["X"] == 1
+    assert len(channels["X"].messages) == 1 and "fehlgeschlagen" in channels["X"].messages[0]
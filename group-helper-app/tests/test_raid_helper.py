@@ -0,0 +1,181 @@
+"""
+Raid Helper Client gegen eine lokale Stub-API: Wiederverwendung der Verbindung (user-007),
+Retry-After und Circuit Breaker (user-008)
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from config import RAID_HELPER_BREAKER_THRESHOLD
+from fakes import FakeChannel, FakeGuild, StubbedClient, StubRaidHelper
+from services import raid_helper
+from services.raid_helper import EventNotSent, RaidHelperRetryableError
+
+CALLS = 200
+
+
+async def _create_events(channel, secrets_path, count: int):
+    for n in range(count):
+        response = await raid_helper.create_event(channel, "1", "2030-01-01", "20:00", f"E{n}", "desc", 2,
+                                                  secrets_path=secrets_path)
+        assert response is not None and response.status == 200
+
+
+def test_sequential_events_share_one_connection(secrets_path, monkeypatch):
+    channel = FakeChannel(FakeGuild(7))
+    shared, per_call = StubRaidHelper(), StubRaidHelper()
+
+    async def main():
+        # Geteilte Session: alle Requests laufen per Keep-Alive über dieselbe TCP-Verbindung
+        client = StubbedClient(await shared.start())
+        monkeypatch.setattr(raid_helper, "raid_helper_client", client)
+        try:
+            await _create_events(channel, secrets_path, CALLS)
+        finally:
+            await client.close()
+            await shared.server.close()
+
+        # Vergleich: eine neue Session pro Request, wie vor der geteilten Session
+        base_url = await per_call.start()
+        try:
+            for n in range(CALLS):
+                client = StubbedClient(base_url)
+                monkeypatch.setattr(raid_helper, "raid_helper_client", client)
+                try:
+                    await _create_events(channel, secrets_path, 1)
+                finally:
+                    await client.close()
+        finally:
+            await per_call.server.close()
+
+    asyncio.run(main())
+
+    assert sum(shared.received.values()) == CALLS
+    assert len(shared.connections) == 1
+    assert len(per_call.connections) == CALLS
+
+
+def _run(stub, monkeypatch, scenario, **client_kwargs) -> StubbedClient:
+    async def main():
+        client = StubbedClient(await stub.start(), **client_kwargs)
+        monkeypatch.setattr(raid_helper, "raid_helper_client", client)
+        try:
+            await scenario(client)
+        finally:
+            await client.close()
+            await stub.server.close()
+    asyncio.run(main())
+
+
+async def _create(channel, secrets_path, title: str):
+    return await raid_helper.create_event(channel, "1", "2030-01-01", "20:00", title, "desc", 2,
+                                          secrets_path=secrets_path)
+
+
+def test_short_retry_after_is_waited_and_retried(secrets_path, monkeypatch):
+    channel = FakeChannel(FakeGuild(7))
+    stub = StubRaidHelper()
+    stub.behaviour["R"] = [(429, {"Retry-After": "0.2"}), (503, {"Retry-After": "0.1"})]
+
+    async def scenario(client):
+        start = time.perf_counter()
+        response = await _create(channel, secrets_path, "R")
+        assert response.status == 200
+        # Retry-After wird nie unterschritten
+        assert time.perf_counter() - start >= 0.3
+
+    _run(stub, monkeypatch, scenario, max_retries=3)
+
+    assert stub.received["R"] == 3
+
+
+def test_long_retry_after_is_returned_without_sleeping(secrets_path, monkeypatch):
+    channel = FakeChannel(FakeGuild(7))
+    stub = StubRaidHelper()
+    stub.behaviour["L"] = [(429, {"Retry-After": "3600"})]
+
+    async def scenario(client):
+        start = time.perf_counter()
+        result = await _create(channel, secrets_path, "L")
+        assert time.perf_counter() - start < 1
+        assert isinstance(result, EventNotSent) and result.retry_after == 3600
+
+        # Direkt am Client: RaidHelperRetryableError statt Warten
+        stub.behaviour["L"] = [(503, {"Retry-After": "3600"})]
+        with pytest.raises(RaidHelperRetryableError):
+            await client.post(f"{client.base_url}/api/v4/servers/7/channels/1/event", json={"title": "L"})
+
+    _run(stub, monkeypatch, scenario, max_retries=3)
+
+    assert stub.received["L"] == 2
+
+
+def test_retry_after_as_http_date(secrets_path, monkeypatch):
+    channel = FakeChannel(FakeGuild(7))
+    stub = StubRaidHelper()
+    retry_at = datetime.now(timezone.utc) + timedelta(hours=1)
+    # Ein Datum in der Vergangenheit bedeutet: sofort erneut versuchen
+    stub.behaviour["D"] = [(429, {"Retry-After": "Wed, 01 Jan 2020 00:00:00 GMT"}),
+                           (429, {"Retry-After": format_datetime(retry_at, usegmt=True)})]
+
+    async def scenario(client):
+        result = await _create(channel, secrets_path, "D")
+        assert isinstance(result, EventNotSent)
+        assert 3590 <= result.retry_after <= 3600
+
+    _run(stub, monkeypatch, scenario, max_retries=3)
+
+    assert stub.received["D"] == 2
+
+
+def test_breaker_opens_after_threshold_and_fails_fast(secrets_path, monkeypatch):
+    channel = FakeChannel(FakeGuild(7))
+    stub = StubRaidHelper()
+    stub.behaviour["F"] = [500] * RAID_HELPER_BREAKER_THRESHOLD
+
+    async def scenario(client):
+        for _ in range(RAID_HELPER_BREAKER_THRESHOLD):
+            assert await _create(channel, secrets_path, "F") is None
+        assert client.breaker.is_open
+
+        # Offener Breaker: kein Request mehr an die API, sofort EventNotSent
+        start = time.perf_counter()
+        results = [await _create(channel, secrets_path, "F") for _ in range(10)]
+        assert time.perf_counter() - start < 1
+        assert all(isinstance(result, EventNotSent) for result in results)
+
+    _run(stub, monkeypatch, scenario)
+
+    assert stub.received["F"] == RAID_HELPER_BREAKER_THRESHOLD
+
+
+def test_half_open_probe_closes_breaker(secrets_path, monkeypatch):
+    channel = FakeChannel(FakeGuild(7))
+    stub = StubRaidHelper()
+    stub.behaviour["H"] = [500] * (RAID_HELPER_BREAKER_THRESHOLD + 1)
+
+    async def scenario(client):
+        client.breaker.cooldown_seconds = 0.1
+        for _ in range(RAID_HELPER_BREAKER_THRESHOLD):
+            await _create(channel, secrets_path, "H")
+        assert isinstance(await _create(channel, secrets_path, "H"), EventNotSent)
+
+        # Fehlgeschlagener Test-Request: Breaker bleibt für einen weiteren Cooldown offen
+        await asyncio.sleep(0.15)
+        assert await _create(channel, secrets_path, "H") is None
+        assert client.breaker.is_open
+        assert isinstance(await _create(channel, secrets_path, "H"), EventNotSent)
+
+        # Erfolgreicher Test-Request schließt den Breaker
+        await asyncio.sleep(0.15)
+        response = await _create(channel, secrets_path, "H")
+        assert response.status == 200
+        assert not client.breaker.is_open
+        assert (await _create(channel, secrets_path, "H")).status == 200
+
+    _run(stub, monkeypatch, scenario)
+
+    assert stub.received["H"] == RAID_HELPER_BREAKER_THRESHOLD + 3
@@ -0,0 +1,83 @@
+"""
+Lösch-Loop: abgearbeitete Löschungen werden pro Tick in einer Transaktion entfernt (user-003)
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from fakes import FakeBot, FakeChannel, FakeGuild
+from group_events import GroupEvents
+from services.models import ScheduledDeletion
+from services.database import SessionLocal
+from services.scheduler import schedule_deletions
+
+
+def _schedule_due(channels):
+    past = datetime.now() - timedelta(minutes=1)
+    asyncio.run(schedule_deletions([
+        (channel.id, 1, past, past, channel.name, channel.guild.id) for channel in channels
+    ]))
+
+
+def _remaining_rows() -> set[int]:
+    session = SessionLocal()
+    try:
+        return {channel_id for channel_id, in session.query(ScheduledDeletion.new_channel_id).all()}
+    finally:
+        session.close()
+
+
+def _tick(guild):
+    cog = GroupEvents(FakeBot([guild]))
+    asyncio.run(cog.check_scheduled_deletions.coro(cog))
+
+
+@pytest.mark.parametrize("count", [1, 20, 1200])
+def test_one_commit_per_tick_regardless_of_batch_size(commits, scheduler, count):
+    guild = FakeGuild(1)
+    channels = [FakeChannel(guild) for _ in range(count)]
+    _schedule_due(channels)
+
+    commits.clear()
+    _tick(guild)
+
+    assert len(commits) == 1
+    assert all(channel.deletions == 1 for channel in channels)
+    assert _remaining_rows() == set()
+    assert len(scheduler) == 0
+
+
+def test_failed_and_missing_channels_share_the_tick_commit(commits, scheduler):
+    guild = FakeGuild(1)
+    deleted = [FakeChannel(guild) for _ in range(5)]
+    failing = FakeChannel(guild, fail_delete=True)
+    missing = FakeChannel(guild)
+    _schedule_due(deleted + [failing, missing])
+    del guild.channels[missing.id]
+
+    commits.clear()
+    _tick(guild)
+
+    assert len(commits) == 1
+    # Fehlgeschlagene Löschung bleibt gespeichert und wird später erneut versucht
+    assert _remaining_rows() == {failing.id}
+    assert scheduler.next_deadline() > datetime.now()
+    assert len(scheduler) == 1
+
+
+def test_due_pages_cover_rows_with_equal_deadlines_once(db):
+    # Keyset-Pagination über Seitengrenzen hinweg, auch wenn viele Zeilen dieselbe delete_time haben (user-002)
+    from services.scheduler import iter_due_deletions
+    past = datetime.now() - timedelta(minutes=1)
+    deadlines = [past - timedelta(minutes=i % 3) for i in range(25)]
+    asyncio.run(schedule_deletions([
+        (channel_id, 1, deadline, deadline, None, 1) for channel_id, deadline in enumerate(deadlines, start=1)
+    ]))
+
+    async def collect():
+        return [row async for row in iter_due_deletions(until=datetime.now(), page_size=4)]
+
+    rows = asyncio.run(collect())
+    assert sorted(channel_id for channel_id, _ in rows) == list(range(1, 26))
+    assert rows == sorted(rows, key=lambda row: (row[1], row[0]))
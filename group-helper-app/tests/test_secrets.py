@@ -0,0 +1,78 @@
+"""
+Secrets-Store: Hot-Rotation ohne Neustart und kein Datei-I/O im Normalbetrieb (user-006)
+"""
+import builtins
+import json
+import os
+
+import pytest
+
+from utils import secrets
+from utils.secrets import SecretsStore, get_raid_helper_api_key
+
+
+def _write_secrets(path, api_key: str, mtime_ns: int):
+    path.write_text(json.dumps({
+        "RAID-HELPER": [{"ServerID": "42", "ApiKey": api_key}],
+        "DISCORD": [{"AppName": "bot", "DiscordToken": "token"}],
+    }), encoding="utf-8")
+    # Explizite mtime, damit die Änderung unabhängig von der Auflösung des Dateisystems erkannt wird
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def secrets_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(secrets, "_stores", {})
+    path = tmp_path / "secrets.json"
+    _write_secrets(path, "key-1", 1_000_000_000_000_000_000)
+    return path
+
+
+def test_rotated_key_is_picked_up_via_mtime(secrets_file):
+    store = SecretsStore(str(secrets_file), check_interval=0)
+    assert store.get_raid_helper_api_key("42") == "key-1"
+
+    _write_secrets(secrets_file, "key-2", 1_000_000_001_000_000_000)
+
+    assert store.get_raid_helper_api_key("42") == "key-2"
+    assert store.reload_count == 2
+
+
+def test_rotated_key_is_picked_up_on_reload_signal(secrets_file):
+    path = str(secrets_file)
+    assert get_raid_helper_api_key("42", path) == "key-1"
+
+    # Gleiche mtime: nur der Reload (SIGHUP) macht die Rotation sichtbar
+    _write_secrets(secrets_file, "key-2", 1_000_000_000_000_000_000)
+    secrets.reload_secrets()
+
+    assert get_raid_helper_api_key("42", path) == "key-2"
+
+
+def test_steady_state_lookups_do_no_file_io(secrets_file, monkeypatch):
+    path = str(secrets_file)
+    assert get_raid_helper_api_key("42", path) == "key-1"
+    store = secrets.get_secrets_store(path)
+    reloads = store.reload_count
+
+    reads = []
+    real_open = builtins.open
+    monkeypatch.setattr(builtins, "open", lambda *args, **kwargs: reads.append(args) or real_open(*args, **kwargs))
+    monkeypatch.setattr(type(secrets_file), "stat", lambda *args, **kwargs: reads.append(args) or os.stat(path))
+
+    for _ in range(1000):
+        assert get_raid_helper_api_key("42", path) == "key-1"
+        assert secrets.get_discord_token("bot", path) == "token"
+
+    assert reads == []
+    assert store.reload_count == reloads
+
+
+def test_broken_file_keeps_last_good_keys(secrets_file):
+    store = SecretsStore(str(secrets_file), check_interval=0)
+    assert store.get_raid_helper_api_key("42") == "key-1"
+
+    secrets_file.write_text("{kaputt", encoding="utf-8")
+    os.utime(secrets_file, ns=(1_000_000_002_000_000_000,) * 2)
+
+    assert store.get_raid_helper_api_key("42") == "key-1"
@@ -0,0 +1,175 @@
+"""
+Event-Serien mit simulierter Uhr: ein Jahr wöchentlicher Termine (user-023)
+"""
+import asyncio
+import math
+from datetime import datetime, timedelta
+
+import pytest
+
+from config import DELETE_DELAY_HOURS, SERIES_LEAD_HOURS
+from fakes import FakeBot, FakeChannel, FakeGuild
+from services import scheduler as scheduler_module, series as series_module
+from services.database import SessionLocal
+from services.models import EventSeries, ScheduledDeletion
+from services.scheduler import remove_deletions
+from services.series import create_series, materialise_due_series
+
+START = datetime(2031, 1, 1)
+FIRST = datetime(2031, 1, 6, 20, 0)
+
+
+class FakeOutbox:
+    """Nimmt die Raid Helper Jobs der Serie entgegen und merkt sich, wann sie angelegt wurden."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.created = []
+
+    async def enqueue(self, **job):
+        self.created.append((datetime.strptime(f"{job['date']} {job['time']}", "%Y-%m-%d %H:%M"), self.clock[0]))
+        return len(self.created)
+
+
+class FlakyChannel(FakeChannel):
+    """Basis-Channel, dessen Klonen für bestimmte Termine einmal fehlschlägt."""
+
+    def __init__(self, guild, fail_once_for=()):
+        super().__init__(guild, "raid")
+        self.fail_once_for = set(fail_once_for)
+
+    async def clone(self, name, reason=None):
+        for occurrence in list(self.fail_once_for):
+            if name.endswith(occurrence.strftime('%d-%m-%Y')):
+                self.fail_once_for.discard(occurrence)
+                raise RuntimeError("Discord nicht erreichbar")
+        return await super().clone(name, reason)
+
+
+@pytest.fixture
+def clock():
+    return [START]
+
+
+@pytest.fixture
+def fake_outbox(clock, monkeypatch):
+    fake = FakeOutbox(clock)
+    monkeypatch.setattr(series_module, "event_outbox", fake)
+    return fake
+
+
+def _count(model) -> int:
+    session = SessionLocal()
+    try:
+        return session.query(model).count()
+    finally:
+        session.close()
+
+
+def _next_occurrence(series_id):
+    session = SessionLocal()
+    try:
+        return session.get(EventSeries, series_id).next_occurrence
+    finally:
+        session.close()
+
+
+def _simulate(bot, guild, base, clock, scheduler, hours, until=None, step=timedelta(hours=1)):
+    """Lässt die simulierte Uhr laufen: Serien-Job und Lösch-Loop wie im Bot, aber ohne echtes Warten."""
+    stats = {"max_live_channels": 0, "max_deletion_rows": 0}
+
+    async def run():
+        series_id = await create_series(guild.id, base.id, "1", "Raid", "Wöchentlich", 2, FIRST, 7, until)
+        end = clock[0] + timedelta(hours=hours)
+        while clock[0] <= end:
+            await materialise_due_series(bot, clock[0])
+            due = scheduler.pop_due(clock[0])
+            for channel_id in due:
+                await guild.channels[channel_id].delete()
+            await remove_deletions(due)
+            stats["max_live_channels"] = max(stats["max_live_channels"], len(guild.channels) - 1)
+            stats["max_deletion_rows"] = max(stats["max_deletion_rows"], _count(ScheduledDeletion))
+            clock[0] += step
+        return series_id
+
+    return asyncio.run(run()), stats
+
+
+def test_weekly_series_for_a_year(db, scheduler, clock, fake_outbox):
+    guild = FakeGuild(1)
+    base = FakeChannel(guild, "raid")
+    series_id, stats = _simulate(FakeBot([guild]), guild, base, clock, scheduler, hours=365 * 24)
+
+    occurrences = [occurrence for occurrence, _ in fake_outbox.created]
+    last_tick = START + timedelta(days=365)
+    expected = []
+    occurrence = FIRST
+    while occurrence <= last_tick + timedelta(hours=SERIES_LEAD_HOURS):
+        expected.append(occurrence)
+        occurrence += timedelta(days=7)
+    assert occurrences == expected
+
+    # Jeder Termin wird erst im Vorlauf angelegt, beim ersten Tick nach Beginn des Fensters
+    for occurrence, created_at in fake_outbox.created:
+        assert timedelta(hours=SERIES_LEAD_HOURS - 1) < occurrence - created_at <= timedelta(hours=SERIES_LEAD_HOURS)
+
+    # Channels und Lösch-Zeilen bleiben begrenzt, egal wie lange die Serie läuft
+    bound = math.ceil((SERIES_LEAD_HOURS + DELETE_DELAY_HOURS) / (7 * 24))
+    assert stats["max_live_channels"] == bound
+    assert stats["max_deletion_rows"] == bound
+    assert _next_occurrence(series_id) == expected[-1] + timedelta(days=7)
+
+
+def test_finite_series_ends_after_the_last_occurrence(db, scheduler, clock, fake_outbox):
+    guild = FakeGuild(1)
+    base = FakeChannel(guild, "raid")
+    until = FIRST + timedelta(days=7 * 3)
+    series_id, _ = _simulate(FakeBot([guild]), guild, base, clock, scheduler, hours=60 * 24, until=until)
+
+    assert [occurrence for occurrence, _ in fake_outbox.created] == [FIRST + timedelta(days=7 * k) for k in range(4)]
+    assert _next_occurrence(series_id) is None
+
+
+def test_failed_occurrences_are_retried_including_the_last(db, scheduler, clock, fake_outbox):
+    guild = FakeGuild(1)
+    until = FIRST + timedelta(days=7 * 3)
+    base = FlakyChannel(guild, fail_once_for=[FIRST + timedelta(days=7), until])
+    series_id, _ = _simulate(FakeBot([guild]), guild, base, clock, scheduler, hours=60 * 24, until=until)
+
+    assert [occurrence for occurrence, _ in fake_outbox.created] == [FIRST + timedelta(days=7 * k) for k in range(4)]
+    assert not base.fail_once_for
+    assert _next_occurrence(series_id) is None
+
+
+def test_missed_occurrences_are_skipped_not_backfilled(db, scheduler, clock, fake_outbox):
+    guild = FakeGuild(1)
+    base = FakeChannel(guild, "raid")
+    # Bot war offline: die Uhr springt in einem Schritt über drei Termine hinweg
+    clock[0] = START + timedelta(days=20)
+    _simulate(FakeBot([guild]), guild, base, clock, scheduler, hours=0, step=timedelta(days=30))
+
+    assert fake_outbox.created == []
+    assert _next_occurrence(1) == FIRST + timedelta(days=21)
+
+
+def test_failed_deletion_leaves_no_job_and_is_retried(db, scheduler, clock, fake_outbox, monkeypatch):
+    guild = FakeGuild(1)
+    base = FakeChannel(guild, "raid")
+    insert_deletion = scheduler_module._insert_deletion
+    failures = []
+
+    def fail_once(*args):
+        if not failures:
+            failures.append(args)
+            raise RuntimeError("database is locked")
+        return insert_deletion(*args)
+
+    monkeypatch.setattr(scheduler_module, "_insert_deletion", fail_once)
+    clock[0] = FIRST - timedelta(hours=SERIES_LEAD_HOURS)
+    _simulate(FakeBot([guild]), guild, base, clock, scheduler, hours=1)
+
+    # Erster Versuch: Channel zurückgerollt, kein Job; der zweite Tick legt den Termin einmal an
+    assert len(failures) == 1
+    assert [occurrence for occurrence, _ in fake_outbox.created] == [FIRST]
+    assert len(guild.channels) == 2
+    assert _count(ScheduledDeletion) == 1
@@ -0,0 +1,130 @@
+"""
+Multi-Prozess-Betrieb: mehrere Worker mit je eigenen Shards bearbeiten jede Löschung und jeden
+Outbox-Job genau einmal (user-018)
+"""
+import asyncio
+import multiprocessing
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+import group_events
+import shard_worker
+from fakes import FakeBot, FakeChannel, FakeGuild, guild_id_for_shard
+from group_events import GroupEvents
+from services import scheduler as scheduler_module
+from services.database import run_db
+from services.outbox import _insert_jobs, _select_pending_job_ids
+from services.scheduler import DeletionScheduler, schedule_deletions
+from utils.sharding import split_shards
+
+SHARD_COUNT = 4
+SHARD_PROCESSES = 2
+
+
+def _workers(guilds):
+    """Ein GroupEvents-Cog pro Worker-Prozess, Shards reihum verteilt wie im Launcher."""
+    return [
+        GroupEvents(FakeBot(guilds, shard_count=SHARD_COUNT, shard_ids=shard_ids))
+        for shard_ids in split_shards(SHARD_COUNT, SHARD_PROCESSES)
+    ]
+
+
+def _guilds():
+    return [FakeGuild(guild_id_for_shard(shard, SHARD_COUNT, n)) for shard in range(SHARD_COUNT) for n in range(3)]
+
+
+def test_split_shards_covers_every_shard_once():
+    assert split_shards(4, 2) == [[0, 2], [1, 3]]
+    assert split_shards(5, 3) == [[0, 3], [1, 4], [2]]
+    assert sorted(shard for shards in split_shards(16, 3) for shard in shards) == list(range(16))
+
+
+def test_shard_filter_matches_the_launcher_split():
+    workers = _workers([])
+    assert [worker.shard_filter() for worker in workers] == [(4, [0, 2]), (4, [1, 3])]
+    assert GroupEvents(FakeBot([], shard_count=4, shard_ids=[0, 1, 2, 3])).shard_filter() is None
+    assert GroupEvents(FakeBot([])).shard_filter() is None
+
+
+def test_no_deletion_is_processed_twice(db, monkeypatch):
+    guilds = _guilds()
+    channels = [FakeChannel(guild) for guild in guilds for _ in range(5)]
+    past = datetime.now() - timedelta(minutes=1)
+    # Jeder Worker sieht alle Channels: nur der Shard-Filter verhindert doppelte Löschungen
+    workers = _workers(guilds)
+
+    async def run():
+        await schedule_deletions([(channel.id, 1, past, past, channel.name, channel.guild.id)
+                                  for channel in channels])
+        # Alle Worker laden ihre Löschungen, bevor der erste löscht (gleichzeitiger Start)
+        schedulers = []
+        for worker in workers:
+            worker_scheduler = DeletionScheduler()
+            await worker_scheduler.rebuild(worker.shard_filter())
+            schedulers.append(worker_scheduler)
+
+        for worker, worker_scheduler in zip(workers, schedulers):
+            monkeypatch.setattr(scheduler_module, "deletion_scheduler", worker_scheduler)
+            monkeypatch.setattr(group_events, "deletion_scheduler", worker_scheduler)
+            await worker.check_scheduled_deletions.coro(worker)
+        return schedulers
+
+    schedulers = asyncio.run(run())
+
+    assert Counter(channel.deletions for channel in channels) == Counter({1: len(channels)})
+    assert all(len(worker_scheduler) == 0 for worker_scheduler in schedulers)
+
+
+def test_worker_processes_share_one_database(db):
+    """Echte Worker-Prozesse (spawn wie im Launcher) auf derselben SQLite-Datei."""
+    guilds = _guilds()
+    channels = [FakeChannel(guild) for guild in guilds for _ in range(5)]
+    past = datetime.now() - timedelta(minutes=1)
+    asyncio.run(schedule_deletions([(channel.id, 1, past, past, channel.name, channel.guild.id)
+                                    for channel in channels]))
+    # Erst nach dem Commit starten: die Worker sollen die Tabelle mit allen Löschungen vorfinden
+    db.dispose()
+
+    spawn = multiprocessing.get_context("spawn")
+    barrier = spawn.Barrier(SHARD_PROCESSES)
+    results = spawn.Queue()
+    processes = [
+        spawn.Process(target=shard_worker.run_worker,
+                      args=(i, SHARD_COUNT, shard_ids, [(channel.guild.id, channel.id) for channel in channels],
+                            barrier, results),
+                      name=f"group-helper-shards-{i}")
+        for i, shard_ids in enumerate(split_shards(SHARD_COUNT, SHARD_PROCESSES))
+    ]
+    for process in processes:
+        process.start()
+    deleted_by = dict(results.get(timeout=60) for _ in processes)
+    for process in processes:
+        process.join(timeout=10)
+    assert all(process.exitcode == 0 for process in processes)
+
+    shard_of = {channel.id: (channel.guild.id >> 22) % SHARD_COUNT for channel in channels}
+    assert Counter(channel_id for deleted in deleted_by.values() for channel_id in deleted) == \
+        Counter({channel.id: 1 for channel in channels})
+    for process_index, shard_ids in enumerate(split_shards(SHARD_COUNT, SHARD_PROCESSES)):
+        assert deleted_by[process_index]
+        assert all(shard_of[channel_id] in shard_ids for channel_id in deleted_by[process_index])
+    with db.connect() as connection:
+        assert connection.execute(text("SELECT COUNT(*) FROM scheduled_deletions")).scalar() == 0
+
+
+def test_outbox_jobs_are_partitioned_by_shard(db):
+    guilds = _guilds()
+    jobs = [{"new_channel_id": FakeChannel(guild).id, "guild_id": guild.id, "user_id": "1", "date": "2030-01-01",
+             "time": "20:00", "title": f"Event {guild.id}", "desc": "", "template_id": 2} for guild in guilds]
+
+    async def run():
+        job_ids = await run_db(_insert_jobs, jobs)
+        picked = [await run_db(_select_pending_job_ids, worker.shard_filter()) for worker in _workers(guilds)]
+        return job_ids, picked
+
+    job_ids, picked = asyncio.run(run())
+
+    assert sorted(job_id for worker_jobs in picked for job_id in worker_jobs) == sorted(job_ids)
+    assert all(picked)
@@ -0,0 +1,76 @@
+"""
+Eingabe-Validierung: Datums- und Zeitformate, Ablehnung falscher Kalenderdaten und
+validate_many für Imports (user-021)
+"""
+from datetime import datetime
+
+import pytest
+
+from validators import validate_and_parse_date, validate_and_parse_time, validate_event, validate_many, validate_title
+
+
+@pytest.mark.parametrize("date_str", [
+    "2025-10-05", "2025-10-5", "2025/10/05", "05.10.2025", "5.10.2025", "05/10/2025", "05-10-2025", " 05.10.2025 ",
+])
+def test_accepted_date_formats(date_str):
+    assert validate_and_parse_date(date_str) == (datetime(2025, 10, 5), None)
+
+
+@pytest.mark.parametrize("date_str", [
+    # strptime hat Leerzeichen vor Tag und Monat toleriert
+    "2025/1/ 3", "2025- 1-03", " 3. 1.2025",
+    "31.02.2025", "29.02.2027", "2025-13-01", "00.01.2025", "2025-10-05/", "2025-10/05", "05.10.25", "morgen", "",
+])
+def test_rejected_dates(date_str):
+    parsed, error = validate_and_parse_date(date_str)
+    assert parsed is None and error
+
+
+def test_leap_day():
+    assert validate_and_parse_date("29.02.2028") == (datetime(2028, 2, 29), None)
+
+
+@pytest.mark.parametrize("time_str, expected", [
+    ("20:00", (20, 0)), ("8:30", (8, 30)), ("20.15", (20, 15)), ("2000", (20, 0)), ("830", (8, 30)), ("00:00", (0, 0)),
+])
+def test_accepted_times(time_str, expected):
+    assert validate_and_parse_time(time_str) == (expected, None)
+
+
+@pytest.mark.parametrize("time_str", ["24:00", "20:60", "20:0", "8 Uhr", "20:00:00", ""])
+def test_rejected_times(time_str):
+    parsed, error = validate_and_parse_time(time_str)
+    assert parsed is None and error
+
+
+@pytest.mark.parametrize("title", ["@everyone Raid", "Raid #2", "DISCORD Abend", "Raid: Heroisch"])
+def test_title_with_invalid_tokens(title):
+    assert validate_title(title)[0] is False
+
+
+def test_validate_event_collects_every_field_error():
+    event_datetime, errors = validate_event("31.02.2025", "25:00", "ab", "")
+    assert event_datetime is None
+    assert set(errors) == {"Datum", "Zeit", "Titel", "Beschreibung"}
+
+
+def test_validate_many_keeps_order_and_matches_validate_event():
+    specs = [
+        {"date": "2030-01-01", "time": "20:00", "title": "Raid", "desc": "Heroisch"},
+        {"date": "2025/1/ 3", "time": "20:00", "title": "Raid", "desc": "Heroisch"},
+        {"date": "01.02.2030", "time": "8.30", "title": "@here", "desc": "Heroisch"},
+        {"time": "20:00", "title": "Raid", "desc": "Heroisch"},
+    ]
+
+    results = validate_many(specs)
+
+    assert results == [validate_event(spec.get("date"), spec.get("time"), spec.get("title"), spec.get("desc"))
+                       for spec in specs]
+    assert results[0] == (datetime(2030, 1, 1, 20, 0), {})
+    assert results[1][0] is None and set(results[1][1]) == {"Datum"}
+    assert results[2][0] is None and set(results[2][1]) == {"Titel"}
+    assert results[3][0] is None and set(results[3][1]) == {"Datum"}
+
+
+def test_validate_many_of_nothing():
+    assert validate_many([]) == []
@@ -2,20 +2,116 @@
 Logging-Konfiguration für den Group Helper Bot
 """
 import os
+import json
+import queue
+import atexit
 import logging
-from logging.handlers import TimedRotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 
+from utils.metrics import LOG_QUEUE_DEPTH, LOG_RECORDS_DROPPED
 
-def setup_logging():
+# Maximale Anzahl gepufferter Log-Records, bevor verworfen wird
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+
+# Log-Format: "text" (Standard) oder "json" (eine JSON-Zeile pro Record)
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+
+# Standard-Attribute eines LogRecords; alles andere stammt aus `extra` und landet als Feld im JSON
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listener: QueueListener | None = None
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler, der nie blockiert: Ist die Queue voll, werden Records unterhalb von ERROR verworfen
+    und gezählt. Errors verdrängen stattdessen den ältesten Record.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if record.levelno < logging.ERROR:
+                self._drop()
+                return
+            try:
+                self.queue.get_nowait()
+                self._drop()
+            except queue.Empty:
+                pass
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                self._drop()
+
+    def _drop(self):
+        self.dropped += 1
+        LOG_RECORDS_DROPPED.inc()
+
+    def prepare(self, record):
+        prepared = super().prepare(record)
+        if record.exc_text:
+            # prepare() hängt den Traceback an die Nachricht und verwirft exc_info; als exc_text
+            # getrennt halten, damit der JsonFormatter ihn ins Feld "exception" schreibt
+            prepared.msg = prepared.message = record.getMessage()
+            prepared.exc_text = record.exc_text
+        record = prepared
+        # Verworfene Records beim nächsten erfolgreichen Record melden
+        if self.dropped and not self.queue.full():
+            dropped, self.dropped = self.dropped, 0
+            record.msg = f"{record.msg} [{dropped} Log-Records verworfen, Queue voll]"
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formatiert Records als JSON-Zeile. Felder aus `extra` (z.B. duration_ms, outcome) werden übernommen.
+    """
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "file": f"{record.filename}:{record.lineno}",
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def setup_logging(process_name: str | None = None):
     """
     Konfiguriert das Logging-System mit separaten Dateien für Info und Errors.
+
+    Die Handler laufen in einem eigenen Thread hinter einer begrenzten Queue, damit Datei- und
+    Konsolen-Schreibzugriffe den Event Loop nicht blockieren.
+
+    Args:
+        process_name: Name eines Worker-Prozesses; er schreibt dann in eigene Dateien
+            (logs/bot-<name>.log), denn mehrere Prozesse dürfen nicht dieselbe Datei rotieren
     """
+    global _listener
+    if _listener is not None:
+        return
+
     # Logs-Verzeichnis erstellen
     os.makedirs('logs', exist_ok=True)
+    suffix = f"-{process_name}" if process_name else ""
 
     # Info-Level Logs (alle Logs)
     info_handler = TimedRotatingFileHandler(
-        filename='logs/bot.log',
+        filename=f'logs/bot{suffix}.log',
         when='midnight',
         interval=1,
         backupCount=30,
@@ -25,7 +121,7 @@ def setup_logging():
 
     # Error-Level Logs (nur Errors, separate Datei für schnelleres Debugging)
     error_handler = TimedRotatingFileHandler(
-        filename='logs/errors.log',
+        filename=f'logs/errors{suffix}.log',
         when='midnight',
         interval=1,
         backupCount=30,
@@ -38,16 +134,40 @@ def setup_logging():
     console_handler.setLevel(logging.INFO)
 
     # Formatter mit Dateinamen und Zeilennummer
-    formatter = logging.Formatter('%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s')
+    if LOG_FORMAT == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s')
     info_handler.setFormatter(formatter)
     error_handler.setFormatter(formatter)
     console_handler.setFormatter(formatter)
 
+    # Handler im Listener-Thread, Root-Logger schreibt nur in die Queue
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    _listener = QueueListener(log_queue, info_handler, error_handler, console_handler,
+                              respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    LOG_QUEUE_DEPTH.set_function(log_queue.qsize)
+
+    # Der QueueHandler löst nur die Nachricht auf, formatiert wird im Listener-Thread
+    queue_handler = DroppingQueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+
     # Logger konfigurieren
     logging.basicConfig(
         level=logging.INFO,
-        handlers=[info_handler, error_handler, console_handler]
+        handlers=[queue_handler]
     )
 
     logging.info("Logging-System initialisiert")
 
+
+def stop_logging():
+    """
+    Stoppt den Listener-Thread und schreibt alle noch gepufferten Records.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
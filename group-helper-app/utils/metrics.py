@@ -0,0 +1,210 @@
+"""
+Prozessinterne Metriken (Counter, Histogramme, Gauges) für den Group Helper Bot
+
+Die Werte werden im Speicher gehalten und über einen lokalen HTTP-Endpunkt
+`/metrics` im Prometheus-Textformat ausgeliefert. aiohttp.web wird erst beim
+Start des Endpunkts importiert, damit das Logging-Setup schnell bleibt.
+"""
+import bisect
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+# Standard-Buckets für Latenzen (Sekunden)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# Buckets für die Verspätung von Channel-Löschungen (Sekunden)
+LATENESS_BUCKETS = (0.1, 1, 5, 30, 60, 300, 900, 3600)
+
+LabelValues = Tuple[str, ...]
+
+INF_LABEL = 'le="+Inf"'
+
+_registry: List["Metric"] = []
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric(ABC):
+    """Basisklasse: Name, Hilfetext und Label-Namen; registriert sich selbst."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        _registry.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels[name]) for name in self.labels)
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        """Die Sample-Zeilen im Prometheus-Textformat."""
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Monoton steigender Zähler pro Label-Kombination."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+                for key, value in self._values.items()]
+
+
+class Histogram(Metric):
+    """Histogramm mit festen Buckets pro Label-Kombination."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Pro Label-Kombination: (Anzahl je Bucket, Summe, Anzahl)
+        self._values: Dict[LabelValues, Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        counts, total, count = self._values.get(key) or ([0] * len(self.buckets), 0.0, 0)
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(counts):
+            counts[index] += 1
+        self._values[key] = (counts, total + value, count + 1)
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total, count) in self._values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(float(bound))}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, INF_LABEL)} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {count}")
+        return lines
+
+
+class Gauge(Metric):
+    """Momentanwert, der erst beim Abruf über eine Funktion ermittelt wird."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str):
+        super().__init__(name, help_text)
+        self._func: Callable[[], float] | None = None
+
+    def set_function(self, func: Callable[[], float]):
+        self._func = func
+
+    def samples(self) -> List[str]:
+        if self._func is None:
+            return []
+        try:
+            return [f"{self.name} {_format_value(self._func())}"]
+        except Exception as e:
+            logging.warning(f"Gauge {self.name} konnte nicht gelesen werden: {e}")
+            return []
+
+
+def render_metrics() -> str:
+    """Alle registrierten Metriken im Prometheus-Textformat."""
+    return "\n".join(metric.render() for metric in _registry) + "\n"
+
+
+# Metriken des Bots
+
+COMMAND_LATENCY = Histogram(
+    "group_helper_command_duration_seconds", "Dauer von Slash Commands", labels=("command", "outcome"))
+RAID_HELPER_RESPONSES = Counter(
+    "group_helper_raid_helper_responses_total", "Antworten der Raid Helper API nach Status", labels=("status",))
+RAID_HELPER_LATENCY = Histogram(
+    "group_helper_raid_helper_request_duration_seconds", "Dauer einzelner Raid Helper Requests")
+CHANNEL_DELETIONS = Counter(
+    "group_helper_channel_deletions_total", "Geplante Channel-Löschungen nach Ergebnis", labels=("outcome",))
+DELETION_LATENESS = Histogram(
+    "group_helper_deletion_lateness_seconds", "Verspätung fälliger Löschungen gegenüber delete_time",
+    buckets=LATENESS_BUCKETS)
+PENDING_DELETIONS = Gauge(
+    "group_helper_pending_deletions", "Ausstehende Löschungen im Scheduler")
+OUTBOX_QUEUE_DEPTH = Gauge(
+    "group_helper_outbox_queue_depth", "Wartende Jobs in der Event-Outbox")
+LOG_QUEUE_DEPTH = Gauge(
+    "group_helper_log_queue_depth", "Gepufferte Log-Records")
+LOG_RECORDS_DROPPED = Counter(
+    "group_helper_log_records_dropped_total", "Wegen voller Log-Queue verworfene Records")
+
+
+class MetricsServer:
+    """Lokaler HTTP-Server, der `/metrics` ausliefert."""
+
+    def __init__(self):
+        self._runner: Any = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._runner is not None
+
+    async def start(self, host: str, port: int):
+        """Startet den Server (idempotent)."""
+        if self._runner is not None:
+            return
+        from aiohttp import web
+
+        async def handle_metrics(request):
+            return web.Response(body=render_metrics().encode("utf-8"),
+                                headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"})
+
+        app = web.Application()
+        app.router.add_get("/metrics", handle_metrics)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, host, port).start()
+        except Exception:
+            await runner.cleanup()
+            raise
+        self._runner = runner
+        logging.info(f"Metrics-Endpunkt gestartet auf http://{host}:{port}/metrics")
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+metrics_server = MetricsServer()
@@ -4,8 +4,13 @@ Lädt Secrets aus lokaler JSON-Datei.
 """
 import logging
 import json
+import signal
+import time
 from pathlib import Path
 
+# Mindestabstand (Sekunden) zwischen zwei mtime-Prüfungen der Secrets-Datei
+SECRETS_CHECK_INTERVAL = 5.0
+
 
 def load_secrets_from_file(json_path: str) -> dict | None:
     """
@@ -39,6 +44,94 @@ def load_secrets_from_file(json_path: str) -> dict | None:
         return None
 
 
+class SecretsStore:
+    """
+    Hält die Secrets einer JSON-Datei indiziert im Speicher.
+
+    Die Datei wird nur neu geparst, wenn sich ihre mtime ändert (geprüft höchstens
+    alle `check_interval` Sekunden) oder ein Reload angefordert wurde (z.B. per
+    SIGHUP). Lookups sind Dict-Zugriffe ohne Datei-I/O.
+    """
+
+    def __init__(self, json_path: str, check_interval: float = SECRETS_CHECK_INTERVAL):
+        self.json_path = Path(json_path)
+        self.check_interval = check_interval
+        self.reload_count = 0
+        self._mtime = None
+        self._next_check = 0.0
+        self._reload_requested = False
+        self._raid_helper_keys: dict[str, str] = {}
+        self._discord_tokens: dict[str, str] = {}
+
+    def invalidate(self):
+        """Erzwingt beim nächsten Lookup ein erneutes Laden der Datei."""
+        self._reload_requested = True
+
+    def _refresh(self):
+        now = time.monotonic()
+        if not self._reload_requested and now < self._next_check:
+            return
+        self._next_check = now + self.check_interval
+
+        try:
+            mtime = self.json_path.stat().st_mtime_ns
+        except OSError:
+            mtime = None
+
+        if mtime == self._mtime and not self._reload_requested:
+            return
+        self._reload_requested = False
+        self._mtime = mtime
+
+        secrets = load_secrets_from_file(str(self.json_path))
+        self.reload_count += 1
+        if not secrets:
+            # Letzte gültige Secrets behalten, falls die Datei kaputt oder weg ist
+            return
+
+        self._raid_helper_keys = {
+            str(server.get("ServerID")): server.get("ApiKey")
+            for server in secrets.get("RAID-HELPER", [])
+            if server.get("ApiKey")
+        }
+        self._discord_tokens = {
+            app.get("AppName"): app.get("DiscordToken")
+            for app in secrets.get("DISCORD", [])
+            if app.get("DiscordToken")
+        }
+
+    def get_raid_helper_api_key(self, server_id: str) -> str | None:
+        self._refresh()
+        return self._raid_helper_keys.get(str(server_id))
+
+    def get_discord_token(self, app_name: str) -> str | None:
+        self._refresh()
+        return self._discord_tokens.get(app_name)
+
+
+_stores: dict[str, SecretsStore] = {}
+
+
+def get_secrets_store(json_path: str) -> SecretsStore:
+    """Liefert den (gecachten) SecretsStore für eine Secrets-Datei."""
+    store = _stores.get(json_path)
+    if store is None:
+        store = _stores[json_path] = SecretsStore(json_path)
+    return store
+
+
+def reload_secrets():
+    """Markiert alle geladenen Secrets-Dateien zum Neuladen."""
+    for store in _stores.values():
+        store.invalidate()
+
+
+def install_reload_signal():
+    """Lädt die Secrets bei SIGHUP neu (nur auf POSIX-Systemen verfügbar)."""
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, lambda signum, frame: reload_secrets())
+
+
 def get_raid_helper_api_key(secret_id: str, json_path: str) -> str | None:
     """
     Holt den Raid Helper API Key aus der Secrets-Datei.
@@ -54,20 +147,13 @@ def get_raid_helper_api_key(secret_id: str, json_path: str) -> str | None:
         logging.error("Kein json_path angegeben für Raid Helper API Key")
         return None
 
-    secrets = load_secrets_from_file(json_path)
-    if not secrets:
-        return None
-
     # Server ID aus secret_id extrahieren (z.B. "rhak-123456789" -> "123456789")
     server_id = secret_id.split("-")[-1]
 
-    # API Key für Server suchen
-    for server in secrets.get("RAID-HELPER", []):
-        if str(server.get("ServerID")) == server_id:
-            api_key = server.get("ApiKey")
-            if api_key:
-                logging.info(f"Raid Helper API Key gefunden für Server ID: {server_id}")
-                return api_key
+    api_key = get_secrets_store(json_path).get_raid_helper_api_key(server_id)
+    if api_key:
+        logging.debug(f"Raid Helper API Key gefunden für Server ID: {server_id}")
+        return api_key
 
     logging.warning(f"Kein Raid Helper API Key gefunden für Server ID: {server_id}")
     return None
@@ -88,17 +174,10 @@ def get_discord_token(secret_id: str, json_path: str) -> str | None:
         logging.error("Kein json_path angegeben für Discord Token")
         return None
 
-    secrets = load_secrets_from_file(json_path)
-    if not secrets:
-        return None
-
-    # Discord Token für App suchen
-    for app in secrets.get("DISCORD", []):
-        if app.get("AppName") == secret_id:
-            token = app.get("DiscordToken")
-            if token:
-                logging.info(f"Discord Token gefunden für App: {secret_id}")
-                return token
+    token = get_secrets_store(json_path).get_discord_token(secret_id)
+    if token:
+        logging.info(f"Discord Token gefunden für App: {secret_id}")
+        return token
 
     logging.warning(f"Kein Discord Token gefunden für App: {secret_id}")
     return None
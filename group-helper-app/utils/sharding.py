@@ -0,0 +1,13 @@
+"""
+Verteilung der Shards auf die Worker-Prozesse
+"""
+
+
+def split_shards(shard_count: int, processes: int) -> list[list[int]]:
+    """
+    Verteilt die Shards 0..shard_count-1 reihum auf `processes` Prozesse.
+
+    Beispiel:
+        split_shards(4, 2) == [[0, 2], [1, 3]]
+    """
+    return [list(range(i, shard_count, processes)) for i in range(processes)]
@@ -0,0 +1,47 @@
+"""
+Latenz-Messung für mehrstufige Abläufe (z.B. /group-event)
+"""
+import logging
+import time
+from contextlib import contextmanager
+
+
+class StageTimer:
+    """
+    Misst die Dauer einzelner Stufen eines Ablaufs.
+
+    Beispiel:
+        timer = StageTimer("group-event")
+        with timer.stage("clone"):
+            await clone_channel_for_event(...)
+        timer.log()
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.stages: dict[str, float] = {}
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, stage_name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[stage_name] = self.stages.get(stage_name, 0.0) + time.perf_counter() - start
+
+    @property
+    def total(self) -> float:
+        return time.perf_counter() - self._start
+
+    def log(self, level: int = logging.INFO, outcome: str | None = None):
+        """
+        Schreibt alle Stufen-Dauern (ms) und die Gesamtdauer in eine Logzeile.
+        Die Werte hängen zusätzlich als Felder am Record (für JSON-Logs).
+        """
+        total = self.total
+        stages_ms = {stage: round(duration * 1000) for stage, duration in self.stages.items()}
+        stages = ", ".join(f"{stage}={duration}ms" for stage, duration in stages_ms.items())
+        logging.log(level, "%s Latenz: %s, gesamt=%dms, Ergebnis=%s", self.name, stages, total * 1000, outcome,
+                    extra={"event": self.name, "outcome": outcome, "duration_ms": round(total * 1000),
+                           "stages_ms": stages_ms})
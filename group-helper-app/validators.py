@@ -1,9 +1,24 @@
 """
 Validierungsfunktionen für Eingaben des Group Helper Bots
 """
+from calendar import monthrange
 from datetime import datetime
+from typing import Iterable, Mapping
 import re
 
+# Alle Datumsformate in einem Muster; die Gruppennamen bestimmen die Reihenfolge von Tag, Monat und Jahr
+_DATE_PATTERN = re.compile(
+    r'(?P<iso_y>\d{4})(?P<iso_sep>[-/])(?P<iso_m>\d{1,2})(?P=iso_sep)(?P<iso_d>\d{1,2})'  # YYYY-MM-DD, YYYY/MM/DD
+    r'|(?P<d>\d{1,2})(?P<sep>[./-])(?P<m>\d{1,2})(?P=sep)(?P<y>\d{4})'                   # DD.MM.YYYY, DD/MM/YYYY, DD-MM-YYYY
+)
+
+# HH:MM, H:MM, HH.MM, HHMM und HMM
+_TIME_PATTERN = re.compile(r'(\d{1,2})[:.]?(\d{2})')
+
+# Ungültige Zeichen für Discord Channel-Namen, als ein Muster ohne Groß-/Kleinschreibung
+_INVALID_TITLE_TOKENS = ['@', '#', ':', '```', 'discord']
+_INVALID_TITLE_PATTERN = re.compile('|'.join(re.escape(token) for token in _INVALID_TITLE_TOKENS), re.IGNORECASE)
+
 
 def validate_and_parse_date(date_str: str) -> tuple[datetime | None, str | None]:
     """
@@ -23,21 +38,15 @@ def validate_and_parse_date(date_str: str) -> tuple[datetime | None, str | None]
 
     date_str = date_str.strip()
 
-    # Verschiedene Datumsformate probieren
-    date_formats = [
-        ('%Y-%m-%d', 'YYYY-MM-DD'),      # 2025-10-25
-        ('%d.%m.%Y', 'DD.MM.YYYY'),      # 25.10.2025
-        ('%d/%m/%Y', 'DD/MM/YYYY'),      # 25/10/2025
-        ('%d-%m-%Y', 'DD-MM-YYYY'),      # 25-10-2025
-        ('%Y/%m/%d', 'YYYY/MM/DD'),      # 2025/10/25
-    ]
-
-    for date_format, format_name in date_formats:
-        try:
-            parsed_date = datetime.strptime(date_str, date_format)
-            return parsed_date, None
-        except ValueError:
-            continue
+    # Ein Durchlauf für alle Formate, Kalenderprüfung ohne Exceptions
+    match = _DATE_PATTERN.fullmatch(date_str)
+    if match:
+        if match['iso_y']:
+            year, month, day = int(match['iso_y']), int(match['iso_m']), int(match['iso_d'])
+        else:
+            year, month, day = int(match['y']), int(match['m']), int(match['d'])
+        if year >= 1 and 1 <= month <= 12 and 1 <= day <= monthrange(year, month)[1]:
+            return datetime(year, month, day), None
 
     # Wenn kein Format passt
     return None, (
@@ -65,28 +74,15 @@ def validate_and_parse_time(time_str: str) -> tuple[tuple[int, int] | None, str
 
     time_str = time_str.strip()
 
-    # Format: HH:MM oder H:MM
-    if ':' in time_str:
-        match = re.match(r'^(\d{1,2}):(\d{2})$', time_str)
-        if match:
-            hour, minute = int(match.group(1)), int(match.group(2))
-        else:
-            return None, f"Ungültiges Zeitformat: `{time_str}` (erwarte **HH:MM**)"
+    match = _TIME_PATTERN.fullmatch(time_str)
+    if match:
+        hour, minute = int(match[1]), int(match[2])
 
-    # Format: HH.MM
+    # Fehlermeldung passend zum erkennbaren Format
+    elif ':' in time_str:
+        return None, f"Ungültiges Zeitformat: `{time_str}` (erwarte **HH:MM**)"
     elif '.' in time_str:
-        match = re.match(r'^(\d{1,2})\.(\d{2})$', time_str)
-        if match:
-            hour, minute = int(match.group(1)), int(match.group(2))
-        else:
-            return None, f"Ungültiges Zeitformat: `{time_str}` (erwarte **HH.MM**)"
-
-    # Format: HHMM
-    elif len(time_str) in [3, 4] and time_str.isdigit():
-        if len(time_str) == 4:
-            hour, minute = int(time_str[:2]), int(time_str[2:])
-        else:
-            hour, minute = int(time_str[0]), int(time_str[1:])
+        return None, f"Ungültiges Zeitformat: `{time_str}` (erwarte **HH.MM**)"
     else:
         return None, (
             f"Ungültiges Zeitformat: `{time_str}`\n"
@@ -122,10 +118,10 @@ def validate_title(title: str) -> tuple[bool, str | None]:
         return False, "Titel darf maximal 100 Zeichen lang sein."
 
     # Ungültige Zeichen für Discord Channel-Namen
-    invalid_chars = ['@', '#', ':', '```', 'discord']
-    for char in invalid_chars:
-        if char.lower() in title.lower():
-            return False, f"Titel darf '{char}' nicht enthalten."
+    match = _INVALID_TITLE_PATTERN.search(title)
+    if match:
+        token = match.group().lower()
+        return False, f"Titel darf '{token}' nicht enthalten."
 
     return True, None
 
@@ -150,3 +146,47 @@ def validate_description(desc: str) -> tuple[bool, str | None]:
 
     return True, None
 
+
+
+def validate_event(date: str, time: str, title: str, desc: str) -> tuple[datetime | None, dict[str, str]]:
+    """
+    Validiert alle Felder eines Events in einem Schritt.
+
+    Returns:
+        tuple: (event_datetime, errors) - errors enthält pro ungültigem Feld
+        ("Datum", "Zeit", "Titel", "Beschreibung") die Fehlermeldung
+    """
+    parsed_date, date_error = validate_and_parse_date(date)
+    parsed_time, time_error = validate_and_parse_time(time)
+    title_valid, title_error = validate_title(title)
+    desc_valid, desc_error = validate_description(desc)
+
+    errors = {
+        "Datum": date_error,
+        "Zeit": time_error,
+        "Titel": title_error if not title_valid else None,
+        "Beschreibung": desc_error if not desc_valid else None
+    }
+    errors = {field: error for field, error in errors.items() if error}
+
+    if errors:
+        return None, errors
+
+    hour, minute = parsed_time
+    return parsed_date.replace(hour=hour, minute=minute, second=0, microsecond=0), errors
+
+
+def validate_many(specs: Iterable[Mapping[str, str]]) -> list[tuple[datetime | None, dict[str, str]]]:
+    """
+    Validiert mehrere Events (z.B. aus einem Import) auf einmal.
+
+    Args:
+        specs: Events als Mappings mit den Schlüsseln "date", "time", "title" und "desc"
+
+    Returns:
+        list: pro Event (event_datetime, errors) wie bei validate_event, in derselben Reihenfolge
+    """
+    return [
+        validate_event(spec.get("date"), spec.get("time"), spec.get("title"), spec.get("desc"))
+        for spec in specs
+    ]